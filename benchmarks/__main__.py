@@ -0,0 +1,8 @@
+"""Run the summation benchmarks with ``python -m benchmarks``."""
+
+import sys
+
+from benchmarks.summation import main
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
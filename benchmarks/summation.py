@@ -0,0 +1,356 @@
+"""Benchmark every summation method across sizes, element types and inputs.
+
+Each case times one method on one generated dataset and records the best
+per-call time and the relative error against the exact sum. Datasets are
+generated from a fixed seed so runs are comparable, and a stored baseline
+turns slowdowns beyond a tolerance into a non-zero exit status. Times are
+compared relative to the built-in ``sum`` on the same dataset, so a baseline
+recorded on another machine still applies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from collections import Counter
+from fractions import Fraction
+from functools import reduce
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from demos.summary import RunningSum
+from demos.summing_methods import (
+    SUM_METHODS,
+    Number,
+    SumMethod,
+    add_operator,
+    add_plus,
+    add_sum,
+)
+from history.claude_v3_menu_demo import custom_sum
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+FULL_SIZES = tuple(10**exponent for exponent in range(1, 9))
+ELEMENT_TYPES = ("int", "bigint", "float", "mixed")
+DISTRIBUTIONS = ("uniform", "cancellation", "wide", "skewed")
+DEFAULT_SEED = 20240601
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 1.25
+MIN_TIMED_VALUES = 100_000
+MIN_COMPARABLE_SECONDS = 1e-5
+SKEWED_EVERY = 1_000
+REFERENCE_METHOD = "builtin"
+
+_UNIFORM_SCALES: Dict[str, Number] = {
+    "int": 10**6,
+    "bigint": 2**200,
+    "float": 1e6,
+    "mixed": 10**6,
+}
+_WIDE_EXPONENTS = {
+    "int": (0, 18),
+    "bigint": (0, 90),
+    "float": (-12, 12),
+    "mixed": (0, 12),
+}
+_CANCELLATION_SCALES: Dict[str, Number] = {
+    "int": 10**18,
+    "bigint": 2**300,
+    "float": 1e16,
+    "mixed": 10**18,
+}
+_SKEWED_SCALES: Dict[str, Number] = {
+    "int": 10**18,
+    "bigint": 2**65536,
+    "float": 1e300,
+    "mixed": 10**300,
+}
+
+CaseKey = Tuple[str, str, str, int]
+DatasetKey = Tuple[str, str, int]
+
+
+def _fold(add: Callable[[Number, Number], Number]) -> SumMethod:
+    def fold(nums: Sequence[Number]) -> Number:
+        return reduce(add, nums, 0)
+
+    fold.__name__ = add.__name__
+    return fold
+
+
+def benchmark_methods() -> Dict[str, SumMethod]:
+    """Return every lesson method by name, including two-number folds."""
+    methods: Dict[str, SumMethod] = {
+        "add_plus": _fold(add_plus),
+        "add_sum": _fold(add_sum),
+        "add_operator": _fold(add_operator),
+        "custom_sum": custom_sum,
+    }
+    methods.update(SUM_METHODS)
+    return methods
+
+
+def _draw(rng: random.Random, element_type: str, scale: Number) -> Number:
+    """Draw one positive value of ``element_type`` no larger than ``scale``."""
+    if element_type == "float" or (element_type == "mixed" and rng.random() < 0.5):
+        return rng.random() * scale
+    return rng.randint(1, int(scale))
+
+
+def generate_values(
+    size: int, element_type: str, distribution: str, seed: int = DEFAULT_SEED
+) -> List[Number]:
+    """Return ``size`` reproducible values of one type and distribution.
+
+    ``uniform`` values share one magnitude and have random signs. ``wide``
+    values span many orders of magnitude. ``cancellation`` interleaves huge
+    values with their negations and small addends, so naive float sums lose
+    the small terms entirely. ``skewed`` makes every ``SKEWED_EVERY``-th
+    value huge and the rest uniform, so linear big-int sums keep copying a
+    huge running total.
+    """
+    if element_type not in ELEMENT_TYPES:
+        raise ValueError(f"unknown element type {element_type!r}")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {distribution!r}")
+    rng = random.Random(f"{seed}:{element_type}:{distribution}")
+    scale = _UNIFORM_SCALES[element_type]
+    if distribution == "uniform":
+        return [
+            _draw(rng, element_type, scale) * rng.choice((1, -1)) for _ in range(size)
+        ]
+    if distribution == "wide":
+        low, high = _WIDE_EXPONENTS[element_type]
+        return [
+            _draw(rng, element_type, 10 ** rng.randint(low, high)) * rng.choice((1, -1))
+            for _ in range(size)
+        ]
+    if distribution == "skewed":
+        huge = _SKEWED_SCALES[element_type]
+        return [
+            _draw(rng, element_type, scale if index % SKEWED_EVERY else huge)
+            * rng.choice((1, -1))
+            for index in range(size)
+        ]
+    huge = _CANCELLATION_SCALES[element_type]
+    values: List[Number] = []
+    while len(values) < size:
+        big = huge + rng.randint(0, 1000)
+        values.extend((big, _draw(rng, element_type, scale), -big))
+    return values[:size]
+
+
+def exact_sum(values: Sequence[Number]) -> Fraction:
+    """Return the exact mathematical sum of ``values``."""
+    running = RunningSum()
+    running.add_many(values)
+    return Fraction(running.exact) + sum(map(Fraction, running.partials), Fraction(0))
+
+
+def relative_error(result: Number, exact: Fraction) -> float:
+    """Return ``|result - exact| / max(|exact|, 1)`` as a float."""
+    return float(abs(Fraction(result) - exact) / max(abs(exact), 1))
+
+
+def time_method(
+    method: SumMethod, values: Sequence[Number], repeat: int
+) -> Tuple[float, Number]:
+    """Return the best per-call time over ``repeat`` samples and the result."""
+    loops = max(1, MIN_TIMED_VALUES // max(1, len(values)))
+    best = float("inf")
+    result: Number = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            result = method(values)
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best, result
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    element_types: Sequence[str] = ELEMENT_TYPES,
+    distributions: Sequence[str] = DISTRIBUTIONS,
+    methods: Optional[Sequence[str]] = None,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, object]:
+    """Time the selected methods on every size, type and distribution."""
+    available = benchmark_methods()
+    selected = list(available) if methods is None else list(methods)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise ValueError(f"unknown benchmark methods: {', '.join(unknown)}")
+    results = []
+    for element_type in element_types:
+        for distribution in distributions:
+            for size in sizes:
+                values = generate_values(size, element_type, distribution, seed)
+                exact = exact_sum(values)
+                for name in selected:
+                    try:
+                        seconds, result = time_method(available[name], values, repeat)
+                        error: Optional[float] = relative_error(result, exact)
+                    except OverflowError:
+                        seconds, error = None, None
+                    results.append(
+                        {
+                            "method": name,
+                            "element_type": element_type,
+                            "distribution": distribution,
+                            "size": size,
+                            "seconds": seconds,
+                            "relative_error": error,
+                        }
+                    )
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _case_key(result: Dict[str, object]) -> CaseKey:
+    return (
+        str(result["method"]),
+        str(result["element_type"]),
+        str(result["distribution"]),
+        int(result["size"]),
+    )
+
+
+def _reference_seconds(report: Dict[str, object]) -> Dict[DatasetKey, float]:
+    return {
+        _case_key(result)[1:]: result["seconds"]
+        for result in report["results"]
+        if result["method"] == REFERENCE_METHOD and result["seconds"] is not None
+    }
+
+
+def compare_to_baseline(
+    report: Dict[str, object],
+    baseline: Dict[str, object],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Tuple[List[Dict[str, object]], List[Dict[str, object]]]:
+    """Return the cases that regressed beyond ``tolerance`` and those skipped.
+
+    Each time is divided by the ``REFERENCE_METHOD`` time on the same dataset
+    in the same run, and a case regresses when that ratio grew more than
+    ``tolerance`` times. Cases missing from the baseline, cases that could
+    not run or have no reference time, and timings under
+    ``MIN_COMPARABLE_SECONDS`` (dominated by timer noise) are skipped, each
+    with a ``"reason"``.
+    """
+    expected = {_case_key(result): result for result in baseline["results"]}
+    references = _reference_seconds(report)
+    baseline_references = _reference_seconds(baseline)
+    regressions = []
+    skipped = []
+    for result in report["results"]:
+        key = _case_key(result)
+        previous = expected.get(key)
+        reference = references.get(key[1:])
+        baseline_reference = baseline_references.get(key[1:])
+        if previous is None:
+            reason = "not in the baseline"
+        elif result["seconds"] is None or previous["seconds"] is None:
+            reason = "could not run"
+        elif reference is None or baseline_reference is None:
+            reason = f"no {REFERENCE_METHOD} time to compare against"
+        elif previous["seconds"] < MIN_COMPARABLE_SECONDS:
+            reason = "too fast to time reliably"
+        else:
+            ratio = (result["seconds"] / reference) / (
+                previous["seconds"] / baseline_reference
+            )
+            if ratio > tolerance:
+                regressions.append(
+                    {**result, "baseline_seconds": previous["seconds"], "ratio": ratio}
+                )
+            continue
+        skipped.append({**result, "reason": reason})
+    return regressions, skipped
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    """Build the benchmark command-line interface."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the summation methods and compare to a baseline.",
+    )
+    parser.add_argument(
+        "--sizes", metavar="N", type=int, nargs="+", default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="use sizes from 10 to 10**8 (needs several GB of memory)",
+    )
+    parser.add_argument(
+        "--types", nargs="+", choices=ELEMENT_TYPES, default=list(ELEMENT_TYPES)
+    )
+    parser.add_argument(
+        "--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS)
+    )
+    parser.add_argument("--methods", nargs="+", metavar="NAME")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", metavar="PATH", help="write JSON results to PATH")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="compare against stored results"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed growth of each method's time relative to "
+        f"{REFERENCE_METHOD} against the baseline (default: {DEFAULT_TOLERANCE})",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmarks; return 1 when the baseline comparison regresses."""
+    parser = build_argument_parser()
+    arguments = parser.parse_args([] if argv is None else argv)
+    try:
+        report = run_benchmarks(
+            FULL_SIZES if arguments.full else arguments.sizes,
+            arguments.types,
+            arguments.distributions,
+            arguments.methods,
+            arguments.repeat,
+            arguments.seed,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions, skipped = compare_to_baseline(
+            report, baseline, arguments.tolerance
+        )
+        for reason, count in Counter(case["reason"] for case in skipped).items():
+            print(f"Skipped {count} cases: {reason}.", file=sys.stderr)
+        for regression in regressions:
+            print(
+                "Regression: {method} {element_type}/{distribution} n={size}: "
+                "{seconds:.3g}s vs {baseline_seconds:.3g}s "
+                "({ratio:.2f}x relative to {reference})".format(
+                    reference=REFERENCE_METHOD, **regression
+                ),
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,134 @@
+"""Reduce numbers batch by batch and combine the partial results later."""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from demos.summary import NumberSummary
+from demos.summing_methods import (
+    Number,
+    float_expansion,
+    get_sum_method,
+    round_exact_sum,
+    split_exact,
+)
+
+MAX_PENDING_PARTIALS = 1024
+
+
+def _combine_partials(shards: Iterable[List[float]]) -> float:
+    return math.fsum(partial for partials in shards for partial in partials)
+
+
+ExactParts = Tuple[int, List[float]]
+
+
+def _exact_parts(nums: Iterable[Number]) -> ExactParts:
+    integer, floats = split_exact(nums)
+    return integer, (float_expansion(floats) or [0.0]) if floats else []
+
+
+def _merge_exact_parts(shards: Iterable[ExactParts]) -> ExactParts:
+    shards = list(shards)
+    floats = [partial for _, partials in shards for partial in partials]
+    integer = sum(integer for integer, _ in shards)
+    return integer, (float_expansion(floats) or [0.0]) if floats else []
+
+
+def _combine_exact_parts(shards: Iterable[ExactParts]) -> Number:
+    integer, floats = _merge_exact_parts(shards)
+    return round_exact_sum(integer, floats) if floats else integer
+
+
+def shard_method(method: str) -> Tuple[Callable, Callable]:
+    """Return the per-shard reducer and the combiner for shard results.
+
+    ``fsum`` shards return an exact float expansion, so the combined result is
+    the same correctly rounded value ``math.fsum`` gives for the whole input.
+    ``exact`` shards return their exact integer total and float expansion,
+    so the result matches ``sum_exact`` over the whole input. Every other
+    registered method reduces its own shard totals.
+    """
+    if method == "fsum":
+        return float_expansion, _combine_partials
+    if method == "exact":
+        return _exact_parts, _combine_exact_parts
+    reduce_shard = get_sum_method(method)
+    return reduce_shard, reduce_shard
+
+
+def merge_shard_results(method: str, results: List[object]) -> object:
+    """Fold several shard results of ``method`` into one shard result."""
+    if method == "fsum":
+        return float_expansion(p for partials in results for p in partials)
+    if method == "exact":
+        return _merge_exact_parts(results)
+    return shard_method(method)[0](results)
+
+
+class BatchAccumulator:
+    """Sum parsed batches as they arrive, using one registered method.
+
+    Each batch is reduced on arrival and only its partial result is kept, so
+    memory does not grow with the input; partials are folded together once
+    ``MAX_PENDING_PARTIALS`` accumulate. Integer totals are exact, and
+    ``fsum`` and ``exact`` stay correctly rounded; other float methods round
+    each batch total, so their last bits can differ from one call over all
+    values. With ``analyze`` set, a constant-memory :class:`NumberSummary` with an
+    approximate median is kept alongside.
+    """
+
+    def __init__(self, method: str = "builtin", analyze: bool = False) -> None:
+        self.method = method
+        self._reduce, self._combine = shard_method(method)
+        self.partials: list = []
+        self.count = 0
+        self.summary: Optional[NumberSummary] = (
+            NumberSummary(keep_values=False, approximate_median=True)
+            if analyze
+            else None
+        )
+
+    def add_batch(self, batch: List[Number]) -> None:
+        """Reduce one parsed batch and keep its partial result."""
+        if not batch:
+            return
+        self.count += len(batch)
+        self.partials.append(self._reduce(batch))
+        if self.summary is not None:
+            self.summary.update_many(batch)
+        if len(self.partials) >= MAX_PENDING_PARTIALS:
+            self.partials = [merge_shard_results(self.method, self.partials)]
+
+    def total(self) -> Optional[Number]:
+        """Return the combined sum, or ``None`` before any number arrived."""
+        if not self.count:
+            return None
+        return self._combine(self.partials)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return a JSON-compatible snapshot that :meth:`from_dict` restores."""
+        return {
+            "method": self.method,
+            "count": self.count,
+            "partials": list(self.partials),
+            "summary": None if self.summary is None else self.summary.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> BatchAccumulator:
+        """Rebuild an accumulator from :meth:`to_dict` output."""
+        accumulator = cls(str(data["method"]))
+        accumulator.count = int(data["count"])
+        accumulator.partials = list(data["partials"])
+        if data["summary"] is not None:
+            accumulator.summary = NumberSummary.from_dict(data["summary"])
+        return accumulator
+
+    def result(self) -> Dict[str, object]:
+        """Return the count, sum and, when analyzing, the summary breakdown."""
+        result: Dict[str, object] = {"count": self.count, "sum": self.total()}
+        if self.summary is not None:
+            result["analysis"] = self.summary.result()
+        return result
@@ -0,0 +1,275 @@
+"""Read binary numeric data as typed buffers instead of parsing text.
+
+Raw little-endian ``float64``/``int64`` data and ``.npy`` files are exposed
+as ``memoryview`` objects cast to the element type, so summation methods
+iterate the buffer directly and ``sum_numpy`` reduces it without copying.
+Arrow IPC streams and files need the optional ``pyarrow`` package; their
+column buffers are viewed the same way. Float data must be finite, as with
+:func:`demos.summing_methods.parse_cli_numbers`.
+"""
+
+from __future__ import annotations
+
+import array
+import ast
+import math
+import mmap
+import os
+import stat
+import sys
+from itertools import chain
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from demos.accumulate import BatchAccumulator
+from demos.columns import column_labels
+from demos.summing_methods import STREAM_CHUNK_SIZE, _import_numpy
+
+RAW_FORMATS = {"f64": "d", "i64": "q"}
+BINARY_FORMATS = (*RAW_FORMATS, "npy", "arrow")
+NPY_MAGIC = b"\x93NUMPY"
+ARROW_FILE_MAGIC = b"ARROW1"
+_NPY_TYPECODES = {
+    "f8": "d",
+    "f4": "f",
+    "i8": "q",
+    "i4": "i",
+    "i2": "h",
+    "i1": "b",
+    "u8": "Q",
+    "u4": "I",
+    "u2": "H",
+    "u1": "B",
+}
+_ARROW_TYPECODES = {
+    ("float", 64): "d",
+    ("float", 32): "f",
+    ("int", 64): "q",
+    ("int", 32): "i",
+    ("int", 16): "h",
+    ("int", 8): "b",
+    ("uint", 64): "Q",
+    ("uint", 32): "I",
+    ("uint", 16): "H",
+    ("uint", 8): "B",
+}
+
+TypedValues = Union[memoryview, array.array]
+
+
+def typed_view(data: object, typecode: str) -> TypedValues:
+    """Return little-endian ``data`` as ``typecode`` values.
+
+    On little-endian hosts this is a zero-copy ``memoryview``; elsewhere the
+    values are copied into a byte-swapped ``array``.
+    """
+    view = memoryview(data).cast("B")
+    size = array.array(typecode).itemsize
+    if len(view) % size:
+        raise ValueError(
+            f"{len(view)} bytes is not a whole number of {size}-byte values."
+        )
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    values = array.array(typecode, view.tobytes())
+    values.byteswap()
+    return values
+
+
+def check_finite(values: TypedValues) -> None:
+    """Raise the ``parse_cli_numbers`` error for the first non-finite value."""
+    typecode = values.format if isinstance(values, memoryview) else values.typecode
+    if typecode not in "df":
+        return
+    numpy = _import_numpy()
+    if numpy is not None:
+        if numpy.isfinite(numpy.asarray(values)).all():
+            return
+    elif all(map(math.isfinite, values)):
+        return
+    bad = next(value for value in values if not math.isfinite(value))
+    raise ValueError(f"'{bad!r}' is not a valid finite number.")
+
+
+def npy_header(data: bytes) -> Tuple[str, int, int]:
+    """Return the typecode, element count and data offset of a ``.npy`` file.
+
+    Only the first bytes of the file are needed. Supported dtypes are
+    little-endian or single-byte integers and ``float32``/``float64``.
+    """
+    if data[:6] != NPY_MAGIC or len(data) < 10:
+        raise ValueError("the input is not a .npy file.")
+    size_bytes = 2 if data[6] == 1 else 4
+    start = 8 + size_bytes
+    length = int.from_bytes(data[8:start], "little")
+    if len(data) < start + length:
+        raise ValueError("the .npy header is truncated.")
+    header = ast.literal_eval(data[start : start + length].decode("latin-1"))
+    descr = header["descr"]
+    typecode = _NPY_TYPECODES.get(descr[1:]) if isinstance(descr, str) else None
+    if typecode is None or descr[0] not in "<|":
+        raise ValueError(f"unsupported .npy dtype {descr!r}.")
+    return typecode, math.prod(header["shape"]), start + length
+
+
+def iter_binary_stream(
+    stream: BinaryIO, binary_format: str, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[TypedValues]:
+    """Yield finite typed chunks of a raw or ``.npy`` byte stream."""
+    pending = b""
+    remaining = None
+    if binary_format == "npy":
+        header = stream.read(4096)
+        typecode, count, offset = npy_header(header)
+        pending = header[offset:]
+        remaining = count * array.array(typecode).itemsize
+    else:
+        typecode = RAW_FORMATS[binary_format]
+    size = array.array(typecode).itemsize
+    while True:
+        chunk = stream.read(chunk_size)
+        data = pending + chunk
+        if remaining is not None:
+            data = data[:remaining]
+        usable = len(data) - len(data) % size
+        if usable:
+            values = typed_view(data[:usable], typecode)
+            check_finite(values)
+            yield values
+            if remaining is not None:
+                remaining -= usable
+        pending = data[usable:]
+        if not chunk:
+            break
+    if remaining:
+        raise ValueError("the .npy data is truncated.")
+    if pending:
+        raise ValueError(
+            f"{len(pending)} trailing bytes do not form a {size}-byte value."
+        )
+
+
+def read_binary_file(
+    path: Union[str, os.PathLike[str]], binary_format: str
+) -> Optional[TypedValues]:
+    """Return a raw or ``.npy`` file as finite typed values, or ``None``.
+
+    A regular file is memory-mapped and the view keeps the mapping alive, so
+    the operating system pages the data in while a method iterates it. Pipes
+    and other files that cannot be mapped are read into memory instead.
+    """
+    with open(path, "rb") as file:
+        status = os.fstat(file.fileno())
+        if not stat.S_ISREG(status.st_mode):
+            data = file.read()
+        elif status.st_size == 0:
+            return None
+        else:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    typecode, start, stop = RAW_FORMATS.get(binary_format), 0, len(data)
+    if binary_format == "npy":
+        typecode, count, start = npy_header(data[:4096])
+        stop = start + count * array.array(typecode).itemsize
+        if stop > len(data):
+            raise ValueError("the .npy data is truncated.")
+    values = typed_view(memoryview(data)[start:stop], typecode)
+    check_finite(values)
+    return values if len(values) else None
+
+
+def _import_pyarrow():
+    """Return ``pyarrow`` with its IPC module loaded, or raise ``ValueError``."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise ValueError(
+            "Arrow input needs pyarrow; install requirements-arrow.txt."
+        ) from None
+    return pyarrow
+
+
+def _arrow_typecode(pyarrow, data_type) -> Optional[str]:
+    types = pyarrow.types
+    if types.is_floating(data_type):
+        kind = "float"
+    elif types.is_signed_integer(data_type):
+        kind = "int"
+    elif types.is_unsigned_integer(data_type):
+        kind = "uint"
+    else:
+        return None
+    return _ARROW_TYPECODES.get((kind, data_type.bit_width))
+
+
+def _arrow_batches(pyarrow, source: object) -> Iterator[object]:
+    if isinstance(source, (str, os.PathLike)):
+        source = pyarrow.memory_map(os.fspath(source))
+        if source.read(len(ARROW_FILE_MAGIC)) == ARROW_FILE_MAGIC:
+            reader = pyarrow.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield reader.get_batch(index)
+            return
+        source.seek(0)
+    yield from pyarrow.ipc.open_stream(source)
+
+
+def sum_arrow_columns(
+    source: object,
+    selectors: Optional[Sequence[str]] = None,
+    method: str = "builtin",
+    analyze: bool = False,
+) -> Dict[str, BatchAccumulator]:
+    """Sum numeric columns of an Arrow IPC stream or file, keyed by label.
+
+    ``source`` is a path, which is memory-mapped, or a readable binary
+    stream. ``selectors`` are column names or 1-based positions and default
+    to every column, labelled as by :func:`demos.columns.column_labels`.
+    Each record batch's value buffer is summed in place; null values and
+    non-finite floats raise ``ValueError``.
+    """
+    pyarrow = _import_pyarrow()
+    batches = _arrow_batches(pyarrow, source)
+    first = next(batches, None)
+    if first is None:
+        return {}
+    names: List[str] = first.schema.names
+    if selectors is None:
+        selectors = names
+    indices = []
+    for selector in selectors:
+        if selector.isdigit() and selector not in names:
+            index = int(selector) - 1
+            if not 0 <= index < len(names):
+                raise ValueError(f"there is no column {selector}.")
+        elif selector in names:
+            index = names.index(selector)
+        else:
+            raise ValueError(f"no column is named {selector!r}.")
+        data_type = first.schema.field(index).type
+        if _arrow_typecode(pyarrow, data_type) is None:
+            raise ValueError(
+                f"column {names[index]!r} has non-numeric type {data_type}."
+            )
+        indices.append(index)
+    indices = list(dict.fromkeys(indices))
+    labels = column_labels(names, indices)
+    accumulators = {label: BatchAccumulator(method, analyze) for label in labels}
+    for batch in chain((first,), batches):
+        for label, index in zip(labels, indices):
+            column = batch.column(index)
+            if column.null_count:
+                raise ValueError(f"column {names[index]!r} has null values.")
+            typecode = _arrow_typecode(pyarrow, column.type)
+            size = array.array(typecode).itemsize
+            start = column.offset * size
+            with memoryview(column.buffers()[1]) as buffer:
+                values = typed_view(
+                    buffer[start : start + len(column) * size], typecode
+                )
+                try:
+                    check_finite(values)
+                    accumulators[label].add_batch(values)
+                finally:
+                    if isinstance(values, memoryview):
+                        values.release()
+    return accumulators
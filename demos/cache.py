@@ -0,0 +1,148 @@
+"""On-disk cache of summation results keyed by options and input content.
+
+Results live in a small SQLite database, by default ``$SUM_CACHE`` or
+``results.sqlite3`` under the user's cache directory. Keys hash the options
+together with the input: ``--numbers`` arguments directly, files by the
+SHA-256 of their content. A file's digest is remembered with its size and
+modification time, so an unchanged file is not even read again. Once the
+stored results exceed ``max_bytes``, the least recently used are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Optional, Union
+
+CACHE_ENV = "SUM_CACHE"
+DEFAULT_MAX_BYTES = 64 << 20
+_DIGEST_CHUNK_SIZE = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+CREATE TABLE IF NOT EXISTS digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+
+def default_cache_path() -> str:
+    """Return ``$SUM_CACHE`` or a per-user path in the cache directory."""
+    configured = os.environ.get(CACHE_ENV)
+    if configured:
+        return configured
+    directory = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(directory, "demos-summing", "results.sqlite3")
+
+
+def cache_key(*parts: object) -> str:
+    """Return a stable key for JSON-compatible ``parts``."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache:
+    """Least-recently-used store of JSON-compatible results.
+
+    Use :meth:`close`, or the instance as a context manager, to release the
+    database.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        path = default_cache_path() if path is None else path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, timeout=30)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __enter__(self) -> ResultCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _next_use(self) -> int:
+        (used,) = self._connection.execute(
+            "SELECT COALESCE(MAX(used), 0) + 1 FROM results"
+        ).fetchone()
+        return used
+
+    def get(self, key: str) -> Optional[object]:
+        """Return the result stored under ``key`` and mark it recently used."""
+        with self._connection:
+            row = self._connection.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE results SET used = ? WHERE key = ?", (self._next_use(), key)
+            )
+        return json.loads(row[0])
+
+    def put(self, key: str, value: object) -> None:
+        """Store ``value`` under ``key``, then evict down to ``max_bytes``."""
+        encoded = json.dumps(value)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, encoded, len(encoded), self._next_use()),
+            )
+            (total,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            rows = self._connection.execute(
+                "SELECT key, size FROM results ORDER BY used"
+            ).fetchall()
+            evicted = []
+            for old_key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append((old_key,))
+                total -= size
+            self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def file_digest(self, path: Union[str, os.PathLike[str]]) -> str:
+        """Return the SHA-256 of a file, reusing it while size and mtime match."""
+        path = os.path.realpath(path)
+        with open(path, "rb") as file:
+            status = os.fstat(file.fileno())
+            row = self._connection.execute(
+                "SELECT digest FROM digests WHERE path = ? AND size = ? "
+                "AND mtime_ns = ?",
+                (path, status.st_size, status.st_mtime_ns),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+            hasher = hashlib.sha256()
+            for chunk in iter(lambda: file.read(_DIGEST_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+            digest = hasher.hexdigest()
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)",
+                (path, status.st_size, status.st_mtime_ns, digest),
+            )
+        return digest
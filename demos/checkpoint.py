@@ -0,0 +1,143 @@
+"""Checkpoint long file summations so an interrupted run can resume.
+
+Progress is saved to a small JSON sidecar next to the input: the byte offset
+reached, the :class:`BatchAccumulator` partials and, when analyzing, the
+:class:`NumberSummary` counters. Checkpoints are written after a fixed number
+of batches and batch boundaries depend only on where parsing starts, so a
+resumed run folds exactly the same batches as an uninterrupted one.
+
+Only methods whose result does not depend on how the input is split into
+batches can be checkpointed: ``fsum`` and ``exact`` for any input, and the
+methods that keep integer totals exact for integer input. The result is then
+the same as summing the file without a checkpoint.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from typing import Dict, Optional, Union
+
+from demos.accumulate import BatchAccumulator
+from demos.compressed import MAGIC_SIZE, detect_compression
+from demos.summing_methods import (
+    STREAM_CHUNK_SIZE,
+    iter_token_ranges,
+    parse_cli_numbers,
+)
+
+CHECKPOINT_SUFFIX = ".sum-checkpoint"
+CHECKPOINT_INTERVAL = 1024
+CHECKPOINT_VERSION = 1
+BATCH_INDEPENDENT_METHODS = ("fsum", "exact")
+INTEGER_EXACT_METHODS = ("builtin", "reduce", "numpy", "exact", "bigint")
+
+
+def check_checkpointable(method: str, allow_float: bool) -> None:
+    """Raise ``ValueError`` if batching could change ``method``'s result.
+
+    Other float methods round each batch total, so a checkpointed sum would
+    differ in its last bits from one call over all values.
+    """
+    allowed = BATCH_INDEPENDENT_METHODS
+    if not allow_float:
+        allowed = tuple(sorted({*allowed, *INTEGER_EXACT_METHODS}))
+    if method not in allowed:
+        option = " with --float" if allow_float else ""
+        raise ValueError(
+            f"checkpointing --method {method}{option} would change the sum; "
+            f"use one of {', '.join(allowed)}."
+        )
+
+
+def checkpoint_path(path: Union[str, os.PathLike[str]]) -> str:
+    """Return the sidecar checkpoint path for the input file ``path``."""
+    return os.fspath(path) + CHECKPOINT_SUFFIX
+
+
+def write_checkpoint(path: str, state: Dict[str, object]) -> None:
+    """Atomically replace the checkpoint at ``path`` with ``state``."""
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def read_checkpoint(path: str) -> Optional[Dict[str, object]]:
+    """Return the checkpoint saved at ``path``, or ``None`` if there is none."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        raise ValueError(f"{path!r} is not a valid checkpoint.") from None
+
+
+def sum_file_checkpointed(
+    path: Union[str, os.PathLike[str]],
+    method: str = "builtin",
+    allow_float: bool = False,
+    analyze: bool = False,
+    resume: bool = False,
+    interval: int = CHECKPOINT_INTERVAL,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> BatchAccumulator:
+    """Sum a whitespace-separated file, checkpointing every ``interval`` batches.
+
+    With ``resume``, parsing continues from the checkpoint left by an earlier
+    run with the same file and options, if there is one. A checkpoint for a
+    file that has since changed, or for other options, raises ``ValueError``.
+    The checkpoint is removed once the whole file has been summed. Methods
+    rejected by :func:`check_checkpointable` raise ``ValueError``.
+    """
+    check_checkpointable(method, allow_float)
+    sidecar = checkpoint_path(path)
+    with open(path, "rb") as file:
+        if detect_compression(file.read(MAGIC_SIZE)) is not None:
+            raise ValueError("checkpointed summation needs an uncompressed file.")
+        status = os.fstat(file.fileno())
+        settings = {
+            "version": CHECKPOINT_VERSION,
+            "size": status.st_size,
+            "mtime_ns": status.st_mtime_ns,
+            "method": method,
+            "allow_float": allow_float,
+            "analyze": analyze,
+            "chunk_size": chunk_size,
+        }
+        accumulator = BatchAccumulator(method, analyze)
+        offset = batches = 0
+        state = read_checkpoint(sidecar) if resume else None
+        if state is not None:
+            if any(state.get(key) != value for key, value in settings.items()):
+                raise ValueError(
+                    f"{sidecar!r} was saved for another file or other options; "
+                    "delete it to start over."
+                )
+            accumulator = BatchAccumulator.from_dict(state["accumulator"])
+            offset, batches = int(state["offset"]), int(state["batches"])
+        if status.st_size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start, end in iter_token_ranges(mapped, chunk_size, offset):
+                    tokens = mapped[start:end].split()
+                    accumulator.add_batch(parse_cli_numbers(tokens, allow_float))
+                    batches += 1
+                    if batches % interval == 0:
+                        write_checkpoint(
+                            sidecar,
+                            {
+                                **settings,
+                                "offset": end,
+                                "batches": batches,
+                                "accumulator": accumulator.to_dict(),
+                            },
+                        )
+    try:
+        os.remove(sidecar)
+    except FileNotFoundError:
+        pass
+    return accumulator
@@ -0,0 +1,141 @@
+"""Thin client that runs the lesson's CLI inside a summation daemon.
+
+``python -m demos.client ARGS`` accepts exactly the arguments of
+``python -m demos.summing_methods``. It forwards them (and standard input for
+``--stdin``) to a daemon started with ``python -m demos.daemon`` and
+reproduces the daemon's stdout, stderr and exit status, including argparse's
+status 2. When no daemon is listening, or the socket belongs to another
+user, it runs the lesson in-process instead, as it does for ``--file``
+paths that name its own standard input.
+
+This module deliberately imports only ``io``, ``json``, ``os``, ``socket``
+and ``sys``, so a forwarded call skips loading the lesson, ``argparse`` and
+``typing``.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import sys
+
+SOCKET_ENV = "SUM_DAEMON_SOCKET"
+_CHUNK_SIZE = 1 << 16
+# Paths that make ``--file`` read the client's own standard input, which a
+# daemon would resolve to its own.
+_STDIN_PATHS = ("/dev/stdin", "/dev/fd/0", "/proc/self/fd/0")
+
+
+def default_socket_path() -> str:
+    """Return ``$SUM_DAEMON_SOCKET`` or a per-user path in the runtime dir."""
+    configured = os.environ.get(SOCKET_ENV)
+    if configured:
+        return configured
+    directory = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    user = getattr(os, "getuid", lambda: "user")()
+    return os.path.join(directory, f"sum-daemon-{user}.sock")
+
+
+def _options(argv: list[str]) -> list[str]:
+    # Everything after ``--numbers`` is a number, not an option.
+    return argv[: argv.index("--numbers")] if "--numbers" in argv else argv
+
+
+def _forwards_stdin(argv: list[str]) -> bool:
+    return "--stdin" in _options(argv)
+
+
+def _reads_stdin_file(argv: list[str]) -> bool:
+    options = _options(argv)
+    paths = [value for option, value in zip(options, options[1:]) if option == "--file"]
+    paths += [
+        option[len("--file=") :] for option in options if option.startswith("--file=")
+    ]
+    return any(path in _STDIN_PATHS for path in paths)
+
+
+def _is_own_socket(connection: socket.socket, path: str) -> bool:
+    """Return whether the process behind ``connection`` runs as this user."""
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:
+        return True
+    if hasattr(socket, "SO_PEERCRED"):
+        # struct ucred is three C ints: pid, uid and gid.
+        credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, 12)
+        return int.from_bytes(credentials[4:8], sys.byteorder) == getuid()
+    return os.lstat(path).st_uid == getuid()
+
+
+def forward(
+    argv: list[str],
+    path: str | None = None,
+    stdin: io.TextIOBase | None = None,
+    stdout: io.TextIOBase | None = None,
+    stderr: io.TextIOBase | None = None,
+) -> int | None:
+    """Run ``argv`` in the daemon and return its exit status.
+
+    Returns ``None`` when no daemon accepts the connection, when the socket
+    is served by another user (nothing is sent then), or when the daemon
+    closes the connection without a reply before any standard input was
+    sent, so the caller can run the lesson itself.
+    """
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+    path = default_socket_path() if path is None else path
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        owned = _is_own_socket(connection, path)
+    except OSError:
+        connection.close()
+        return None
+    if not owned:
+        connection.close()
+        stderr.write(f"ignoring {path}: it is served by another user.\n")
+        return None
+    with connection:
+        header = {"argv": list(argv), "prog": sys.argv[0], "cwd": os.getcwd()}
+        forwards_stdin = _forwards_stdin(argv)
+        try:
+            connection.sendall(json.dumps(header).encode() + b"\n")
+            if forwards_stdin:
+                source = stdin.buffer
+                while True:
+                    chunk = source.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    connection.sendall(chunk)
+            connection.shutdown(socket.SHUT_WR)
+            with connection.makefile("rb") as replies:
+                line = replies.readline()
+        except OSError:
+            line = b""
+    try:
+        reply = json.loads(line)
+    except ValueError:
+        if not line and not forwards_stdin:
+            return None
+        stderr.write("the summing daemon did not send a valid reply.\n")
+        return 1
+    stdout.write(reply["stdout"])
+    stderr.write(reply["stderr"])
+    return reply["code"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Forward ``argv`` to the daemon, or run the lesson when none listens."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    code = forward(argv) if argv and not _reads_stdin_file(argv) else None
+    if code is None:
+        from demos.summing_methods import main as lesson_main
+
+        return lesson_main(argv)
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
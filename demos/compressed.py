@@ -0,0 +1,114 @@
+"""Detect compressed input by its magic bytes and decompress it as a stream.
+
+gzip, bz2 and xz use the standard library; zstd uses ``compression.zstd``
+on Python 3.14 and later, or the optional ``zstandard`` package. Data is
+decompressed chunk by chunk as the reader asks for it, so nothing is
+written to disk or held in memory whole.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from typing import BinaryIO, Optional, Union
+
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+MAGIC_SIZE = max(map(len, COMPRESSION_MAGIC.values()))
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Return the compression named by the leading bytes ``head``, if any."""
+    for name, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def is_compressed(path: Union[str, os.PathLike[str]]) -> bool:
+    """Return whether the file at ``path`` starts with a compression magic."""
+    with open(path, "rb") as file:
+        return detect_compression(file.read(MAGIC_SIZE)) is not None
+
+
+def _peek(stream: BinaryIO) -> bytes:
+    if hasattr(stream, "peek"):
+        return stream.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+    position = stream.tell()
+    head = stream.read(MAGIC_SIZE)
+    stream.seek(position)
+    return head
+
+
+def _open_zstd(stream: BinaryIO) -> BinaryIO:
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(
+                "zstd input needs Python 3.14 or the zstandard package."
+            ) from None
+        return zstandard.ZstdDecompressor().stream_reader(
+            stream, read_across_frames=True
+        )
+    return zstd.ZstdFile(stream)
+
+
+def _open_reader(stream: BinaryIO, compression: str) -> BinaryIO:
+    if compression == "gzip":
+        import gzip
+
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "bz2":
+        import bz2
+
+        return bz2.BZ2File(stream)
+    if compression == "xz":
+        import lzma
+
+        return lzma.LZMAFile(stream)
+    return _open_zstd(stream)
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Raw reader that reports corrupt or truncated data as ``ValueError``."""
+
+    def __init__(self, reader: BinaryIO, compression: str) -> None:
+        super().__init__()
+        self._reader = reader
+        self._compression = compression
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: memoryview) -> int:
+        try:
+            data = self._reader.read(len(buffer))
+        except Exception as exc:  # each decompressor has its own error types
+            raise ValueError(
+                f"cannot decompress {self._compression} input ({exc})."
+            ) from exc
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def open_decompressed(
+    stream: BinaryIO, buffer_size: int = io.DEFAULT_BUFFER_SIZE
+) -> BinaryIO:
+    """Return a decompressing reader for ``stream``, or ``stream`` itself.
+
+    The magic bytes are peeked, or read and sought back, without consuming
+    them. Multi-member gzip and multi-stream bz2, xz and zstd data are read
+    to the end; corrupt or truncated data raises ``ValueError``.
+    """
+    compression = detect_compression(_peek(stream))
+    if compression is None:
+        return stream
+    reader = _DecompressingReader(_open_reader(stream, compression), compression)
+    return io.BufferedReader(reader, buffer_size)
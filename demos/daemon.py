@@ -0,0 +1,139 @@
+"""Long-lived summation daemon that serves :mod:`demos.client` requests.
+
+``python -m demos.daemon [PATH]`` imports the lesson once and answers
+requests on a Unix socket, by default the path from
+:func:`demos.client.default_socket_path`. Each request runs the lesson's
+``main`` with the client's arguments, standard input and working directory,
+so a call costs a socket round trip instead of an interpreter start.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Dict, Optional, Sequence
+
+from demos.client import default_socket_path
+from demos.summing_methods import main as lesson_main
+
+
+def _exit_status(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _read_header(line: bytes) -> Dict[str, object]:
+    try:
+        header = json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"invalid request header ({exc}).") from exc
+    if not isinstance(header, dict) or not isinstance(header.get("argv"), list):
+        raise ValueError("the request header must be a JSON object with an argv list.")
+    return header
+
+
+def run_request(rfile: io.BufferedIOBase) -> Optional[Dict[str, object]]:
+    """Run one forwarded request read from ``rfile`` and return the reply.
+
+    The request runs with the client's ``argv[0]``, working directory and
+    standard input, and with stdout and stderr captured, so argparse
+    messages and exit statuses match an in-process run. A connection closed
+    without a request, such as :func:`make_server`'s liveness probe, returns
+    ``None``; a malformed header is answered with status 1.
+    """
+    line = rfile.readline()
+    if not line.strip():
+        return None
+    try:
+        header = _read_header(line)
+    except ValueError as exc:
+        return {"code": 1, "stdout": "", "stderr": f"{exc}\n"}
+    captured_out, captured_err = io.StringIO(), io.StringIO()
+    saved = sys.argv, sys.stdin, os.getcwd()
+    stdin = io.TextIOWrapper(rfile)
+    cwd = header.get("cwd") or saved[2]
+    try:
+        sys.argv = [header.get("prog") or "summing_methods.py"]
+        sys.stdin = stdin
+        with redirect_stdout(captured_out), redirect_stderr(captured_err):
+            try:
+                os.chdir(cwd)
+            except (OSError, TypeError) as exc:
+                print(f"cannot change to {cwd!r}: {exc}.", file=sys.stderr)
+                code = 1
+            else:
+                try:
+                    code = lesson_main(header["argv"])
+                except SystemExit as exit_request:
+                    code = _exit_status(exit_request.code)
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+    finally:
+        stdin.detach()
+        sys.argv, sys.stdin = saved[0], saved[1]
+        os.chdir(saved[2])
+    return {
+        "code": code,
+        "stdout": captured_out.getvalue(),
+        "stderr": captured_err.getvalue(),
+    }
+
+
+def make_server(path: Optional[str] = None) -> socketserver.UnixStreamServer:
+    """Bind the daemon's Unix socket, readable only by the current user.
+
+    Requests are served one at a time because each one temporarily owns the
+    process's ``sys.stdout``, ``sys.stderr`` and working directory.
+    """
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            reply = run_request(self.rfile)
+            if reply is not None:
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+    path = default_socket_path() if path is None else path
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise OSError(f"a daemon is already listening on {path}")
+        finally:
+            probe.close()
+    old_umask = os.umask(0o177)
+    try:
+        return socketserver.UnixStreamServer(path, RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Serve requests on ``argv[0]`` or the default socket until interrupted."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    server = make_server(argv[0] if argv else None)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(server.server_address)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
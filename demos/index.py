@@ -0,0 +1,417 @@
+"""Block index for fast range sums over a stored numeric file.
+
+:func:`build_index` parses a whitespace-separated file once and writes a
+sidecar ``.sumidx`` file. Every ``block_size`` values it records the byte
+offset of the block, the block sums of all and of the positive values, and
+the prefix sign counts; segment trees over the block minima and maxima
+follow. :class:`RangeIndex` memory-maps both files and answers a range sum
+or summary from two prefix entries, O(log n) tree nodes and at most two
+partial blocks parsed from the data, however long the range.
+
+Whole-number files are indexed as ``int64`` values with exact 128-bit
+prefix sums, so integer range sums are exact. ``allow_float`` files keep a
+segment tree of exact float expansions of the block sums instead of
+prefixes, which would cancel once a large value dominates them; a range sum
+adds the expansions of O(log n) nodes and the edge values with
+``math.fsum``, so it is correctly rounded.
+"""
+
+from __future__ import annotations
+
+import array
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from itertools import islice
+from operator import add
+from typing import Dict, List, Optional, Tuple, Union
+
+from demos.binary import typed_view
+from demos.summing_methods import (
+    Number,
+    float_expansion,
+    iter_token_ranges,
+    parse_cli_numbers,
+)
+
+INDEX_SUFFIX = ".sumidx"
+INDEX_MAGIC = b"SUMIDX2\0"
+INDEX_BLOCK_SIZE = 1024
+_HEADER = struct.Struct("<8scxxxIQQqQ")
+_TOKEN = re.compile(rb"\S+")
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+_INT128_LIMIT = 2**127
+
+
+def index_path(path: Union[str, os.PathLike[str]]) -> str:
+    """Return the sidecar index path for the data file ``path``."""
+    return os.fspath(path) + INDEX_SUFFIX
+
+
+def _split_int128(value: int) -> Tuple[int, int]:
+    if not -_INT128_LIMIT <= value < _INT128_LIMIT:
+        raise ValueError("a prefix sum does not fit in the 128-bit index.")
+    return value & (2**64 - 1), value >> 64
+
+
+def _segment_tree(leaves: List, pick) -> List:
+    size = len(leaves)
+    tree = [leaves[0]] * size + leaves
+    for node in range(size - 1, 0, -1):
+        tree[node] = pick(tree[2 * node], tree[2 * node + 1])
+    return tree
+
+
+def _merge_expansions(left: List[float], right: List[float]) -> List[float]:
+    return float_expansion([*left, *right])
+
+
+class _Prefix:
+    """Exact integer prefix sum written as two ``array`` columns per boundary."""
+
+    def __init__(self) -> None:
+        self.exact = 0
+        self.columns = (array.array("Q"), array.array("q"))
+
+    def add(self, values: List[Number]) -> None:
+        self.exact += sum(values)
+
+    def record(self) -> None:
+        for column, value in zip(self.columns, _split_int128(self.exact)):
+            column.append(value)
+
+    def arrays(self) -> List[array.array]:
+        return list(self.columns)
+
+
+class _BlockExpansions:
+    """Exact float block sums written as a segment tree of expansions.
+
+    Node ``i`` holds ``terms[offsets[i]:offsets[i + 1]]``, so the tree is an
+    offset column followed by one column of all the terms.
+    """
+
+    def __init__(self) -> None:
+        self.leaves: List[List[float]] = []
+
+    def add(self, values: List[Number]) -> None:
+        self.leaves.append(float_expansion(values))
+
+    def record(self) -> None:
+        pass
+
+    def arrays(self) -> List[array.array]:
+        offsets, terms = array.array("Q", [0]), array.array("d")
+        if self.leaves:
+            for node in _segment_tree(self.leaves, _merge_expansions):
+                terms.extend(node)
+                offsets.append(len(terms))
+        return [offsets, terms]
+
+
+class _ExpansionTree:
+    """Read-only view of a :class:`_BlockExpansions` tree in the index."""
+
+    def __init__(self, offsets, terms) -> None:
+        self.offsets = offsets
+        self.terms = terms
+
+    def __getitem__(self, node: int) -> List[float]:
+        return list(self.terms[self.offsets[node] : self.offsets[node + 1]])
+
+
+def build_index(
+    path: Union[str, os.PathLike[str]],
+    allow_float: bool = False,
+    block_size: int = INDEX_BLOCK_SIZE,
+) -> Tuple[int, int]:
+    """Write the index for ``path`` and return its value and block counts.
+
+    Values follow the :func:`parse_cli_numbers` contract; whole numbers must
+    fit in 64 bits. The index is written to a temporary file and then moved
+    into place, so a reader never sees a partial index.
+    """
+    if block_size < 1:
+        raise ValueError("the block size must be at least 1.")
+    typecode = "d" if allow_float else "q"
+    offsets = array.array("Q")
+    if allow_float:
+        prefix, positive = _BlockExpansions(), _BlockExpansions()
+    else:
+        prefix, positive = _Prefix(), _Prefix()
+    positive_counts, negative_counts = array.array("Q"), array.array("Q")
+    minima: List[Number] = []
+    maxima: List[Number] = []
+    counts = [0, 0]
+    count = 0
+    block: List[Number] = []
+
+    def finish_block() -> None:
+        positives = [value for value in block if value > 0]
+        prefix.add(block)
+        positive.add(positives)
+        counts[0] += len(positives)
+        counts[1] += sum(1 for value in block if value < 0)
+        minima.append(min(block))
+        maxima.append(max(block))
+        block.clear()
+
+    def record_boundary() -> None:
+        prefix.record()
+        positive.record()
+        positive_counts.append(counts[0])
+        negative_counts.append(counts[1])
+
+    with open(path, "rb") as file:
+        status = os.fstat(file.fileno())
+        if status.st_size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start, end in iter_token_ranges(mapped):
+                    data = mapped[start:end]
+                    numbers = parse_cli_numbers(data.split(), allow_float)
+                    if not allow_float:
+                        for number in numbers:
+                            if not _INT64_MIN <= number <= _INT64_MAX:
+                                raise ValueError(
+                                    f"{number} does not fit in a 64-bit index."
+                                )
+                    first = -count % block_size
+                    tokens = islice(_TOKEN.finditer(data), first, None, block_size)
+                    starts = iter([start + match.start() for match in tokens])
+                    position = 0
+                    while position < len(numbers):
+                        if not block:
+                            offsets.append(next(starts))
+                            record_boundary()
+                        take = min(block_size - len(block), len(numbers) - position)
+                        block.extend(numbers[position : position + take])
+                        position += take
+                        count += take
+                        if len(block) == block_size:
+                            finish_block()
+        if block:
+            finish_block()
+        offsets.append(status.st_size)
+        record_boundary()
+    blocks = len(minima)
+    # Integer prefix columns have one entry per boundary; the variable-length
+    # float expansion trees go last so the fixed columns keep their offsets.
+    sums = [*prefix.arrays(), *positive.arrays()]
+    arrays = [
+        offsets,
+        *([] if allow_float else sums),
+        positive_counts,
+        negative_counts,
+        array.array(typecode, _segment_tree(minima, min) if blocks else []),
+        array.array(typecode, _segment_tree(maxima, max) if blocks else []),
+        *(sums if allow_float else []),
+    ]
+    header = _HEADER.pack(
+        INDEX_MAGIC,
+        b"f" if allow_float else b"i",
+        block_size,
+        count,
+        status.st_size,
+        status.st_mtime_ns,
+        blocks,
+    )
+    target = index_path(path)
+    temporary = target + ".tmp"
+    with open(temporary, "wb") as output:
+        output.write(header)
+        for values in arrays:
+            if sys.byteorder != "little":
+                values.byteswap()
+            values.tofile(output)
+    os.replace(temporary, target)
+    return count, blocks
+
+
+class RangeIndex:
+    """Answer range sums over a data file from its memory-mapped index.
+
+    Ranges are zero-based and half-open, like Python slices. Use
+    :meth:`close`, or the instance as a context manager, to release the
+    mappings.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike[str]]) -> None:
+        target = index_path(path)
+        try:
+            with open(target, "rb") as file:
+                self._index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise ValueError(
+                f"{os.fspath(path)!r} has no index; build one first."
+            ) from None
+        if self._index[: len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f"{target!r} is not a current range index; rebuild it.")
+        (_, kind, self.block_size, self.count, size, mtime_ns, self.blocks) = (
+            _HEADER.unpack_from(self._index)
+        )
+        self.allow_float = kind == b"f"
+        with open(path, "rb") as file:
+            status = os.fstat(file.fileno())
+            if (status.st_size, status.st_mtime_ns) != (size, mtime_ns):
+                raise ValueError(
+                    f"the index for {os.fspath(path)!r} is out of date; rebuild it."
+                )
+            self._data = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+        typecode = "d" if self.allow_float else "q"
+        boundaries = self.blocks + 1
+        nodes = 2 * self.blocks
+        sums = [] if self.allow_float else [("Q", boundaries), ("q", boundaries)] * 2
+        layout = [
+            ("Q", boundaries),
+            *sums,
+            ("Q", boundaries),
+            ("Q", boundaries),
+            (typecode, nodes),
+            (typecode, nodes),
+        ]
+        view = self._view = memoryview(self._index)
+        columns = []
+        start = _HEADER.size
+
+        def read(code: str, length: int):
+            nonlocal start
+            stop = start + 8 * length
+            column = typed_view(view[start:stop], code)
+            columns.append(column)
+            start = stop
+            return column
+
+        (
+            self._offsets,
+            *prefix,
+            self._positive_counts,
+            self._negative_counts,
+            self._minima,
+            self._maxima,
+        ) = [read(code, length) for code, length in layout]
+        if self.allow_float:
+            trees = []
+            for _ in range(2):
+                tree_offsets = read("Q", nodes + 1)
+                trees.append((tree_offsets, read("d", tree_offsets[-1])))
+            self._prefix = _ExpansionTree(*trees[0])
+            self._positive = _ExpansionTree(*trees[1])
+        else:
+            self._prefix = tuple(prefix[:2])
+            self._positive = tuple(prefix[2:])
+        self._columns = columns
+
+    def close(self) -> None:
+        """Release the memory maps of the index and the data file."""
+        for column in self._columns:
+            if isinstance(column, memoryview):
+                column.release()
+        self._view.release()
+        self._index.close()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> RangeIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _block_values(self, block: int) -> List[Number]:
+        data = self._data[self._offsets[block] : self._offsets[block + 1]]
+        return parse_cli_numbers(data.split(), self.allow_float)
+
+    def _range_terms(self, sums, first: int, last: int) -> List[Number]:
+        """Return terms whose exact sum is that of blocks ``first`` to ``last``."""
+        if self.allow_float:
+            return self._tree_pick(sums, first, last, add) or []
+        one, two = sums
+        return [one[last] + (two[last] << 64) - one[first] - (two[first] << 64)]
+
+    def _add(self, terms: List[Number]) -> Number:
+        return math.fsum(terms) if self.allow_float else sum(terms)
+
+    def _tree_pick(self, tree, start: int, stop: int, pick) -> Optional[Number]:
+        result = None
+        start += self.blocks
+        stop += self.blocks
+        while start < stop:
+            if start & 1:
+                value = tree[start]
+                result = value if result is None else pick(result, value)
+                start += 1
+            if stop & 1:
+                stop -= 1
+                value = tree[stop]
+                result = value if result is None else pick(result, value)
+            start >>= 1
+            stop >>= 1
+        return result
+
+    def _split(self, start: int, stop: int) -> Tuple[int, int, List[Number]]:
+        if not 0 <= start <= stop <= self.count:
+            raise ValueError(
+                f"the range {start}:{stop} is outside the {self.count} indexed values."
+            )
+        first = -(-start // self.block_size)
+        last = self.blocks if stop == self.count else stop // self.block_size
+        if first > last:
+            block = start // self.block_size
+            offset = block * self.block_size
+            values = self._block_values(block)[start - offset : stop - offset]
+            return 0, 0, values
+        values = []
+        if start < first * self.block_size:
+            head = self._block_values(first - 1)
+            values.extend(head[start - (first - 1) * self.block_size :])
+        if stop < self.count and stop % self.block_size:
+            values.extend(self._block_values(last)[: stop % self.block_size])
+        return first, last, values
+
+    def sum(self, start: int = 0, stop: Optional[int] = None) -> Number:
+        """Return the sum of values ``start`` up to, but not including, ``stop``."""
+        first, last, values = self._split(start, self.count if stop is None else stop)
+        return self._add([*self._range_terms(self._prefix, first, last), *values])
+
+    def summary(self, start: int = 0, stop: Optional[int] = None) -> Dict[str, object]:
+        """Return the :func:`analyze_numbers` counts, sums and extremes of a range.
+
+        The median and the value lists need every value and are left out.
+        """
+        stop = self.count if stop is None else stop
+        first, last, values = self._split(start, stop)
+        positives = [value for value in values if value > 0]
+        negatives = [value for value in values if value < 0]
+        total_terms = self._range_terms(self._prefix, first, last)
+        positive_terms = self._range_terms(self._positive, first, last)
+        total = self._add([*total_terms, *values])
+        positive_count = len(positives) + (
+            self._positive_counts[last] - self._positive_counts[first]
+        )
+        negative_count = len(negatives) + (
+            self._negative_counts[last] - self._negative_counts[first]
+        )
+        count = stop - start
+        extremes = []
+        for tree, pick in ((self._minima, min), (self._maxima, max)):
+            candidates = [self._tree_pick(tree, first, last, pick), *values]
+            candidates = [value for value in candidates if value is not None]
+            extremes.append(pick(candidates) if candidates else None)
+        return {
+            "total": total,
+            "positive_sum": self._add([*positive_terms, *positives]),
+            "negative_sum": self._add(
+                [*total_terms, *(-term for term in positive_terms), *negatives]
+            ),
+            "positive_count": positive_count,
+            "negative_count": negative_count,
+            "zero_count": count - positive_count - negative_count,
+            "mean": total / count if count else None,
+            "minimum": extremes[0],
+            "maximum": extremes[1],
+        }
@@ -0,0 +1,139 @@
+"""Process-parallel reductions built on the canonical summation methods."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple, Union
+
+from demos.accumulate import merge_shard_results, shard_method
+from demos.compressed import is_compressed
+from demos.summing_methods import Number, STREAM_CHUNK_SIZE, iter_buffer_batches
+
+MIN_SHARD_SIZE = 100_000
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    count = (os.cpu_count() or 1) if workers is None else workers
+    if count < 1:
+        raise ValueError("workers must be at least 1.")
+    return count
+
+
+def sum_parallel(
+    nums: Sequence[Number],
+    workers: Optional[int] = None,
+    method: str = "builtin",
+    min_shard_size: int = MIN_SHARD_SIZE,
+) -> Number:
+    """Sum ``nums`` by reducing contiguous shards in a process pool.
+
+    ``workers`` defaults to ``os.cpu_count()``. Inputs shorter than
+    ``min_shard_size`` per worker run in-process because pickling the shards
+    would cost more than the arithmetic. ``fsum`` and ``exact`` match their
+    sequential results, and ``builtin``, ``reduce``, ``numpy`` and ``bigint``
+    keep integer totals exact. Otherwise each shard total is rounded to a
+    float separately, so the last bits can differ from a sequential sum; the
+    compensated methods round integer shard totals too.
+    """
+    reduce_shard, combine = shard_method(method)
+    count = min(_worker_count(workers), max(1, len(nums) // max(1, min_shard_size)))
+    if count == 1:
+        return combine([reduce_shard(nums)])
+    step = -(-len(nums) // count)
+    shards = [nums[index:index + step] for index in range(0, len(nums), step)]
+    with ProcessPoolExecutor(max_workers=count) as executor:
+        return combine(list(executor.map(reduce_shard, shards)))
+
+
+def _next_token_boundary(
+    buffer: mmap.mmap, position: int, window: int = STREAM_CHUNK_SIZE
+) -> int:
+    """Return the offset just past the first whitespace byte at ``position``.
+
+    The buffer is searched ``window`` bytes at a time, so finding the end of
+    a short token never scans the rest of the file.
+    """
+    size = len(buffer)
+    while position < size:
+        block = buffer[position:position + window]
+        if block[:1].isspace():
+            return position + 1
+        token = block.split(maxsplit=1)[0]
+        if len(token) < len(block):
+            return position + len(token) + 1
+        position += len(block)
+    return size
+
+
+def file_shards(
+    path: Union[str, os.PathLike[str]], count: int
+) -> List[Tuple[int, int]]:
+    """Split a whitespace-separated file into ``count`` token-aligned ranges."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = [0]
+            for index in range(1, count):
+                boundary = max(bounds[-1], size * index // count)
+                if boundary and not mapped[boundary - 1:boundary].isspace():
+                    boundary = _next_token_boundary(mapped, boundary)
+                bounds.append(boundary)
+            bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def _reduce_file_shard(
+    path: Union[str, os.PathLike[str]],
+    start: int,
+    stop: int,
+    allow_float: bool,
+    method: str,
+) -> Tuple[int, object]:
+    reduce_shard = shard_method(method)[0]
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            count = 0
+            results = []
+            for batch in iter_buffer_batches(
+                mapped, allow_float, STREAM_CHUNK_SIZE, start, stop
+            ):
+                count += len(batch)
+                results.append(reduce_shard(batch))
+    return count, merge_shard_results(method, results)
+
+
+def sum_file_parallel(
+    path: Union[str, os.PathLike[str]],
+    workers: Optional[int] = None,
+    method: str = "builtin",
+    allow_float: bool = False,
+) -> Optional[Number]:
+    """Sum a whitespace-separated file by parsing byte ranges in parallel.
+
+    Each worker maps the file itself and parses only its token-aligned range,
+    so no numbers cross process boundaries. Returns ``None`` when the file
+    holds no numbers; parse errors raise the :func:`parse_cli_numbers`
+    ``ValueError``, as do pipes and compressed files, which cannot be split.
+    """
+    if not stat.S_ISREG(os.stat(path).st_mode):
+        raise ValueError("only regular files can be split across workers.")
+    if is_compressed(path):
+        raise ValueError("compressed files cannot be split across workers.")
+    combine = shard_method(method)[1]
+    shards = file_shards(path, _worker_count(workers))
+    if not shards:
+        return None
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [
+            executor.submit(_reduce_file_shard, path, start, stop, allow_float, method)
+            for start, stop in shards
+        ]
+        results = [future.result() for future in futures]
+    if not sum(count for count, _ in results):
+        return None
+    return combine([partial for _, partial in results])
@@ -0,0 +1,138 @@
+"""Overlap reading, parsing and summing with threads and bounded queues.
+
+A reader thread pulls blocks from the stream, a parser thread turns them
+into number batches, and the calling thread sums the batches. Each queue
+holds at most ``depth`` items, so a fast stage blocks until the next one
+catches up instead of buffering the whole input. Reads and decompression
+release the GIL and overlap with parsing; parsing and summing are pure
+Python and still take turns.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from demos.summing_methods import (
+    STREAM_CHUNK_SIZE,
+    Number,
+    get_sum_method,
+    iter_chunk_batches,
+    iter_stream_chunks,
+    sum_stream,
+)
+
+PIPELINE_DEPTH = 4
+PIPELINE_STOP_TIMEOUT = 0.5
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception raised in a stage to the thread reading its queue."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _produce(items: Iterable[object], output: queue.Queue, stop: threading.Event):
+    try:
+        for item in items:
+            if stop.is_set():
+                break
+            output.put(item)
+    except BaseException as exc:
+        output.put(_Failure(exc))
+    output.put(_DONE)
+
+
+def _consume(items: queue.Queue) -> Iterator[object]:
+    while True:
+        item = items.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def _drain(items: queue.Queue) -> None:
+    try:
+        while True:
+            items.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def iter_pipelined_batches(
+    stream: BinaryIO,
+    allow_float: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    depth: int = PIPELINE_DEPTH,
+) -> Iterator[List[Number]]:
+    """Yield the batches of :func:`iter_stream_batches` from worker threads.
+
+    Errors raised while reading or parsing are re-raised here. Closing the
+    generator early stops both threads; a reader still blocked in
+    ``stream.read`` after ``PIPELINE_STOP_TIMEOUT`` seconds, as on a live
+    pipe, is left to finish that read on its own daemon thread.
+    """
+    blocks: queue.Queue = queue.Queue(depth)
+    batches: queue.Queue = queue.Queue(depth)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=_produce,
+            args=(iter_stream_chunks(stream, chunk_size), blocks, stop),
+            name="sum-reader",
+            daemon=True,
+        ),
+        threading.Thread(
+            target=_produce,
+            args=(iter_chunk_batches(_consume(blocks), allow_float), batches, stop),
+            name="sum-parser",
+            daemon=True,
+        ),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        yield from _consume(batches)
+    finally:
+        # Stop the parser before the reader: draining ``blocks`` while the
+        # parser still reads it could discard the reader's end marker.
+        stop.set()
+        deadline = time.monotonic() + PIPELINE_STOP_TIMEOUT
+        reader, parser = threads
+        while parser.is_alive() and time.monotonic() < deadline:
+            _drain(batches)
+            # Wake a parser that waits for a reader blocked in a read.
+            try:
+                blocks.put_nowait(_DONE)
+            except queue.Full:
+                pass
+            parser.join(0.01)
+        while reader.is_alive() and time.monotonic() < deadline:
+            _drain(blocks)
+            reader.join(0.01)
+
+
+def sum_pipelined(
+    stream: BinaryIO,
+    method: str = "builtin",
+    allow_float: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    depth: int = PIPELINE_DEPTH,
+) -> Optional[Number]:
+    """Sum a whitespace-separated stream with reading and parsing pipelined.
+
+    Returns the same value as :func:`sum_stream` over
+    :func:`iter_stream_batches`, or ``None`` when the stream holds no
+    numbers; parse errors raise the :func:`parse_cli_numbers` ``ValueError``.
+    """
+    batches = iter_pipelined_batches(stream, allow_float, chunk_size, depth)
+    try:
+        return sum_stream(batches, get_sum_method(method))
+    finally:
+        batches.close()
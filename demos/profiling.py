@@ -0,0 +1,108 @@
+"""Profile a summation's calls and memory with cProfile and tracemalloc.
+
+:func:`profile_summation` runs the body of a ``with`` block under
+:mod:`cProfile` and :mod:`tracemalloc` and fills in a
+:class:`SummationProfile`: the call statistics, the peak of traced memory
+above what was allocated when the block started, and the source lines
+still holding the most new memory when it ends. cProfile only sees the
+calling thread; tracemalloc counts allocations made by every thread.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+PROFILE_LIMIT = 15
+TRACEBACK_FRAMES = 1
+
+# Allocations made by the profilers, or by importing modules on first use,
+# are not the summation's.
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    pstats.__file__,
+    cProfile.__file__,
+    __file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+)
+
+
+class SummationProfile:
+    """Call statistics and memory measurements of one profiled block."""
+
+    def __init__(self) -> None:
+        self.stats: Optional[pstats.Stats] = None
+        self.peak_bytes = 0
+        self.allocations: List[tracemalloc.StatisticDiff] = []
+
+    def format(
+        self, limit: int = PROFILE_LIMIT, input_size: Optional[int] = None
+    ) -> str:
+        """Return a report of the peak, the top ``limit`` allocating lines and
+        the ``limit`` functions with the most cumulative time.
+
+        With ``input_size``, the peak is also given as a multiple of it.
+        """
+        peak = f"Peak traced memory: {self.peak_bytes:,} bytes"
+        if input_size:
+            peak += (
+                f" ({self.peak_bytes / input_size:.1f}x the {input_size:,}-byte input)"
+            )
+        lines = [peak, "Top allocations still held:"]
+        for allocation in self.allocations[:limit]:
+            frame = allocation.traceback[0]
+            lines.append(
+                f"  {frame.filename}:{frame.lineno}: "
+                f"{allocation.size_diff:,} bytes in {allocation.count_diff:,} blocks"
+            )
+        if len(lines) == 2:
+            lines.append("  none")
+        output = io.StringIO()
+        if self.stats is not None:
+            self.stats.stream = output
+            self.stats.sort_stats("cumulative").print_stats(limit)
+        return "\n".join(lines) + "\n" + output.getvalue()
+
+
+@contextmanager
+def profile_summation(
+    frames: int = TRACEBACK_FRAMES,
+) -> Iterator[SummationProfile]:
+    """Profile the ``with`` block and yield the :class:`SummationProfile`.
+
+    The profile is filled in when the block exits. tracemalloc keeps
+    ``frames`` frames per allocation, and is left running if it was already
+    tracing before the block.
+    """
+    profile = SummationProfile()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    before = tracemalloc.take_snapshot()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        if not was_tracing:
+            tracemalloc.stop()
+        ignored = [tracemalloc.Filter(False, name) for name in _IGNORED_FILES]
+        profile.stats = pstats.Stats(profiler)
+        profile.peak_bytes = max(peak - baseline, 0)
+        profile.allocations = [
+            allocation
+            for allocation in after.filter_traces(ignored).compare_to(
+                before.filter_traces(ignored), "lineno"
+            )
+            if allocation.size_diff > 0
+        ]
@@ -0,0 +1,205 @@
+"""Asyncio summation service for newline-delimited numbers.
+
+Each connection sends whitespace- or newline-separated numbers and closes its
+write side; the server answers with one JSON line. An optional first line
+holding a JSON object selects per-connection options, for example
+``{"method": "fsum", "float": true, "analyze": true}``. Parsing and
+accumulation of each chunk run in an executor, so a large upload never
+blocks the event loop for other connections.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional, Sequence
+
+from demos.accumulate import BatchAccumulator
+from demos.summing_methods import (
+    STREAM_CHUNK_SIZE,
+    SUM_METHODS,
+    parse_cli_numbers,
+    split_at_token_boundary,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_OPTIONS_LINE = 4096
+
+# The JSON type each option must have on the options line.
+_OPTION_TYPES = {"method": str, "float": bool, "analyze": bool}
+
+
+def _read_options(line: bytes, defaults: Dict[str, object]) -> Dict[str, object]:
+    options = dict(defaults)
+    try:
+        requested = json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"invalid options line ({exc}).") from exc
+    if not isinstance(requested, dict):
+        raise ValueError("the options line must be a JSON object.")
+    unknown = set(requested) - set(options)
+    if unknown:
+        raise ValueError(f"unknown options: {', '.join(sorted(unknown))}.")
+    for name, value in requested.items():
+        if not isinstance(value, _OPTION_TYPES[name]):
+            kind = _OPTION_TYPES[name].__name__
+            raise ValueError(f"the {name!r} option must be a {kind}, not {value!r}.")
+    options.update(requested)
+    if options["method"] not in SUM_METHODS:
+        raise ValueError(f"{options['method']!r} is not a summation method.")
+    return options
+
+
+def _accumulate(accumulator: BatchAccumulator, data: bytes, allow_float: bool) -> None:
+    accumulator.add_batch(parse_cli_numbers(data.split(), allow_float))
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str = "builtin",
+    allow_float: bool = False,
+    analyze: bool = False,
+    executor: Optional[Executor] = None,
+) -> None:
+    """Sum one connection's numbers and reply with a JSON result line.
+
+    The reply is ``{"count": ..., "sum": ...}`` plus ``"analysis"`` when
+    requested, or ``{"error": ...}`` when the options or the input break the
+    lesson's numeric contract, the input holds no numbers, or the sum leaves
+    the float range.
+    """
+    loop = asyncio.get_running_loop()
+    defaults = {"method": method, "float": allow_float, "analyze": analyze}
+    try:
+        first = await reader.read(STREAM_CHUNK_SIZE)
+        options = defaults
+        if first.lstrip().startswith(b"{"):
+            while b"\n" not in first and len(first) < MAX_OPTIONS_LINE:
+                more = await reader.read(STREAM_CHUNK_SIZE)
+                if not more:
+                    break
+                first += more
+            line, _, first = first.partition(b"\n")
+            options = _read_options(line, defaults)
+        accumulator = BatchAccumulator(str(options["method"]), bool(options["analyze"]))
+        allow = bool(options["float"])
+        pending = b""
+        data = first
+        while data:
+            complete, pending = split_at_token_boundary(pending + data)
+            if complete:
+                await loop.run_in_executor(
+                    executor, _accumulate, accumulator, complete, allow
+                )
+            data = await reader.read(STREAM_CHUNK_SIZE)
+        if pending:
+            await loop.run_in_executor(
+                executor, _accumulate, accumulator, pending, allow
+            )
+        if not accumulator.count:
+            raise ValueError("at least one number is required.")
+        try:
+            reply = json.dumps(accumulator.result(), allow_nan=False)
+        except ValueError:
+            # Methods other than fsum overflow to inf, which JSON cannot hold.
+            raise OverflowError("float overflow") from None
+    except (TypeError, ValueError) as exc:
+        reply = json.dumps({"error": str(exc)})
+    except OverflowError as exc:
+        reply = json.dumps({"error": f"the sum is out of range ({exc})."})
+    writer.write(reply.encode() + b"\n")
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    path: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    **defaults: object,
+) -> asyncio.AbstractServer:
+    """Start a TCP server, or a Unix-socket server when ``path`` is given.
+
+    ``defaults`` are the ``method``, ``allow_float`` and ``analyze`` keyword
+    arguments of :func:`handle_connection`.
+    """
+
+    async def handler(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await handle_connection(reader, writer, executor=executor, **defaults)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path)
+    return await asyncio.start_server(handler, host, port)
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    """Build the service command-line interface."""
+    parser = argparse.ArgumentParser(
+        prog="python -m demos.service",
+        description="Serve summations of newline-delimited numbers over a socket.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="TCP address to bind")
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="TCP port to bind"
+    )
+    parser.add_argument("--unix", metavar="PATH", help="serve on a Unix socket instead")
+    parser.add_argument(
+        "--method",
+        choices=sorted(SUM_METHODS),
+        default="builtin",
+        help="default summation method (default: builtin)",
+    )
+    parser.add_argument(
+        "--float",
+        dest="allow_float",
+        action="store_true",
+        help="parse numbers as finite floating-point values by default",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="include the analyze_numbers breakdown by default",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=None, help="executor threads for parsing"
+    )
+    return parser
+
+
+async def _serve_forever(arguments: argparse.Namespace) -> None:
+    with ThreadPoolExecutor(max_workers=arguments.threads) as executor:
+        server = await start_server(
+            arguments.host,
+            arguments.port,
+            arguments.unix,
+            executor,
+            method=arguments.method,
+            allow_float=arguments.allow_float,
+            analyze=arguments.analyze,
+        )
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the service until interrupted."""
+    arguments = build_argument_parser().parse_args([] if argv is None else argv)
+    try:
+        asyncio.run(_serve_forever(arguments))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
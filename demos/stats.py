@@ -0,0 +1,203 @@
+"""Per-stage counters and timers for the summation hot path.
+
+:func:`collect_stats` switches on the instrumentation in
+:mod:`demos.summing_methods` for the duration of a ``with`` block. Four
+stages are timed: ``read`` (bytes pulled from a stream or mapped file),
+``parse`` (tokens converted to numbers), ``validate`` (the finiteness check
+of float input) and ``accumulate`` (the summation method consuming the
+numbers). Splitting bytes into tokens is left out, so the stage times add
+up to a little less than the elapsed time. While no collector is installed
+the instrumented functions only test one global per batch.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from contextlib import contextmanager
+from time import perf_counter_ns
+from types import ModuleType
+from typing import Dict, Iterator, List, Optional
+
+import demos.summing_methods
+
+STAT_FORMATS = ("json", "prometheus")
+PROMETHEUS_PREFIX = "demos_summing"
+
+# Each stage's throughput is measured in the items it processes.
+_STAGE_UNITS = {
+    "read": "bytes",
+    "parse": "tokens",
+    "validate": "tokens",
+    "accumulate": "numbers",
+}
+
+
+class SummationStats:
+    """Counters and nanosecond timers filled in while summing.
+
+    The reader and parser threads of :mod:`demos.pipeline` update different
+    counters, so one instance can be shared by a whole pipelined run; their
+    stage times overlap instead of adding up to the elapsed time.
+    """
+
+    def __init__(self) -> None:
+        self.bytes_read = 0
+        self.tokens_parsed = 0
+        self.numbers_accumulated = 0
+        self.read_ns = 0
+        self.parse_ns = 0
+        self.validate_ns = 0
+        self.accumulate_ns = 0
+        self.elapsed_ns = 0
+
+    def add_read(self, size: int, ns: int) -> None:
+        """Count ``size`` bytes read in ``ns`` nanoseconds."""
+        self.bytes_read += size
+        self.read_ns += ns
+
+    def add_parse(self, tokens: int, parse_ns: int, validate_ns: int) -> None:
+        """Count one batch of ``tokens`` parsed and validated."""
+        self.tokens_parsed += tokens
+        self.parse_ns += parse_ns
+        self.validate_ns += validate_ns
+
+    def add_accumulate(self, count: int, ns: int) -> None:
+        """Count ``count`` numbers summed in ``ns`` nanoseconds."""
+        self.numbers_accumulated += count
+        self.accumulate_ns += ns
+
+    def _items(self, stage: str) -> int:
+        unit = _STAGE_UNITS[stage]
+        if unit == "bytes":
+            return self.bytes_read
+        if unit == "tokens":
+            return self.tokens_parsed
+        return self.numbers_accumulated
+
+    def throughput(self, stage: str) -> Optional[float]:
+        """Return the items per second of ``stage``, or ``None`` if untimed."""
+        ns = getattr(self, f"{stage}_ns")
+        return self._items(stage) * 1e9 / ns if ns else None
+
+    def result(self) -> Dict[str, object]:
+        """Return the counters, the stage timers and the stage throughputs."""
+        stages = {
+            stage: {
+                "ns": getattr(self, f"{stage}_ns"),
+                f"{unit}_per_second": self.throughput(stage),
+            }
+            for stage, unit in _STAGE_UNITS.items()
+        }
+        return {
+            "elapsed_ns": self.elapsed_ns,
+            "bytes_read": self.bytes_read,
+            "tokens_parsed": self.tokens_parsed,
+            "numbers_accumulated": self.numbers_accumulated,
+            "stages": stages,
+        }
+
+    def to_json(self) -> str:
+        """Return :meth:`result` as a line of JSON."""
+        return json.dumps(self.result()) + "\n"
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Return the statistics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                sample = "NaN" if value is None else repr(value)
+                lines.append(f"{prefix}_{name}{labels} {sample}")
+
+        metric(
+            "elapsed_seconds",
+            "gauge",
+            "Wall-clock time of the instrumented run.",
+            [("", self.elapsed_ns / 1e9)],
+        )
+        for name, help_text in (
+            ("bytes_read", "Bytes read from the input."),
+            ("tokens_parsed", "Tokens converted to numbers."),
+            ("numbers_accumulated", "Numbers consumed by the summation method."),
+        ):
+            metric(f"{name}_total", "counter", help_text, [("", getattr(self, name))])
+        metric(
+            "stage_seconds_total",
+            "counter",
+            "Time spent in each summation stage.",
+            [
+                (f'{{stage="{stage}"}}', getattr(self, f"{stage}_ns") / 1e9)
+                for stage in _STAGE_UNITS
+            ],
+        )
+        metric(
+            "stage_throughput_per_second",
+            "gauge",
+            "Items processed per second of stage time.",
+            [
+                (
+                    f'{{stage="{stage}",unit="{unit}"}}',
+                    self.throughput(stage),
+                )
+                for stage, unit in _STAGE_UNITS.items()
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+    def format(self, output_format: str) -> str:
+        """Return the statistics as ``json`` or ``prometheus`` text."""
+        if output_format == "json":
+            return self.to_json()
+        if output_format == "prometheus":
+            return self.to_prometheus()
+        choices = ", ".join(STAT_FORMATS)
+        raise ValueError(
+            f"{output_format!r} is not a statistics format; choose from {choices}."
+        )
+
+
+def _instrumented_modules() -> List[ModuleType]:
+    # ``python -m demos.summing_methods`` and ``python demos/summing_methods.py``
+    # run a second copy of the module as ``__main__``; the CLI executes that
+    # copy, while modules such as demos.pipeline call the imported one.
+    modules = [demos.summing_methods]
+    running = sys.modules.get("__main__")
+    running_file = getattr(running, "__file__", None)
+    if (
+        running is not None
+        and running is not demos.summing_methods
+        and running_file is not None
+        and os.path.realpath(running_file)
+        == os.path.realpath(demos.summing_methods.__file__)
+    ):
+        modules.append(running)
+    return modules
+
+
+@contextmanager
+def collect_stats(
+    stats: Optional[SummationStats] = None,
+) -> Iterator[SummationStats]:
+    """Record summation statistics for the duration of the ``with`` block.
+
+    Yields ``stats``, or a new :class:`SummationStats`, and adds the block's
+    wall-clock time to it on exit. The collector is process-wide: summing
+    in other threads meanwhile is counted too. Nested blocks record into the
+    innermost collector and restore the outer one afterwards.
+    """
+    stats = SummationStats() if stats is None else stats
+    modules = _instrumented_modules()
+    previous = [module._stats for module in modules]
+    for module in modules:
+        module._stats = stats
+    started = perf_counter_ns()
+    try:
+        yield stats
+    finally:
+        stats.elapsed_ns += perf_counter_ns() - started
+        for module, collector in zip(modules, previous):
+            module._stats = collector
@@ -0,0 +1,596 @@
+"""Single-pass, mergeable accumulators for sign and summary statistics."""
+
+from __future__ import annotations
+
+import math
+from functools import partial
+from itertools import chain, islice, repeat
+from operator import eq, gt, lt, mul, sub
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from demos.summing_methods import (
+    Number,
+    float_expansion,
+    round_exact_sum,
+    split_exact,
+)
+
+_SELECT_SORT_SIZE = 32
+QUANTILE_COMPRESSION = 100
+SUMMARY_BATCH_SIZE = 1 << 12
+_is_positive = partial(lt, 0)
+_is_negative = partial(gt, 0)
+_is_zero = partial(eq, 0)
+
+
+def _check_number(number: object) -> None:
+    if isinstance(number, bool) or not isinstance(number, (int, float)):
+        raise TypeError("numbers must contain int or float values")
+    if isinstance(number, float) and not math.isfinite(number):
+        raise ValueError("numbers must contain only finite float values")
+
+
+def _median_of_medians(values: Sequence[Number]) -> Number:
+    medians = [
+        sorted(values[index:index + 5])[(min(5, len(values) - index) - 1) // 2]
+        for index in range(0, len(values), 5)
+    ]
+    if len(medians) <= _SELECT_SORT_SIZE:
+        return sorted(medians)[(len(medians) - 1) // 2]
+    return select_kth(medians, (len(medians) - 1) // 2)
+
+
+def select_kth(values: Sequence[Number], k: int) -> Number:
+    """Return the ``k``-th smallest value (zero-based) in expected O(n) time.
+
+    This is introselect: quickselect with a median-of-three pivot that falls
+    back to median-of-medians pivots when partitions stop shrinking, so
+    adversarial orderings stay linear. ``values`` is not modified.
+    """
+    if not 0 <= k < len(values):
+        raise IndexError("k is out of range for the given values")
+    budget = 2 * max(1, len(values)).bit_length()
+    while len(values) > _SELECT_SORT_SIZE:
+        if budget:
+            budget -= 1
+            first, middle, last = values[0], values[len(values) // 2], values[-1]
+            pivot = sorted((first, middle, last))[1]
+        else:
+            pivot = _median_of_medians(values)
+        lower = [value for value in values if value < pivot]
+        if k < len(lower):
+            values = lower
+            continue
+        upper = [value for value in values if value > pivot]
+        equal_count = len(values) - len(lower) - len(upper)
+        if k < len(lower) + equal_count:
+            return pivot
+        k -= len(lower) + equal_count
+        values = upper
+    return sorted(values)[k]
+
+
+class QuantileSketch:
+    """Mergeable t-digest style sketch for approximate streaming quantiles.
+
+    Values are buffered and periodically folded into weighted centroids whose
+    size is bounded by the arcsine scale function, so centroids near the
+    tails stay small and extreme quantiles remain accurate. Memory is
+    O(``compression``) regardless of the number of values.
+    """
+
+    def __init__(self, compression: int = QUANTILE_COMPRESSION) -> None:
+        self.compression = compression
+        self.count = 0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self._buffer: List[float] = []
+
+    def _scale(self, quantile: float) -> float:
+        return self.compression * math.asin(2 * quantile - 1) / (2 * math.pi)
+
+    def _compress(self, extra: Iterable[tuple[float, float]] = ()) -> None:
+        items = sorted(
+            chain(
+                zip(self.means, self.weights),
+                ((value, 1.0) for value in self._buffer),
+                extra,
+            )
+        )
+        if not items or (not self._buffer and len(items) == len(self.means)):
+            return
+        self._buffer = []
+        total = sum(weight for _, weight in items)
+        means: List[float] = []
+        weights: List[float] = []
+        mean, weight = items[0]
+        seen = 0.0
+        scale_left = self._scale(0.0)
+        for next_mean, next_weight in items[1:]:
+            upper = min(1.0, (seen + weight + next_weight) / total)
+            if self._scale(upper) - scale_left <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                seen += weight
+                scale_left = self._scale(min(1.0, seen / total))
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def update(self, number: Number) -> None:
+        """Add one finite value to the sketch."""
+        value = float(number)
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self._buffer.append(value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def update_many(self, numbers: Sequence[Number]) -> None:
+        """Add a batch of finite values, compressing as :meth:`update` would."""
+        values = list(map(float, numbers))
+        if not values:
+            return
+        self.count += len(values)
+        low, high = min(values), max(values)
+        if self.minimum is None or low < self.minimum:
+            self.minimum = low
+        if self.maximum is None or high > self.maximum:
+            self.maximum = high
+        capacity = 5 * self.compression
+        start = 0
+        while start < len(values):
+            stop = start + capacity - len(self._buffer)
+            self._buffer.extend(values[start:stop])
+            start = stop
+            if len(self._buffer) >= capacity:
+                self._compress()
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """Fold ``other`` into this sketch and return ``self``."""
+        if not other.count:
+            return self
+        other._compress()
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+        self.count += other.count
+        self._compress(zip(other.means, other.weights))
+        return self
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return a JSON-compatible snapshot of the compressed sketch."""
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "means": list(self.means),
+            "weights": list(self.weights),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> QuantileSketch:
+        """Rebuild a sketch from :meth:`to_dict` output."""
+        sketch = cls(int(data["compression"]))
+        sketch.count = int(data["count"])
+        sketch.minimum = data["minimum"]
+        sketch.maximum = data["maximum"]
+        sketch.means = [float(mean) for mean in data["means"]]
+        sketch.weights = [float(weight) for weight in data["weights"]]
+        return sketch
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Estimate the value at ``quantile`` in ``[0, 1]``, or ``None``."""
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self._compress()
+        if not self.count:
+            return None
+        target = quantile * self.count
+        previous_position, previous_value = 0.0, self.minimum
+        seen = 0.0
+        for mean, weight in zip(self.means, self.weights):
+            position = seen + weight / 2
+            if target < position:
+                span = position - previous_position
+                fraction = (target - previous_position) / span if span else 0.0
+                return previous_value + fraction * (mean - previous_value)
+            previous_position, previous_value = position, mean
+            seen += weight
+        span = self.count - previous_position
+        fraction = (target - previous_position) / span if span else 1.0
+        return previous_value + fraction * (self.maximum - previous_value)
+
+
+class RunningSum:
+    """Exact running total of ``int`` and finite ``float`` addends.
+
+    Integers accumulate in an exact ``int`` and floats in an error-free
+    :func:`float_expansion`, so merging totals in any grouping gives the same
+    value. :meth:`value` is exact for integer input and the correctly
+    rounded float of the exact total otherwise; as with ``sum``, it is a
+    ``float`` as soon as one float has been added. Float totals beyond the
+    float range become infinite, as they do with ``sum``, instead of raising.
+    """
+
+    __slots__ = ("exact", "partials", "has_float")
+
+    def __init__(self) -> None:
+        self.exact = 0
+        self.partials: List[float] = []
+        self.has_float = False
+
+    def add(self, number: Number) -> None:
+        """Add one number to the total."""
+        self.add_many((number,))
+
+    def add_many(self, numbers: Sequence[Number]) -> None:
+        """Add a batch of numbers to the total."""
+        try:
+            integer, floats = split_exact(numbers)
+        except OverflowError:
+            integer = sum(number for number in numbers if not isinstance(number, float))
+            floats = [sum(number for number in numbers if isinstance(number, float))]
+        self.exact += integer
+        if floats:
+            self._add_floats(floats)
+
+    def merge(self, other: RunningSum) -> None:
+        """Fold another running total into this one."""
+        self.exact += other.exact
+        if other.has_float:
+            self._add_floats(other.partials)
+
+    def _add_floats(self, floats: List[float]) -> None:
+        self.has_float = True
+        terms = [*self.partials, *floats]
+        try:
+            self.partials = float_expansion(terms)
+        except (OverflowError, ValueError):
+            # The exact total has left the float range, or infinities of both
+            # signs met: keep what ``sum`` gives, as an infinity or ``nan``.
+            self.partials = [sum(terms)]
+
+    def value(self) -> Number:
+        """Return the total as an ``int`` or, once floats were seen, a ``float``."""
+        if not self.has_float:
+            return self.exact
+        return round_exact_sum(self.exact, self.partials)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return a JSON-compatible snapshot of the exact total."""
+        return {
+            "exact": self.exact,
+            "partials": list(self.partials),
+            "has_float": self.has_float,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> RunningSum:
+        """Rebuild a running total from :meth:`to_dict` output."""
+        running = cls()
+        running.exact = int(data["exact"])
+        running.partials = [float(partial) for partial in data["partials"]]
+        running.has_float = bool(data["has_float"])
+        return running
+
+
+class NumberSummary:
+    """Incremental accumulator behind :func:`analyze_numbers`.
+
+    ``update`` folds in one value and ``merge`` combines two summaries, so
+    batches can be summarized independently and reduced later, in any
+    grouping: counts, exact sums, minimum and maximum merge exactly, while the
+    Welford moments and quantile sketch agree up to float rounding.
+    :meth:`to_dict` and :meth:`from_dict` move summaries between processes or
+    machines as JSON-compatible data. Counts, sums,
+    minimum, maximum and Welford's running mean and variance use constant
+    memory. The per-sign value lists are kept only when ``keep_values`` is
+    true. The median is selected exactly from those lists, or estimated from
+    a :class:`QuantileSketch` when ``approximate_median`` is true; with
+    neither, ``result`` reports ``None`` for the lists and the median.
+    """
+
+    def __init__(
+        self, keep_values: bool = True, approximate_median: bool = False
+    ) -> None:
+        self.keep_values = keep_values
+        self.sketch: Optional[QuantileSketch] = (
+            QuantileSketch() if approximate_median else None
+        )
+        self.count = 0
+        self.positive_count = 0
+        self.negative_count = 0
+        self.zero_count = 0
+        self.total = RunningSum()
+        self.positive_sum = RunningSum()
+        self.negative_sum = RunningSum()
+        self.minimum: Optional[Number] = None
+        self.maximum: Optional[Number] = None
+        self.welford_mean = 0.0
+        self.welford_m2 = 0.0
+        self.moments_valid = True
+        self.positive: Optional[List[Number]] = [] if keep_values else None
+        self.negative: Optional[List[Number]] = [] if keep_values else None
+        self.zeros: Optional[List[Number]] = [] if keep_values else None
+
+    def update(self, number: Number) -> None:
+        """Validate and fold one finite ``int`` or ``float`` into the summary."""
+        _check_number(number)
+        self.count += 1
+        self.total.add(number)
+        if number > 0:
+            self.positive_count += 1
+            self.positive_sum.add(number)
+            if self.positive is not None:
+                self.positive.append(number)
+        elif number < 0:
+            self.negative_count += 1
+            self.negative_sum.add(number)
+            if self.negative is not None:
+                self.negative.append(number)
+        else:
+            self.zero_count += 1
+            if self.zeros is not None:
+                self.zeros.append(number)
+        if self.minimum is None or number < self.minimum:
+            self.minimum = number
+        if self.maximum is None or number > self.maximum:
+            self.maximum = number
+        if self.sketch is not None:
+            self.sketch.update(number)
+        if self.moments_valid:
+            try:
+                delta = number - self.welford_mean
+                self.welford_mean += delta / self.count
+                self.welford_m2 += delta * (number - self.welford_mean)
+            except OverflowError:
+                self.moments_valid = False
+
+    def update_many(self, numbers: Iterable[Number]) -> None:
+        """Fold every value of ``numbers`` into the summary in order.
+
+        Values are taken ``SUMMARY_BATCH_SIZE`` at a time and each batch is
+        folded with C-level passes (``filter``, ``sum``, ``math.fsum``,
+        ``min`` and ``max``) instead of one :meth:`update` call per value.
+        """
+        values = iter(numbers)
+        for batch in iter(lambda: list(islice(values, SUMMARY_BATCH_SIZE)), []):
+            self._update_batch(batch)
+
+    def _update_batch(self, batch: List[Number]) -> None:
+        kinds = set(map(type, batch))
+        if kinds == {float}:
+            valid = all(map(math.isfinite, batch))
+        elif kinds <= {int, float}:
+            floats = [number for number in batch if type(number) is float]
+            valid = all(map(math.isfinite, floats))
+        else:
+            valid = False
+        if not valid:
+            # Let ``update`` raise for the first invalid value, after folding
+            # in the values before it, exactly as one call per value would.
+            for number in batch:
+                self.update(number)
+            return
+        positives = list(filter(_is_positive, batch))
+        negatives = list(filter(_is_negative, batch))
+        zero_count = len(batch) - len(positives) - len(negatives)
+        batch_total = RunningSum()
+        for numbers, running, kept in (
+            (positives, self.positive_sum, self.positive),
+            (negatives, self.negative_sum, self.negative),
+        ):
+            if numbers:
+                part = RunningSum()
+                part.add_many(numbers)
+                running.merge(part)
+                batch_total.merge(part)
+                if kept is not None:
+                    kept.extend(numbers)
+        if float in kinds:
+            batch_total.has_float = True
+        if zero_count and self.zeros is not None:
+            self.zeros.extend(filter(_is_zero, batch))
+        self.positive_count += len(positives)
+        self.negative_count += len(negatives)
+        self.zero_count += zero_count
+        self.total.merge(batch_total)
+        low, high = min(batch), max(batch)
+        if self.minimum is None or low < self.minimum:
+            self.minimum = low
+        if self.maximum is None or high > self.maximum:
+            self.maximum = high
+        if self.sketch is not None:
+            self.sketch.update_many(batch)
+        if self.moments_valid:
+            try:
+                mean = batch_total.value() / len(batch)
+                deviations = list(map(sub, batch, repeat(mean)))
+                m2 = math.fsum(map(mul, deviations, deviations))
+            except OverflowError:
+                self.moments_valid = False
+            else:
+                if math.isfinite(m2):
+                    self._merge_moments(len(batch), mean, m2)
+                else:
+                    self.moments_valid = False
+        self.count += len(batch)
+
+    def _merge_moments(self, count: int, mean: float, m2: float) -> None:
+        # Chan et al.'s parallel update of Welford's mean and squared deviations.
+        if self.count:
+            total = self.count + count
+            delta = mean - self.welford_mean
+            self.welford_mean += delta * count / total
+            self.welford_m2 += m2 + delta * delta * self.count * count / total
+        else:
+            self.welford_mean = mean
+            self.welford_m2 = m2
+
+    def merge(self, other: NumberSummary) -> NumberSummary:
+        """Fold ``other`` into this summary and return ``self``.
+
+        Value lists survive only when both sides kept them; ``other``'s values
+        are appended after this summary's, as if its input followed.
+        """
+        if other.count:
+            self._merge_moments(other.count, other.welford_mean, other.welford_m2)
+            self.moments_valid = self.moments_valid and other.moments_valid
+            if self.minimum is None or other.minimum < self.minimum:
+                self.minimum = other.minimum
+            if self.maximum is None or other.maximum > self.maximum:
+                self.maximum = other.maximum
+        self.count += other.count
+        self.positive_count += other.positive_count
+        self.negative_count += other.negative_count
+        self.zero_count += other.zero_count
+        self.total.merge(other.total)
+        self.positive_sum.merge(other.positive_sum)
+        self.negative_sum.merge(other.negative_sum)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        else:
+            self.sketch = None
+        if self.keep_values and other.keep_values:
+            self.positive.extend(other.positive)
+            self.negative.extend(other.negative)
+            self.zeros.extend(other.zeros)
+        else:
+            self.keep_values = False
+            self.positive = self.negative = self.zeros = None
+        return self
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return a JSON-compatible snapshot that :meth:`from_dict` restores."""
+        return {
+            "keep_values": self.keep_values,
+            "count": self.count,
+            "positive_count": self.positive_count,
+            "negative_count": self.negative_count,
+            "zero_count": self.zero_count,
+            "total": self.total.to_dict(),
+            "positive_sum": self.positive_sum.to_dict(),
+            "negative_sum": self.negative_sum.to_dict(),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "welford_mean": self.welford_mean,
+            "welford_m2": self.welford_m2,
+            "moments_valid": self.moments_valid,
+            "sketch": None if self.sketch is None else self.sketch.to_dict(),
+            "positive": self.positive,
+            "negative": self.negative,
+            "zeros": self.zeros,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> NumberSummary:
+        """Rebuild a summary from :meth:`to_dict` output."""
+        summary = cls(bool(data["keep_values"]))
+        summary.count = int(data["count"])
+        summary.positive_count = int(data["positive_count"])
+        summary.negative_count = int(data["negative_count"])
+        summary.zero_count = int(data["zero_count"])
+        summary.total = RunningSum.from_dict(data["total"])
+        summary.positive_sum = RunningSum.from_dict(data["positive_sum"])
+        summary.negative_sum = RunningSum.from_dict(data["negative_sum"])
+        summary.minimum = data["minimum"]
+        summary.maximum = data["maximum"]
+        summary.welford_mean = float(data["welford_mean"])
+        summary.welford_m2 = float(data["welford_m2"])
+        summary.moments_valid = bool(data["moments_valid"])
+        if data["sketch"] is not None:
+            summary.sketch = QuantileSketch.from_dict(data["sketch"])
+        if summary.keep_values:
+            summary.positive = list(data["positive"])
+            summary.negative = list(data["negative"])
+            summary.zeros = list(data["zeros"])
+        return summary
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Population variance from Welford's moments, or ``None``."""
+        if not self.count or not self.moments_valid:
+            return None
+        return self.welford_m2 / self.count
+
+    def _kth_value(self, k: int) -> Number:
+        # Every negative sorts before every zero and every zero before every
+        # positive, so only the list that holds rank ``k`` needs selecting.
+        if k < self.negative_count:
+            return select_kth(self.negative, k)
+        k -= self.negative_count
+        if k < self.zero_count:
+            return self.zeros[k]
+        return select_kth(self.positive, k - self.zero_count)
+
+    def median(self) -> Optional[Number]:
+        """Return the median: exact from kept values, else estimated, else ``None``.
+
+        The exact median uses :func:`select_kth` on one sign list instead of
+        sorting a copy of every value.
+        """
+        if not self.count:
+            return None
+        if self.sketch is not None:
+            return self.sketch.quantile(0.5)
+        if not self.keep_values:
+            return None
+        middle_index = self.count // 2
+        if self.count % 2:
+            return self._kth_value(middle_index)
+        return (self._kth_value(middle_index - 1) + self._kth_value(middle_index)) / 2
+
+    def result(self) -> Dict[str, object]:
+        """Return the :func:`analyze_numbers` dictionary for the values so far.
+
+        ``mean`` is ``total / count`` so integer totals divide exactly once;
+        the Welford mean is kept for merging and :attr:`variance`. The value
+        lists are the summary's own lists rather than copies.
+        """
+        total = self.total.value()
+        return {
+            "total": total,
+            "positive": self.positive,
+            "negative": self.negative,
+            "zeros": self.zeros,
+            "positive_sum": self.positive_sum.value(),
+            "negative_sum": self.negative_sum.value(),
+            "positive_count": self.positive_count,
+            "negative_count": self.negative_count,
+            "zero_count": self.zero_count,
+            "mean": total / self.count if self.count else None,
+            "median": self.median(),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+
+def merge_summaries(summaries: Iterable[NumberSummary]) -> NumberSummary:
+    """Reduce shard summaries pairwise, like a balanced merge tree.
+
+    Neighbouring summaries are merged level by level, so shard order is kept
+    for the value lists and every summary takes part in O(log n) merges.
+    Returns an empty summary when there are none.
+    """
+    level = list(summaries)
+    if not level:
+        return NumberSummary(keep_values=False)
+    while len(level) > 1:
+        merged = [left.merge(right) for left, right in zip(level[::2], level[1::2])]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
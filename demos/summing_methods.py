@@ -2,14 +2,53 @@
 
 from __future__ import annotations
 
-import argparse
 import math
 import operator
+import os
+import stat
 import sys
-from functools import reduce
-from typing import Iterable, List, Optional, Sequence, Union
+from collections.abc import Callable, Iterable
+from itertools import chain, islice
+from time import perf_counter_ns
 
-Number = Union[int, float]
+# The command-line parser and typing helpers are only needed by ``main`` and
+# by type checkers, so library callers that just want a summation method do
+# not pay for importing them.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    import mmap
+    from fractions import Fraction
+    from typing import (
+        BinaryIO,
+        Dict,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        TextIO,
+        Tuple,
+        Union,
+    )
+
+    from demos.accumulate import BatchAccumulator
+    from demos.stats import SummationStats
+
+Number = int | float
+SumMethod = Callable[[Iterable[Number]], Number]
+STREAM_CHUNK_SIZE = 1 << 16
+PAIRWISE_BLOCK_SIZE = 128
+KAHAN_BLOCK_SIZE = 1 << 14
+BIGINT_BLOCK_SIZE = 64
+NUMPY_BLOCK_SIZE = 1 << 16
+EXACT_BLOCK_SIZE = 1 << 12
+_INT64_MAX = 2**63 - 1
+_FLOAT_MANTISSA_MASK = 2**53 - 1
+_ASCII_WHITESPACE = (b" ", b"\n", b"\t", b"\r", b"\x0b", b"\x0c")
+
+# Installed by ``demos.stats.collect_stats``. The hot path tests it once per
+# batch, so summing without statistics costs a single global lookup.
+_stats: Optional[SummationStats] = None
 
 
 def parse_numbers(
@@ -66,36 +105,565 @@ def sum_builtin(nums: Iterable[Number]) -> Number:
 
 def sum_reduce(nums: Iterable[Number]) -> Number:
     """reduce + operator.add; educational."""
+    from functools import reduce
+
     return reduce(operator.add, nums, 0)
 
 def sum_fsum(nums: Iterable[Number]) -> float:
     """math.fsum; better numeric stability for floats."""
     return math.fsum(nums)
 
+def sum_kahan(nums: Iterable[Number]) -> float:
+    """Kahan compensated summation; one correction term per addition.
+
+    Once the total overflows, the correction term would turn it into
+    ``nan``, so the block that overflowed and the rest of the input are
+    summed like the built-in ``sum`` instead, keeping the signed infinity.
+    """
+    total = 0.0
+    compensation = 0.0
+    values = iter(nums)
+    for block in iter(lambda: list(islice(values, KAHAN_BLOCK_SIZE)), []):
+        start = total
+        for number in block:
+            adjusted = number - compensation
+            running = total + adjusted
+            compensation = (running - total) - adjusted
+            total = running
+        if not math.isfinite(total):
+            return sum(values, sum(block, start))
+    return total
+
+def sum_neumaier(nums: Iterable[Number]) -> float:
+    """Neumaier's Kahan variant; also exact when an addend exceeds the total."""
+    total = 0.0
+    compensation = 0.0
+    for number in nums:
+        running = total + number
+        if abs(total) >= abs(number):
+            compensation += (total - running) + number
+        else:
+            compensation += (number - running) + total
+        total = running
+    # An overflowed total is infinite, and its correction term is ``nan``.
+    return total + compensation if math.isfinite(total) else total
+
+def sum_klein(nums: Iterable[Number]) -> float:
+    """Klein's second-order compensated sum; compensates the compensation."""
+    total = 0.0
+    first_order = 0.0
+    second_order = 0.0
+    for number in nums:
+        running = total + number
+        if abs(total) >= abs(number):
+            error = (total - running) + number
+        else:
+            error = (number - running) + total
+        total = running
+        running = first_order + error
+        if abs(first_order) >= abs(error):
+            carry = (first_order - running) + error
+        else:
+            carry = (error - running) + first_order
+        first_order = running
+        second_order += carry
+    if not math.isfinite(total):
+        return total
+    return total + (first_order + second_order)
+
+def sum_pairwise(
+    nums: Iterable[Number], block_size: int = PAIRWISE_BLOCK_SIZE
+) -> float:
+    """Block-based pairwise summation with O(log n) working memory.
+
+    Each block of ``block_size`` values is summed directly and block totals
+    are merged like a binary counter, so rounding error grows with the log of
+    the number of blocks rather than the input length.
+    """
+    iterator = iter(nums)
+    stack: List[Tuple[int, float]] = []
+    while True:
+        block = list(islice(iterator, block_size))
+        if not block:
+            break
+        level, total = 0, sum(block, 0.0)
+        while stack and stack[-1][0] == level:
+            total += stack.pop()[1]
+            level += 1
+        stack.append((level, total))
+    total = 0.0
+    while stack:
+        total += stack.pop()[1]
+    return total
+
+def sum_bigint(nums: Iterable[Number], block_size: int = BIGINT_BLOCK_SIZE) -> Number:
+    """Exact integer summation that keeps big-int operands balanced.
+
+    Adding a small ``int`` to a huge running total copies the whole total,
+    so a linear ``sum`` over a few huge values among many small ones costs
+    time proportional to the count times the largest size. Here blocks are
+    summed with the built-in ``sum`` and block totals merge like a binary
+    counter, so a huge value is copied only O(log n) times. Float input
+    gets the rounding of the built-in ``sum`` applied per block.
+    """
+    iterator = iter(nums)
+    stack: List[Tuple[int, Number]] = []
+    while True:
+        block = list(islice(iterator, block_size))
+        if not block:
+            break
+        level, total = 0, sum(block)
+        while stack and stack[-1][0] == level:
+            total += stack.pop()[1]
+            level += 1
+        stack.append((level, total))
+    total = 0
+    while stack:
+        total = stack.pop()[1] + total
+    return total
+
+def _import_numpy():
+    """Return the optional ``numpy`` module, or ``None`` when unavailable."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _sum_numpy_block(numpy, block) -> Number:
+    array = numpy.asarray(block)
+    if array.dtype.kind == "f":
+        # Overflow to inf is the result, as it is for the other float methods.
+        with numpy.errstate(over="ignore"):
+            return float(numpy.add.reduce(array, dtype=numpy.float64))
+    if array.dtype.kind in "iu" and array.size:
+        bound = max(-int(array.min()), int(array.max()))
+        if bound * array.size <= _INT64_MAX:
+            return int(numpy.add.reduce(array, dtype=numpy.int64))
+    return sum_builtin(block.tolist() if isinstance(block, numpy.ndarray) else block)
+
+def sum_numpy(nums: Iterable[Number]) -> Number:
+    """Vectorized sum with NumPy, falling back to exact Python arithmetic.
+
+    NumPy arrays and typed ``memoryview`` buffers are reduced directly
+    without copying; other iterables are converted in
+    blocks of ``NUMPY_BLOCK_SIZE``. ``float64`` blocks use NumPy's pairwise
+    ``add.reduce`` and ``int64`` blocks are used only when no partial sum can
+    overflow. Everything else, including big ints and the case where NumPy is
+    not installed, goes through :func:`sum_builtin`, so integer results stay
+    exact. Converting Python lists costs more than the vectorized reduction
+    saves, so the speedup applies to arrays and buffers rather than lists.
+    """
+    numpy = _import_numpy()
+    if numpy is None:
+        return sum_builtin(nums)
+    if isinstance(nums, memoryview):
+        nums = numpy.asarray(nums)
+    if isinstance(nums, numpy.ndarray):
+        return _sum_numpy_block(numpy, nums.ravel())
+    iterator = iter(nums)
+    totals: List[Number] = []
+    while True:
+        block = list(islice(iterator, NUMPY_BLOCK_SIZE))
+        if not block:
+            break
+        totals.append(_sum_numpy_block(numpy, block))
+    return sum_builtin(totals)
+
+def split_exact(nums: Iterable[Number]) -> Tuple[int, List[float]]:
+    """Return the exact ``int`` total of ``nums`` and floats with the same exact sum.
+
+    The input is consumed ``EXACT_BLOCK_SIZE`` values at a time; integers
+    fold into one ``int`` and floats into a short :func:`float_expansion`,
+    so memory stays bounded however long the input is. The float list is
+    empty only when no float was seen.
+    """
+    integer = 0
+    floats: List[float] = []
+    values = iter(nums)
+    for block in iter(lambda: list(islice(values, EXACT_BLOCK_SIZE)), []):
+        try:
+            total = sum(block)
+        except OverflowError:  # a float met an integer beyond float range
+            total = math.inf
+        if isinstance(total, int):
+            integer += total
+            continue
+        if all(issubclass(kind, float) for kind in set(map(type, block))):
+            block_floats = block
+        else:
+            block_floats = [number for number in block if isinstance(number, float)]
+            integer += sum(
+                number for number in block if not isinstance(number, float)
+            )
+        terms = [*floats, *block_floats]
+        # A zero total keeps one signed zero to record that floats were seen.
+        floats = float_expansion(terms) or [math.fsum(terms)]
+    return integer, floats
+
+
+def float_expansion(floats: Iterable[float]) -> List[float]:
+    """Return a few floats of decreasing magnitude whose exact sum is the input's.
+
+    Each pass takes the correctly rounded ``math.fsum`` of what is still
+    missing, so the expansion is error-free while every pass runs at C
+    speed; typical inputs need two or three passes. Non-finite input gives
+    the ``math.fsum`` result as the only term.
+    """
+    terms = list(floats)
+    expansion: List[float] = []
+    while True:
+        remainder = math.fsum(terms)
+        if not remainder:
+            return expansion
+        if not math.isfinite(remainder):
+            return [remainder]
+        expansion.append(remainder)
+        terms.append(-remainder)
+
+
+def round_exact_sum(integer: int, floats: Iterable[float]) -> float:
+    """Return the correctly rounded ``float`` of ``integer + sum(floats)``.
+
+    Integers up to ``2**1024`` are split into 53-bit pieces that convert to
+    float exactly, so one ``math.fsum`` call rounds the whole total; larger
+    integers fall back to exact ``Fraction`` arithmetic.
+    """
+    magnitude = abs(integer)
+    if magnitude.bit_length() <= 1024:
+        pieces = []
+        shift = 0
+        while magnitude:
+            piece = float((magnitude & _FLOAT_MANTISSA_MASK) << shift)
+            pieces.append(piece if integer > 0 else -piece)
+            magnitude >>= 53
+            shift += 53
+        return math.fsum(chain(floats, pieces))
+    from fractions import Fraction
+
+    expansion = float_expansion(floats)
+    if expansion and not math.isfinite(expansion[0]):
+        return expansion[0]
+    return float(integer + sum(map(Fraction, expansion)))
+
+
+def sum_exact(nums: Iterable[Number]) -> Number:
+    """Exact mixed int/float summation; exact ``int`` or correctly rounded.
+
+    Integers accumulate in one exact ``int`` and floats are rounded only
+    once, together with that integer, so big integers above ``2**53`` keep
+    their precision when floats are mixed in.
+    """
+    integer, floats = split_exact(nums)
+    if not floats:
+        return integer
+    return round_exact_sum(integer, floats)
+
+
+def sum_exact_fraction(nums: Iterable[Number]) -> Union[int, Fraction]:
+    """Return the exact total of ``nums`` as an ``int`` or ``Fraction``."""
+    from fractions import Fraction
+
+    integer, floats = split_exact(nums)
+    if not floats:
+        return integer
+    expansion = float_expansion(floats)
+    if expansion and not math.isfinite(expansion[0]):
+        raise ValueError("the exact sum of non-finite floats is undefined.")
+    return integer + sum(map(Fraction, expansion), Fraction(0))
+
+
+SUM_METHODS: Dict[str, SumMethod] = {
+    "builtin": sum_builtin,
+    "reduce": sum_reduce,
+    "fsum": sum_fsum,
+    "kahan": sum_kahan,
+    "neumaier": sum_neumaier,
+    "pairwise": sum_pairwise,
+    "klein": sum_klein,
+    "numpy": sum_numpy,
+    "exact": sum_exact,
+    "bigint": sum_bigint,
+}
+
+
+def register_sum_method(
+    name: str, method: SumMethod, replace: bool = False
+) -> None:
+    """Make ``method`` selectable by ``name`` in ``--method`` and friends.
+
+    Methods must be module-level callables so they can be sent to worker
+    processes. Registering an existing name requires ``replace=True``.
+    """
+    if name in SUM_METHODS and not replace:
+        raise ValueError(f"{name!r} is already a registered summation method.")
+    SUM_METHODS[name] = method
+
+
+def get_sum_method(name: str) -> SumMethod:
+    """Return the registered summation method called ``name``."""
+    try:
+        return SUM_METHODS[name]
+    except KeyError:
+        choices = ", ".join(sorted(SUM_METHODS))
+        raise ValueError(
+            f"{name!r} is not a summation method; choose from {choices}."
+        ) from None
+
 
 def parse_cli_numbers(
-    raw_numbers: Sequence[str], allow_float: bool = False
+    raw_numbers: Iterable[Union[str, bytes]], allow_float: bool = False
+) -> List[Number]:
+    """Parse command-line numbers using the lesson's numeric contract.
+
+    Tokens may also be ``bytes`` split straight from a stream or mapped file;
+    they are decoded only when they do not parse as ASCII, so non-ASCII digits
+    and error messages behave exactly as they do for ``str`` tokens. The whole
+    batch is converted with one ``map`` and, in float mode, checked with one
+    ``all(map(math.isfinite, ...))`` pass; tokens are revisited one at a time
+    only when that fails, to report the first bad one, so iterables that are
+    not lists are read into one first.
+    """
+    if not isinstance(raw_numbers, list):
+        raw_numbers = list(raw_numbers)
+    if _stats is not None:
+        return _parse_cli_numbers_timed(raw_numbers, allow_float, _stats)
+    try:
+        numbers: List[Number] = list(map(float if allow_float else int, raw_numbers))
+    except ValueError:
+        pass
+    else:
+        if not allow_float or all(map(math.isfinite, numbers)):
+            return numbers
+    return _parse_cli_numbers_one_by_one(raw_numbers, allow_float)
+
+
+def _parse_cli_numbers_timed(
+    raw_numbers: Sequence[Union[str, bytes]],
+    allow_float: bool,
+    stats: SummationStats,
+) -> List[Number]:
+    started = perf_counter_ns()
+    try:
+        numbers: Optional[List[Number]] = list(
+            map(float if allow_float else int, raw_numbers)
+        )
+    except ValueError:
+        numbers = None
+    parsed = perf_counter_ns()
+    valid = numbers is not None and (
+        not allow_float or all(map(math.isfinite, numbers))
+    )
+    stats.add_parse(len(raw_numbers), parsed - started, perf_counter_ns() - parsed)
+    if valid:
+        return numbers
+    return _parse_cli_numbers_one_by_one(raw_numbers, allow_float)
+
+
+def _parse_cli_numbers_one_by_one(
+    raw_numbers: Sequence[Union[str, bytes]], allow_float: bool
 ) -> List[Number]:
-    """Parse command-line numbers using the lesson's numeric contract."""
     numbers: List[Number] = []
     number_type = "finite number" if allow_float else "whole number"
     for raw_number in raw_numbers:
         try:
             number: Number = float(raw_number) if allow_float else int(raw_number)
+            valid = not allow_float or math.isfinite(number)
         except ValueError as exc:
-            raise ValueError(
-                f"{raw_number!r} is not a valid {number_type}."
-            ) from exc
-        if allow_float and not math.isfinite(number):
+            if not isinstance(raw_number, bytes):
+                raise ValueError(
+                    f"{raw_number!r} is not a valid {number_type}."
+                ) from exc
+            valid = False
+        if not valid:
+            if isinstance(raw_number, bytes):
+                numbers.extend(
+                    _parse_cli_numbers_one_by_one(
+                        [raw_number.decode(errors="replace")], allow_float
+                    )
+                )
+                continue
             raise ValueError(f"{raw_number!r} is not a valid finite number.")
         numbers.append(number)
     return numbers
 
 
+def split_at_token_boundary(data: bytes) -> Tuple[bytes, bytes]:
+    """Split ``data`` after its last ASCII whitespace byte.
+
+    Returns the complete tokens and the trailing partial token that must wait
+    for the next read.
+    """
+    cut = max(data.rfind(space) for space in _ASCII_WHITESPACE) + 1
+    return data[:cut], data[cut:]
+
+
+def iter_stream_batches(
+    stream: BinaryIO,
+    allow_float: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[List[Number]]:
+    """Yield parsed batches of whitespace-separated numbers from ``stream``.
+
+    The stream is read ``chunk_size`` bytes at a time and only the trailing
+    partial token is carried between reads, so memory stays bounded by the
+    chunk size however long the input is. Each batch follows the
+    :func:`parse_cli_numbers` contract and raises the same ``ValueError``.
+    """
+    yield from iter_chunk_batches(iter_stream_chunks(stream, chunk_size), allow_float)
+
+
+def iter_stream_chunks(
+    stream: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield ``chunk_size`` reads of ``stream`` until it is exhausted."""
+    if _stats is None:
+        return iter(lambda: stream.read(chunk_size), b"")
+    return _iter_timed_chunks(stream, chunk_size, _stats)
+
+
+def _iter_timed_chunks(
+    stream: BinaryIO, chunk_size: int, stats: SummationStats
+) -> Iterator[bytes]:
+    while True:
+        started = perf_counter_ns()
+        chunk = stream.read(chunk_size)
+        stats.add_read(len(chunk), perf_counter_ns() - started)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_chunk_batches(
+    chunks: Iterable[bytes], allow_float: bool = False
+) -> Iterator[List[Number]]:
+    """Yield one parsed batch per chunk of whitespace-separated bytes.
+
+    Chunks may split a token anywhere; the trailing partial token of each
+    chunk is carried over to the next one.
+    """
+    pending = b""
+    for chunk in chunks:
+        complete, pending = split_at_token_boundary(pending + chunk)
+        if complete:
+            yield parse_cli_numbers(complete.split(), allow_float)
+    if pending:
+        yield parse_cli_numbers(pending.split(), allow_float)
+
+
+def iter_buffer_batches(
+    buffer: Union[bytes, mmap.mmap],
+    allow_float: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[List[Number]]:
+    """Yield parsed batches of whitespace-separated numbers from ``buffer``.
+
+    Batch boundaries are found by searching the buffer in place, so only one
+    chunk of ASCII tokens is copied out at a time and nothing is decoded.
+    ``start`` and ``stop`` restrict parsing to a byte range that begins and
+    ends on token boundaries.
+    """
+    stats = _stats
+    for begin, end in iter_token_ranges(buffer, chunk_size, start, stop):
+        if stats is None:
+            block = buffer[begin:end]
+        else:
+            started = perf_counter_ns()
+            block = buffer[begin:end]
+            stats.add_read(end - begin, perf_counter_ns() - started)
+        yield parse_cli_numbers(block.split(), allow_float)
+
+
+def iter_token_ranges(
+    buffer: Union[bytes, mmap.mmap],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[Tuple[int, int]]:
+    """Yield the byte ranges that :func:`iter_buffer_batches` parses.
+
+    Each range ends after a whitespace byte or at ``stop``, and depends only
+    on where it starts, so parsing can resume at any range boundary.
+    """
+    size = len(buffer) if stop is None else stop
+    while start < size:
+        end = min(start + chunk_size, size)
+        while end < size:
+            cut = max(buffer.rfind(space, start, end) for space in _ASCII_WHITESPACE)
+            if cut >= start:
+                end = cut + 1
+                break
+            end = min(end + chunk_size, size)
+        yield start, end
+        start = end
+
+
+def iter_file_batches(
+    path: Union[str, os.PathLike[str]],
+    allow_float: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[List[Number]]:
+    """Yield parsed batches from a memory-mapped whitespace-separated file.
+
+    The operating system pages the file in on demand, so large numeric dumps
+    are summed without reading them into memory first. gzip, bz2, xz and
+    zstd files are recognized by their magic bytes and decompressed as a
+    stream instead, and pipes and other files that cannot be mapped are
+    read as a stream too.
+    """
+    import mmap
+
+    from demos.compressed import open_decompressed
+
+    with open(path, "rb") as file:
+        stream = open_decompressed(file, chunk_size)
+        status = os.fstat(file.fileno())
+        if stream is not file or not stat.S_ISREG(status.st_mode):
+            yield from iter_stream_batches(stream, allow_float, chunk_size)
+            return
+        if status.st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter_buffer_batches(mapped, allow_float, chunk_size)
+
+
+def sum_stream(
+    batches: Iterable[List[Number]], method: SumMethod = sum_builtin
+) -> Optional[Number]:
+    """Sum parsed batches in input order, or return ``None`` when empty.
+
+    The batches are chained into a single call to ``method`` so the result
+    matches the same method over the values held in one list.
+    """
+    batches = iter(batches) if _stats is None else _timed_batches(batches, _stats)
+    first = next((batch for batch in batches if batch), None)
+    if first is None:
+        return None
+    return method(chain(first, chain.from_iterable(batches)))
+
+
+def _timed_batches(
+    batches: Iterable[List[Number]], stats: SummationStats
+) -> Iterator[List[Number]]:
+    # The time between handing out a batch and being asked for the next one
+    # is spent by the summation method on that batch.
+    for batch in batches:
+        handed_out = perf_counter_ns()
+        yield batch
+        stats.add_accumulate(len(batch), perf_counter_ns() - handed_out)
+
+
 def build_argument_parser() -> argparse.ArgumentParser:
     """Build the optional one-shot command-line interface."""
+    import argparse
+
+    # Without abbreviations, demos.client can tell from the literal option
+    # names whether a command reads standard input.
     parser = argparse.ArgumentParser(
-        description="Sum numbers without starting the interactive lesson."
+        description="Sum numbers without starting the interactive lesson.",
+        allow_abbrev=False,
     )
     parser.add_argument(
         "--numbers",
@@ -103,15 +671,337 @@ def build_argument_parser() -> argparse.ArgumentParser:
         nargs=argparse.REMAINDER,
         help="one or more numbers to sum; defaults to exact whole numbers",
     )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="stream whitespace-separated numbers from standard input",
+    )
+    parser.add_argument(
+        "--file",
+        metavar="PATH",
+        help="sum whitespace-separated numbers from a memory-mapped file",
+    )
+    parser.add_argument(
+        "--method",
+        choices=sorted(SUM_METHODS),
+        default="builtin",
+        help="summation method to apply (default: builtin)",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="N",
+        type=int,
+        help="parse and sum --file byte ranges in N worker processes",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="read, parse and sum --stdin or --file in overlapping threads",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="periodically save the progress of --file to a sidecar file "
+        "ending in .sum-checkpoint; needs --method fsum or exact, or integer "
+        "input",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue --file from its checkpoint, if any; implies --checkpoint",
+    )
+    parser.add_argument(
+        "--window",
+        metavar="SIZE",
+        help="print the sum, mean, sign counts, minimum and maximum of each "
+        "window of --stdin or --file: SIZE values, such as 100, or seconds, "
+        "such as 30s",
+    )
+    parser.add_argument(
+        "--every",
+        metavar="STEP",
+        help="emit a --window result every STEP values or seconds, in the "
+        "window's unit (default: the window size, for tumbling windows)",
+    )
+    parser.add_argument(
+        "--build-index",
+        action="store_true",
+        help="write a prefix-sum index of --file for fast --range queries",
+    )
+    parser.add_argument(
+        "--range",
+        metavar=("FIRST", "LAST"),
+        nargs=2,
+        type=int,
+        help="sum numbers FIRST to LAST (1-based, inclusive) of an indexed "
+        "--file; add --analyze for the sign counts, sums and extremes",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse the output of an identical --numbers or --file run from an "
+        "on-disk cache ($SUM_CACHE or ~/.cache/demos-summing/results.sqlite3)",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="json",
+        choices=("json", "prometheus"),
+        metavar="FORMAT",
+        help="write bytes read, tokens parsed and the time and throughput of "
+        "each stage to standard error, as json (the default) or prometheus text",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run the summation under cProfile and tracemalloc and write the "
+        "peak memory, top allocations and slowest calls to standard error",
+    )
     parser.add_argument(
         "--float",
         dest="allow_float",
         action="store_true",
-        help="parse --numbers as finite floating-point values",
+        help="parse input numbers as finite floating-point values",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "f64", "i64", "npy", "arrow"),
+        default="text",
+        help="read --stdin or --file as whitespace-separated text (the default), "
+        "raw little-endian float64 or int64 values, a .npy array, or an Arrow "
+        "IPC stream or file",
+    )
+    parser.add_argument(
+        "--columns",
+        metavar="COL",
+        nargs="+",
+        help="read --stdin or --file as delimited rows and sum these columns, "
+        "given as 1-based positions or header names",
+    )
+    parser.add_argument(
+        "--delimiter",
+        metavar="CHAR",
+        help="column delimiter for --columns (default: tab for .tsv files, "
+        "otherwise a comma); '\\t' means a tab",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="also print the analyze_numbers breakdown of each column "
+        "or of the --range",
     )
     return parser
 
 
+def _print_analysis(analysis: Dict[str, object]) -> None:
+    print(
+        f"  Positive: {analysis['positive_count']} "
+        f"(sum: {analysis['positive_sum']})"
+    )
+    print(
+        f"  Negative: {analysis['negative_count']} "
+        f"(sum: {analysis['negative_sum']})"
+    )
+    print(f"  Zeros: {analysis['zero_count']}")
+    print(f"  Mean: {analysis['mean']}")
+    if "median" in analysis:
+        print(f"  Median (approximate): {analysis['median']}")
+    print(f"  Minimum: {analysis['minimum']}")
+    print(f"  Maximum: {analysis['maximum']}")
+
+
+def _print_column_results(accumulators: Dict[str, BatchAccumulator]) -> None:
+    for label, accumulator in accumulators.items():
+        print(f"Sum of {label}: {accumulator.total()}")
+        if accumulator.summary is not None:
+            _print_analysis(accumulator.summary.result())
+
+
+def _sum_range_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    from demos.index import RangeIndex, build_index, index_path
+
+    try:
+        if arguments.build_index:
+            if arguments.analyze:
+                parser.error("--analyze cannot be combined with --build-index.")
+            count, blocks = build_index(arguments.file, arguments.allow_float)
+            print(
+                f"Indexed {count} numbers in {blocks} blocks: "
+                f"{index_path(arguments.file)}"
+            )
+            return 0
+        first, last = arguments.range
+        with RangeIndex(arguments.file) as index:
+            if not 1 <= first <= last + 1 or last > index.count:
+                parser.error(
+                    f"--range must lie within the {index.count} indexed numbers."
+                )
+            if arguments.analyze:
+                analysis = index.summary(first - 1, last)
+                print(f"Sum: {analysis['total']}")
+                _print_analysis(analysis)
+            else:
+                print(f"Sum: {index.sum(first - 1, last)}")
+    except ValueError as exc:
+        parser.error(str(exc))
+    except OSError as exc:
+        parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+    return 0
+
+
+def _sum_binary_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    from contextlib import ExitStack
+
+    from demos import binary
+    from demos.compressed import open_decompressed
+
+    source = "--stdin" if arguments.stdin else "--file"
+    accumulators: Dict[str, BatchAccumulator] = {}
+    total = None
+    try:
+        with ExitStack() as stack:
+            if arguments.stdin:
+                data = open_decompressed(sys.stdin.buffer, STREAM_CHUNK_SIZE)
+            else:
+                # Peek at the magic bytes without consuming them, so pipes
+                # are read from their first byte; only an uncompressed
+                # regular file is memory-mapped by its path.
+                file = stack.enter_context(open(arguments.file, "rb"))
+                data = open_decompressed(file, STREAM_CHUNK_SIZE)
+                if data is file and stat.S_ISREG(os.fstat(file.fileno()).st_mode):
+                    data = arguments.file
+            if arguments.format == "arrow":
+                accumulators = binary.sum_arrow_columns(
+                    data, arguments.columns, arguments.method, arguments.analyze
+                )
+            elif data is arguments.file:
+                values = binary.read_binary_file(data, arguments.format)
+                if values is not None:
+                    total = SUM_METHODS[arguments.method](values)
+            else:
+                views = binary.iter_binary_stream(data, arguments.format)
+                total = sum_stream(views, SUM_METHODS[arguments.method])
+    except ValueError as exc:
+        parser.error(str(exc))
+    except OSError as exc:
+        parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+    if any(accumulator.count for accumulator in accumulators.values()):
+        _print_column_results(accumulators)
+        return 0
+    if total is None:
+        parser.error(f"{source} requires at least one number.")
+    print(f"Sum: {total}")
+    return 0
+
+
+def _sum_windows_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    from demos.compressed import open_decompressed
+    from demos.window import iter_windows, parse_window
+
+    emitted = 0
+    try:
+        size, seconds = parse_window(arguments.window)
+        every = None
+        if arguments.every is not None:
+            every_size, every_seconds = parse_window(arguments.every)
+            if (every_seconds is None) != (seconds is None):
+                raise ValueError("--every must use the same unit as --window.")
+            every = every_size if seconds is None else every_seconds
+        if arguments.stdin:
+            # Read line by line so each window is reported as soon as it ends.
+            stream = open_decompressed(sys.stdin.buffer)
+            numbers = chain.from_iterable(
+                parse_cli_numbers(line.split(), arguments.allow_float)
+                for line in iter(stream.readline, b"")
+            )
+        else:
+            numbers = chain.from_iterable(
+                iter_file_batches(arguments.file, arguments.allow_float)
+            )
+        windows = iter_windows(numbers, size, seconds, every, arguments.method)
+        for emitted, result in enumerate(windows, 1):
+            print(
+                f"Window {emitted}: sum={result['sum']} mean={result['mean']} "
+                f"count={result['count']} positive={result['positive_count']} "
+                f"negative={result['negative_count']} zeros={result['zero_count']} "
+                f"min={result['minimum']} max={result['maximum']}",
+                flush=True,
+            )
+    except ValueError as exc:
+        parser.error(str(exc))
+    except OSError as exc:
+        parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+    if not emitted:
+        source = "--stdin" if arguments.stdin else "--file"
+        parser.error(f"{source} requires at least one number.")
+    return 0
+
+
+def _decompressed_text(text: TextIO) -> TextIO:
+    """Return ``text``, or a UTF-8 reader over its decompressed bytes."""
+    from demos.compressed import open_decompressed
+
+    buffer = getattr(text, "buffer", None)
+    if buffer is None:
+        return text
+    stream = open_decompressed(buffer)
+    if stream is buffer:
+        return text
+    import io
+
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+
+def _sum_columns_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    from demos.columns import default_delimiter, sum_columns
+
+    delimiter = arguments.delimiter
+    if delimiter is None:
+        delimiter = default_delimiter(arguments.file)
+    elif delimiter == "\\t":
+        delimiter = "\t"
+    if len(delimiter) != 1:
+        parser.error("--delimiter must be a single character.")
+    try:
+        if arguments.stdin:
+            lines = _decompressed_text(sys.stdin)
+            accumulators = sum_columns(
+                lines,
+                arguments.columns,
+                delimiter,
+                arguments.method,
+                arguments.allow_float,
+                arguments.analyze,
+            )
+        else:
+            with open(arguments.file, newline="", encoding="utf-8") as file:
+                accumulators = sum_columns(
+                    _decompressed_text(file),
+                    arguments.columns,
+                    delimiter,
+                    arguments.method,
+                    arguments.allow_float,
+                    arguments.analyze,
+                )
+    except ValueError as exc:
+        parser.error(str(exc))
+    except OSError as exc:
+        parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+    if not any(accumulator.count for accumulator in accumulators.values()):
+        source = "--stdin" if arguments.stdin else "--file"
+        parser.error(f"{source} requires at least one number.")
+    _print_column_results(accumulators)
+    return 0
+
+
 def show_two_number_demo() -> bool:
     """Show the two-number lesson and report whether input remained open."""
     while True:
@@ -144,10 +1034,294 @@ def show_many_number_demo() -> bool:
     return True
 
 
+def _cached_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    import io
+    import sqlite3
+    from contextlib import redirect_stdout
+
+    from demos.cache import ResultCache, cache_key
+
+    if arguments.numbers is None and arguments.file is None:
+        parser.error("--cache requires --numbers or --file.")
+    for option, given in (
+        ("--stdin", arguments.stdin),
+        ("--checkpoint", arguments.checkpoint),
+        ("--resume", arguments.resume),
+        ("--window", arguments.window is not None),
+        ("--build-index", arguments.build_index),
+        ("--stats", arguments.stats is not None),
+        ("--profile", arguments.profile),
+    ):
+        if given:
+            parser.error(f"--cache cannot be combined with {option}.")
+    options = {
+        name: value
+        for name, value in vars(arguments).items()
+        if name not in ("cache", "file")
+    }
+    try:
+        cache = ResultCache()
+    except (OSError, sqlite3.Error) as exc:
+        parser.error(f"cannot open the result cache ({exc}).")
+    with cache:
+        content = None
+        if arguments.file is not None:
+            try:
+                content = cache.file_digest(arguments.file)
+            except OSError as exc:
+                parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+            # The default --columns delimiter depends on the file extension.
+            content = [content, os.path.splitext(arguments.file)[1].lower()]
+        key = cache_key(options, content)
+        stored = cache.get(key)
+        if stored is not None:
+            sys.stdout.write(stored["stdout"])
+            return 0
+        captured = io.StringIO()
+        try:
+            with redirect_stdout(captured):
+                code = _summing_main(parser, arguments)
+        finally:
+            sys.stdout.write(captured.getvalue())
+        if code == 0:
+            cache.put(key, {"stdout": captured.getvalue()})
+    return code
+
+
+def _stats_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    from demos.stats import collect_stats
+
+    if not (arguments.stdin or arguments.file or arguments.numbers is not None):
+        parser.error("--stats requires --numbers, --stdin or --file.")
+    for option, given in (
+        ("--workers", arguments.workers is not None),
+        ("--checkpoint", arguments.checkpoint),
+        ("--resume", arguments.resume),
+        ("--window", arguments.window is not None),
+        ("--build-index", arguments.build_index),
+        ("--range", arguments.range is not None),
+        ("--format", arguments.format != "text"),
+        ("--columns", arguments.columns is not None),
+    ):
+        if given:
+            parser.error(f"--stats cannot be combined with {option}.")
+    with collect_stats() as stats:
+        code = _summing_main(parser, arguments)
+    sys.stderr.write(stats.format(arguments.stats))
+    return code
+
+
+def _profiled_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    from demos.profiling import profile_summation
+
+    if not (arguments.stdin or arguments.file or arguments.numbers is not None):
+        parser.error("--profile requires --numbers, --stdin or --file.")
+    if arguments.workers is not None:
+        parser.error("--profile cannot be combined with --workers.")
+    input_size = None
+    if arguments.file is not None:
+        try:
+            input_size = os.path.getsize(arguments.file)
+        except OSError as exc:
+            parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+    run = _summing_main if arguments.stats is None else _stats_main
+    with profile_summation() as profile:
+        code = run(parser, arguments)
+    sys.stderr.write(profile.format(input_size=input_size))
+    return code
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     """Run the interactive lesson or one-shot command-line summation."""
     parser = build_argument_parser()
     arguments = parser.parse_args([] if argv is None else argv)
+    try:
+        if arguments.cache:
+            return _cached_main(parser, arguments)
+        if arguments.profile:
+            return _profiled_main(parser, arguments)
+        if arguments.stats is not None:
+            return _stats_main(parser, arguments)
+        return _summing_main(parser, arguments)
+    except OverflowError as exc:
+        # fsum and exact cannot round a total beyond the float range, and the
+        # float methods cannot convert integers beyond it.
+        parser.error(
+            f"the sum is out of range for --method {arguments.method} ({exc})."
+        )
+
+
+def _summing_main(
+    parser: argparse.ArgumentParser, arguments: argparse.Namespace
+) -> int:
+    sources = [
+        option
+        for option, given in (
+            ("--stdin", arguments.stdin),
+            ("--file", arguments.file is not None),
+            ("--numbers", arguments.numbers is not None),
+        )
+        if given
+    ]
+    if len(sources) > 1:
+        parser.error(f"{sources[0]} cannot be combined with {sources[1]}.")
+    if arguments.workers is not None:
+        if arguments.file is None:
+            parser.error("--workers requires --file.")
+        if arguments.workers < 1:
+            parser.error("--workers must be at least 1.")
+    if arguments.pipeline:
+        if not (arguments.stdin or arguments.file is not None):
+            parser.error("--pipeline requires --stdin or --file.")
+        if arguments.workers is not None:
+            parser.error("--pipeline cannot be combined with --workers.")
+    if arguments.checkpoint or arguments.resume:
+        option = "--resume" if arguments.resume else "--checkpoint"
+        if arguments.file is None:
+            parser.error(f"{option} requires --file.")
+        for other, given in (
+            ("--workers", arguments.workers is not None),
+            ("--pipeline", arguments.pipeline),
+        ):
+            if given:
+                parser.error(f"{option} cannot be combined with {other}.")
+    if arguments.window is None:
+        if arguments.every is not None:
+            parser.error("--every requires --window.")
+    elif not (arguments.stdin or arguments.file is not None):
+        parser.error("--window requires --stdin or --file.")
+    else:
+        for option, given in (
+            ("--workers", arguments.workers is not None),
+            ("--pipeline", arguments.pipeline),
+            ("--checkpoint", arguments.checkpoint),
+            ("--resume", arguments.resume),
+            ("--format", arguments.format != "text"),
+            ("--columns", arguments.columns is not None),
+            ("--build-index", arguments.build_index),
+            ("--range", arguments.range is not None),
+            ("--delimiter", arguments.delimiter is not None),
+            ("--analyze", arguments.analyze),
+        ):
+            if given:
+                parser.error(f"--window cannot be combined with {option}.")
+        return _sum_windows_main(parser, arguments)
+    if arguments.build_index or arguments.range is not None:
+        option = "--build-index" if arguments.build_index else "--range"
+        if arguments.file is None:
+            parser.error(f"{option} requires --file.")
+        for other, given in (
+            ("--range", arguments.build_index and arguments.range is not None),
+            ("--workers", arguments.workers is not None),
+            ("--pipeline", arguments.pipeline),
+            ("--checkpoint", arguments.checkpoint),
+            ("--resume", arguments.resume),
+            ("--format", arguments.format != "text"),
+            ("--columns", arguments.columns is not None),
+            ("--delimiter", arguments.delimiter is not None),
+            ("--method", arguments.method != "builtin"),
+        ):
+            if given:
+                parser.error(f"{option} cannot be combined with {other}.")
+        return _sum_range_main(parser, arguments)
+    if arguments.format != "text":
+        if not (arguments.stdin or arguments.file is not None):
+            parser.error("--format requires --stdin or --file.")
+        tabular = arguments.format == "arrow"
+        for option, given in (
+            ("--workers", arguments.workers is not None),
+            ("--pipeline", arguments.pipeline),
+            ("--checkpoint", arguments.checkpoint),
+            ("--resume", arguments.resume),
+            ("--delimiter", arguments.delimiter is not None),
+            ("--columns", arguments.columns is not None and not tabular),
+            ("--analyze", arguments.analyze and not tabular),
+        ):
+            if given:
+                parser.error(
+                    f"{option} cannot be combined with --format {arguments.format}."
+                )
+        return _sum_binary_main(parser, arguments)
+    if arguments.columns is None:
+        for option, given in (
+            ("--delimiter", arguments.delimiter is not None),
+            ("--analyze", arguments.analyze),
+        ):
+            if given:
+                parser.error(f"{option} requires --columns.")
+    elif not (arguments.stdin or arguments.file is not None):
+        parser.error("--columns requires --stdin or --file.")
+    else:
+        for option, given in (
+            ("--workers", arguments.workers is not None),
+            ("--pipeline", arguments.pipeline),
+            ("--checkpoint", arguments.checkpoint),
+            ("--resume", arguments.resume),
+        ):
+            if given:
+                parser.error(f"{option} cannot be combined with --columns.")
+        return _sum_columns_main(parser, arguments)
+    method = SUM_METHODS[arguments.method]
+    if arguments.stdin or arguments.file is not None:
+        try:
+            if arguments.stdin:
+                from demos.compressed import open_decompressed
+
+                stream = open_decompressed(sys.stdin.buffer, STREAM_CHUNK_SIZE)
+                if arguments.pipeline:
+                    from demos.pipeline import sum_pipelined
+
+                    total = sum_pipelined(
+                        stream, arguments.method, arguments.allow_float
+                    )
+                else:
+                    batches = iter_stream_batches(stream, arguments.allow_float)
+                    total = sum_stream(batches, method)
+            elif arguments.pipeline:
+                from demos.compressed import open_decompressed
+                from demos.pipeline import sum_pipelined
+
+                with open(arguments.file, "rb") as file:
+                    total = sum_pipelined(
+                        open_decompressed(file, STREAM_CHUNK_SIZE),
+                        arguments.method,
+                        arguments.allow_float,
+                    )
+            elif arguments.checkpoint or arguments.resume:
+                from demos.checkpoint import sum_file_checkpointed
+
+                total = sum_file_checkpointed(
+                    arguments.file,
+                    arguments.method,
+                    arguments.allow_float,
+                    resume=arguments.resume,
+                ).total()
+            elif arguments.workers is not None:
+                from demos.parallel import sum_file_parallel
+
+                total = sum_file_parallel(
+                    arguments.file,
+                    arguments.workers,
+                    arguments.method,
+                    arguments.allow_float,
+                )
+            else:
+                batches = iter_file_batches(arguments.file, arguments.allow_float)
+                total = sum_stream(batches, method)
+        except ValueError as exc:
+            parser.error(str(exc))
+        except OSError as exc:
+            parser.error(f"cannot read {arguments.file!r}: {exc.strerror}.")
+        if total is None:
+            parser.error(f"{sources[0]} requires at least one number.")
+        print(f"Sum: {total}")
+        return 0
     if arguments.numbers is not None:
         if not arguments.numbers:
             parser.error("--numbers requires at least one number.")
@@ -155,10 +1329,14 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             numbers = parse_cli_numbers(arguments.numbers, arguments.allow_float)
         except ValueError as exc:
             parser.error(str(exc))
-        print(f"Sum: {sum_builtin(numbers)}")
+        if _stats is None:
+            total = method(numbers)
+        else:
+            total = sum_stream([numbers], method)
+        print(f"Sum: {total}")
         return 0
     if arguments.allow_float:
-        parser.error("--float requires --numbers.")
+        parser.error("--float requires --numbers, --stdin or --file.")
 
     print("== Summing in Python: multiple approaches ==")
     if not show_two_number_demo():
@@ -168,4 +1346,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
 
 if __name__ == "__main__":
+    if not __package__:
+        # Run as ``python demos/summing_methods.py``: put the repository root
+        # on the path so the lazily imported ``demos`` modules resolve.
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     raise SystemExit(main(sys.argv[1:]))
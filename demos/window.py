@@ -0,0 +1,236 @@
+"""Rolling sums and statistics over the most recent values of a stream.
+
+:class:`SlidingWindow` keeps the last ``size`` values, the values of the last
+``seconds``, or both. Each update and eviction is O(1) amortized: integers
+are totalled exactly, floats with Neumaier compensation that is re-anchored
+by summing the window afresh once as many floats have left it as it holds,
+and monotonic deques track the minimum and maximum. :func:`iter_windows`
+emits one result per tumbling or hopping window.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from demos.summing_methods import Number, get_sum_method
+
+
+def parse_window(text: str) -> Tuple[Optional[int], Optional[float]]:
+    """Return ``(size, None)`` for a count such as ``100`` or ``(None, 30.0)``
+    for a duration such as ``30s``."""
+    try:
+        if text.endswith("s"):
+            seconds = float(text[:-1])
+            if math.isfinite(seconds) and seconds > 0:
+                return None, seconds
+        elif int(text) > 0:
+            return int(text), None
+    except ValueError:
+        pass
+    raise ValueError(
+        f"{text!r} is not a valid window; use a count such as 100 "
+        "or seconds such as 30s."
+    )
+
+
+class SlidingWindow:
+    """Sum, mean, sign counts, minimum and maximum of the most recent values.
+
+    ``method`` names the registered summation method used to re-anchor the
+    float total; the running total between re-anchors is compensated, so
+    rounding error does not build up however long the stream runs. Integer
+    windows are exact.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        seconds: Optional[float] = None,
+        method: str = "fsum",
+    ) -> None:
+        if size is None and seconds is None:
+            raise ValueError("a window needs a size or a duration.")
+        if size is not None and size < 1:
+            raise ValueError("the window size must be at least 1.")
+        if seconds is not None and not seconds > 0:
+            raise ValueError("the window duration must be positive.")
+        self.size = size
+        self.seconds = seconds
+        self._reanchor = get_sum_method(method)
+        self._values: Deque[Tuple[float, Number]] = deque()
+        self._minima: Deque[Tuple[int, Number]] = deque()
+        self._maxima: Deque[Tuple[int, Number]] = deque()
+        self._added = 0
+        self._integer = 0
+        self._float = 0.0
+        self._compensation = 0.0
+        self._float_count = 0
+        self._floats_evicted = 0
+        self.positive_count = 0
+        self.negative_count = 0
+        self.zero_count = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _add_float(self, number: float) -> None:
+        running = self._float + number
+        if abs(self._float) >= abs(number):
+            self._compensation += (self._float - running) + number
+        else:
+            self._compensation += (number - running) + self._float
+        self._float = running
+
+    def _count_sign(self, number: Number, step: int) -> None:
+        if number > 0:
+            self.positive_count += step
+        elif number < 0:
+            self.negative_count += step
+        else:
+            self.zero_count += step
+
+    def add(self, number: Number, timestamp: Optional[float] = None) -> None:
+        """Add ``number``, seen at ``timestamp``, and evict what falls out.
+
+        ``timestamp`` defaults to :func:`time.monotonic` for duration windows.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic() if self.seconds is not None else 0.0
+        if isinstance(number, float):
+            if not math.isfinite(number):
+                raise ValueError(f"'{number!r}' is not a valid finite number.")
+            self._add_float(number)
+            self._float_count += 1
+        else:
+            self._integer += number
+        self._count_sign(number, 1)
+        index = self._added
+        self._added += 1
+        while self._minima and self._minima[-1][1] >= number:
+            self._minima.pop()
+        self._minima.append((index, number))
+        while self._maxima and self._maxima[-1][1] <= number:
+            self._maxima.pop()
+        self._maxima.append((index, number))
+        self._values.append((timestamp, number))
+        if self.size is not None and len(self._values) > self.size:
+            self._evict()
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Evict values seen more than ``seconds`` before ``now``."""
+        if self.seconds is None:
+            return
+        while self._values and self._values[0][0] < now - self.seconds:
+            self._evict()
+
+    def shrink(self, count: int) -> None:
+        """Evict the oldest values until at most ``count`` remain."""
+        while len(self._values) > count:
+            self._evict()
+
+    def _evict(self) -> None:
+        index = self._added - len(self._values)
+        _, number = self._values.popleft()
+        if self._minima[0][0] == index:
+            self._minima.popleft()
+        if self._maxima[0][0] == index:
+            self._maxima.popleft()
+        self._count_sign(number, -1)
+        if not isinstance(number, float):
+            self._integer -= number
+            return
+        self._float_count -= 1
+        self._floats_evicted += 1
+        if not self._float_count:
+            self._float = self._compensation = 0.0
+            self._floats_evicted = 0
+        elif self._floats_evicted >= self._float_count:
+            self._float = float(
+                self._reanchor(
+                    value for _, value in self._values if isinstance(value, float)
+                )
+            )
+            self._compensation = 0.0
+            self._floats_evicted = 0
+        else:
+            self._add_float(-number)
+
+    def total(self) -> Number:
+        """Return the sum of the window; ``0`` when it is empty."""
+        if not self._float_count:
+            return self._integer
+        return self._integer + (self._float + self._compensation)
+
+    def result(self) -> Dict[str, object]:
+        """Return the count, sum, mean, sign counts, minimum and maximum."""
+        count = len(self._values)
+        total = self.total()
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else None,
+            "positive_count": self.positive_count,
+            "negative_count": self.negative_count,
+            "zero_count": self.zero_count,
+            "minimum": self._minima[0][1] if count else None,
+            "maximum": self._maxima[0][1] if count else None,
+        }
+
+
+def iter_windows(
+    numbers: Iterable[Number],
+    size: Optional[int] = None,
+    seconds: Optional[float] = None,
+    every: Optional[float] = None,
+    method: str = "fsum",
+    clock: Callable[[], float] = time.monotonic,
+) -> Iterator[Dict[str, object]]:
+    """Yield a :meth:`SlidingWindow.result` for each window of ``numbers``.
+
+    A result is emitted after every ``every`` values, or every ``every``
+    seconds for a duration window; by default ``every`` is the window
+    itself, which gives tumbling windows, and a smaller step gives hopping
+    ones. Duration windows are timed by ``clock`` as values arrive, and one
+    ends when the first value after it arrives. If values arrived since the
+    last result, the window that would have ended at the next step is
+    emitted, partially filled, at the end of the input.
+    """
+    window = SlidingWindow(size, seconds, method)
+    step = every if every is not None else seconds if seconds is not None else size
+    if not step > 0:
+        raise ValueError("the window step must be positive.")
+    limit = seconds if seconds is not None else size
+    if step > limit:
+        raise ValueError("the window step cannot exceed the window.")
+    pending = 0
+    deadline = None
+    for number in numbers:
+        if seconds is None:
+            window.add(number)
+            pending += 1
+            if pending == step:
+                yield window.result()
+                pending = 0
+            continue
+        now = clock()
+        if deadline is None:
+            deadline = now + step
+        while now >= deadline:
+            window.expire(deadline)
+            if pending:
+                yield window.result()
+                pending = 0
+            deadline += step
+        window.add(number, now)
+        pending += 1
+    if pending:
+        # Report the window that would have ended at the next step.
+        if deadline is not None:
+            window.expire(deadline)
+        elif size is not None:
+            window.shrink(size - step + pending)
+        yield window.result()
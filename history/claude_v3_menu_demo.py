@@ -4,6 +4,8 @@ import math
 from collections.abc import Iterable
 from typing import Optional, Union
 
+from demos.summary import NumberSummary
+
 Number = Union[int, float]
 MAX_INPUT_COUNT = 100
 
@@ -55,64 +57,34 @@ def custom_sum(numbers: Iterable[Number]) -> Number:
     return total
 
 
-def analyze_numbers(numbers: Iterable[Number]) -> dict[str, object]:
+def analyze_numbers(
+    numbers: Iterable[Number],
+    keep_values: bool = True,
+    approximate_median: bool = False,
+) -> dict[str, object]:
     """Return sign and summary statistics for finite numeric values.
 
-    Values must be built-in ``int`` values or finite ``float`` values. The input
-    is materialized once, so generators are supported and the returned
-    sign-based lists preserve the original values and order. ``total`` and the
-    sign-specific sums use Python's built-in ``sum`` and consequently retain
-    normal Python ``int``/``float`` arithmetic rather than adding a
-    high-precision policy to this historical demonstration.
+    Values must be built-in ``int`` values or finite ``float`` values. The
+    input is consumed once by :class:`demos.summary.NumberSummary`, so
+    generators are supported and the returned sign-based lists preserve the
+    original values and order. Pass ``keep_values=False`` to skip those lists
+    (they and ``median`` are then ``None``) and summarize in constant memory.
+    ``approximate_median=True`` estimates the median from a bounded-size
+    quantile sketch instead, so it stays available without the lists.
+    ``total`` and the sign-specific sums keep ``int`` input exact; float
+    addends are accumulated exactly and rounded once, like ``math.fsum``; a
+    float total beyond the float range is infinite, as it is with ``sum``.
 
     For non-empty input, ``mean`` is ``total / count``, ``median`` is the
-    middle sorted value (or the arithmetic mean of the two middle values), and
+    middle sorted value (or the arithmetic mean of the two middle values),
+    found by linear-time selection rather than a full sort, and
     ``minimum`` and ``maximum`` are input values. For empty input, all four
     summary statistics are ``None``. Non-numeric values raise ``TypeError``;
     non-finite floats raise ``ValueError``.
     """
-    values = list(numbers)
-    for number in values:
-        if isinstance(number, bool) or not isinstance(number, (int, float)):
-            raise TypeError("numbers must contain int or float values")
-        if isinstance(number, float) and not math.isfinite(number):
-            raise ValueError("numbers must contain only finite float values")
-
-    positive_numbers = [number for number in values if number > 0]
-    negative_numbers = [number for number in values if number < 0]
-    zero_numbers = [number for number in values if number == 0]
-    total = sum(values)
-
-    if values:
-        sorted_values = sorted(values)
-        middle_index = len(sorted_values) // 2
-        if len(sorted_values) % 2:
-            median: Optional[Number] = sorted_values[middle_index]
-        else:
-            lower_middle = sorted_values[middle_index - 1]
-            upper_middle = sorted_values[middle_index]
-            median = (lower_middle + upper_middle) / 2
-        mean: Optional[Number] = total / len(values)
-        minimum: Optional[Number] = sorted_values[0]
-        maximum: Optional[Number] = sorted_values[-1]
-    else:
-        mean = median = minimum = maximum = None
-
-    return {
-        "total": total,
-        "positive": positive_numbers,
-        "negative": negative_numbers,
-        "zeros": zero_numbers,
-        "positive_sum": sum(positive_numbers),
-        "negative_sum": sum(negative_numbers),
-        "positive_count": len(positive_numbers),
-        "negative_count": len(negative_numbers),
-        "zero_count": len(zero_numbers),
-        "mean": mean,
-        "median": median,
-        "minimum": minimum,
-        "maximum": maximum,
-    }
+    summary = NumberSummary(keep_values, approximate_median)
+    summary.update_many(numbers)
+    return summary.result()
 
 
 def method_two_integers() -> None:
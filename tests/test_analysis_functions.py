@@ -1,7 +1,12 @@
 """Direct tests for the v3 sign-breakdown helper."""
 
+import json
+import math
+import statistics
+
 import pytest
 
+from demos.summary import NumberSummary, QuantileSketch, merge_summaries, select_kth
 from history.claude_v3_menu_demo import analyze_numbers, method_positive_negative_demo
 
 
@@ -71,3 +76,156 @@ def test_positive_negative_menu_displays_summary_statistics(monkeypatch, capsys)
     assert "Median:" in output
     assert "Minimum:" in output
     assert "Maximum:" in output
+
+
+def test_analyze_numbers_can_skip_value_lists():
+    result = analyze_numbers(iter([10, -5, 0, 3]), keep_values=False)
+
+    assert result["positive"] is result["negative"] is result["zeros"] is None
+    assert result["median"] is None
+    assert result["total"] == 8
+    assert (result["positive_count"], result["negative_count"], result["zero_count"]) == (
+        2,
+        1,
+        1,
+    )
+    assert (result["minimum"], result["maximum"], result["mean"]) == (-5, 10, 2.0)
+
+
+def test_number_summary_merge_matches_single_pass():
+    values = [2**70, -3, 0.5, 0, -2.25, 7, 1e-3, 4]
+    left, right = NumberSummary(), NumberSummary()
+    left.update_many(values[:3])
+    right.update_many(values[3:])
+    whole = NumberSummary()
+    whole.update_many(values)
+
+    merged = left.merge(right)
+
+    assert merged.result() == whole.result()
+    assert merged.variance == pytest.approx(whole.variance)
+    assert merged.variance == pytest.approx(statistics.pvariance(values))
+
+
+def test_number_summary_totals_keep_integers_exact_and_floats_compensated():
+    summary = NumberSummary(keep_values=False)
+    summary.update_many([2**60 + 1, 2**60 + 1])
+    assert summary.result()["total"] == 2**61 + 2
+
+    summary = NumberSummary(keep_values=False)
+    summary.update_many([0.1] * 10)
+    assert summary.result()["total"] == 1.0
+
+
+def test_batched_update_matches_one_update_per_value():
+    values = [((index * 7919) % 1009) - 500 + 0.25 * (index % 3) for index in range(9000)]
+    values[4321] = 2**80
+    values[6000] = -0.0
+    batched = NumberSummary(approximate_median=True)
+    batched.update_many(iter(values))
+    single = NumberSummary(approximate_median=True)
+    for value in values:
+        single.update(value)
+
+    assert batched.result() == single.result()
+    assert batched.variance == pytest.approx(single.variance)
+    assert batched.sketch.to_dict() == single.sketch.to_dict()
+
+
+@pytest.mark.parametrize(
+    "bad, error",
+    [(True, TypeError), ("1", TypeError), (math.inf, ValueError)],
+)
+def test_batched_update_stops_at_the_first_invalid_value(bad, error):
+    summary = NumberSummary()
+
+    with pytest.raises(error):
+        summary.update_many([1, 2.5, bad, 4])
+
+    assert summary.count == 2
+    assert summary.result()["total"] == 3.5
+
+
+def test_analyze_numbers_float_overflow_is_infinite():
+    result = analyze_numbers([1e308, 1e308, -1.0])
+
+    assert result["total"] == result["positive_sum"] == result["mean"] == math.inf
+    assert result["negative_sum"] == -1.0
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        list(range(500)),
+        list(range(500, 0, -1)),
+        [7] * 200,
+        [((index * 7919) % 1009) - 500 for index in range(1009)],
+        [0.5, -2, 3, 3, 3.0, -1e-9, 2**70],
+    ],
+)
+def test_select_kth_matches_sorted_order(values):
+    ordered = sorted(values)
+    for k in {0, len(values) // 2, len(values) - 1}:
+        assert select_kth(values, k) == ordered[k]
+
+
+def test_analyze_numbers_median_matches_statistics_module():
+    values = [((index * 7919) % 1009) - 500 + 0.25 * (index % 3) for index in range(2000)]
+
+    assert analyze_numbers(values)["median"] == statistics.median(values)
+    assert analyze_numbers(values[:-1])["median"] == statistics.median(values[:-1])
+
+
+def test_approximate_median_survives_without_value_lists():
+    values = [((index * 7919) % 10007) / 10007 for index in range(10007)]
+
+    result = analyze_numbers(values, keep_values=False, approximate_median=True)
+
+    assert result["positive"] is None
+    assert result["median"] == pytest.approx(statistics.median(values), abs=0.01)
+
+
+def test_quantile_sketch_merge_keeps_tail_estimates():
+    left, right = QuantileSketch(), QuantileSketch()
+    for index in range(5000):
+        left.update(index)
+        right.update(5000 + index)
+
+    merged = left.merge(right)
+
+    assert merged.count == 10000
+    assert merged.quantile(0.0) == 0
+    assert merged.quantile(1.0) == 9999
+    assert merged.quantile(0.5) == pytest.approx(5000, rel=0.01)
+    assert merged.quantile(0.99) == pytest.approx(9900, rel=0.005)
+
+
+def test_number_summary_round_trips_through_json():
+    summary = NumberSummary(keep_values=False, approximate_median=True)
+    summary.update_many([2**80, -1.5, 0, 0.1, 3])
+
+    restored = NumberSummary.from_dict(json.loads(json.dumps(summary.to_dict())))
+
+    assert restored.result() == summary.result()
+    assert restored.variance == summary.variance
+
+
+def test_merge_summaries_is_independent_of_grouping():
+    values = [1e16, 1.0, -1e16, 0.1, 2**64, -3, 0.0] * 30
+    shards = [values[index:index + 11] for index in range(0, len(values), 11)]
+
+    def summarize(shard):
+        summary = NumberSummary(keep_values=False, approximate_median=True)
+        summary.update_many(shard)
+        return NumberSummary.from_dict(summary.to_dict())
+
+    tree = merge_summaries(summarize(shard) for shard in shards).result()
+    chain = NumberSummary(keep_values=False, approximate_median=True)
+    for shard in shards:
+        chain.merge(summarize(shard))
+
+    assert tree["total"] == chain.result()["total"] == math.fsum(values)
+    assert {key: tree[key] for key in tree if key != "median"} == {
+        key: value for key, value in chain.result().items() if key != "median"
+    }
+    assert tree["median"] == pytest.approx(statistics.median(values))
@@ -0,0 +1,136 @@
+"""Tests for the reproducible summation benchmark harness."""
+
+import json
+from pathlib import Path
+
+from benchmarks.summation import (
+    DEFAULT_SIZES,
+    DISTRIBUTIONS,
+    ELEMENT_TYPES,
+    benchmark_methods,
+    compare_to_baseline,
+    generate_values,
+    main,
+    run_benchmarks,
+)
+
+BASELINE = Path(__file__).resolve().parents[1] / "benchmarks" / "baseline.json"
+
+
+def test_generated_values_are_reproducible_and_typed():
+    assert generate_values(50, "float", "wide") == generate_values(50, "float", "wide")
+    assert all(
+        type(value) is int for value in generate_values(30, "bigint", "cancellation")
+    )
+    assert {type(value) for value in generate_values(200, "mixed", "uniform")} == {
+        int,
+        float,
+    }
+
+
+def test_skewed_values_mix_rare_huge_integers_with_small_ones():
+    values = generate_values(2_001, "bigint", "skewed")
+
+    huge = [index for index, value in enumerate(values) if abs(value) > 2**1000]
+    assert huge == [0, 1_000, 2_000]
+
+
+def test_benchmark_methods_cover_every_lesson_method():
+    assert {
+        "add_plus",
+        "add_sum",
+        "add_operator",
+        "custom_sum",
+        "builtin",
+        "reduce",
+        "fsum",
+    } <= set(benchmark_methods())
+
+
+def test_run_benchmarks_records_time_and_accuracy():
+    report = run_benchmarks(
+        sizes=[9], element_types=["float"], distributions=["cancellation"], repeat=1
+    )
+
+    results = {result["method"]: result for result in report["results"]}
+    assert results["fsum"]["relative_error"] <= results["builtin"]["relative_error"]
+    assert all(result["seconds"] > 0 for result in results.values())
+
+
+def _cases(**seconds):
+    dataset = {"element_type": "int", "distribution": "uniform", "size": 10}
+    return {
+        "results": [
+            {"method": method, **dataset, "seconds": time}
+            for method, time in seconds.items()
+        ]
+    }
+
+
+def test_compare_to_baseline_flags_only_relative_slowdowns_beyond_tolerance():
+    baseline = _cases(builtin=1.0, fsum=2.0)
+
+    assert compare_to_baseline(_cases(builtin=3.0, fsum=7.0), baseline) == ([], [])
+    [regression], [] = compare_to_baseline(_cases(builtin=0.5, fsum=2.0), baseline)
+    assert (regression["method"], regression["ratio"]) == ("fsum", 2.0)
+
+
+def test_compare_to_baseline_reports_skipped_cases():
+    baseline = _cases(builtin=1.0, fsum=2e-6, kahan=None)
+    report = _cases(builtin=1.0, fsum=1.0, kahan=1.0, pairwise=1.0)
+
+    regressions, skipped = compare_to_baseline(report, baseline)
+
+    assert regressions == []
+    assert {case["method"]: case["reason"] for case in skipped} == {
+        "fsum": "too fast to time reliably",
+        "kahan": "could not run",
+        "pairwise": "not in the baseline",
+    }
+    [skipped] = compare_to_baseline(_cases(fsum=1.0), baseline)[1]
+    assert skipped["reason"] == "no builtin time to compare against"
+
+
+def test_stored_baseline_covers_every_default_case():
+    results = json.loads(BASELINE.read_text())["results"]
+
+    recorded = {
+        (case["method"], case["element_type"], case["distribution"], case["size"])
+        for case in results
+    }
+    assert recorded == {
+        (method, element_type, distribution, size)
+        for method in benchmark_methods()
+        for element_type in ELEMENT_TYPES
+        for distribution in DISTRIBUTIONS
+        for size in DEFAULT_SIZES
+    }
+
+
+def test_cli_writes_json_and_fails_on_regressions(tmp_path, monkeypatch):
+    monkeypatch.setattr("benchmarks.summation.MIN_COMPARABLE_SECONDS", 0.0)
+    output = tmp_path / "report.json"
+    arguments = [
+        "--sizes",
+        "10",
+        "--types",
+        "int",
+        "--methods",
+        "builtin",
+        "fsum",
+        "--repeat",
+        "1",
+    ]
+    assert main([*arguments, "--output", str(output)]) == 0
+
+    baseline = json.loads(output.read_text())
+    for result in baseline["results"]:
+        if result["method"] == "fsum":
+            result["seconds"] = 1e-3 * result["seconds"]
+    slow_baseline = tmp_path / "baseline.json"
+    slow_baseline.write_text(json.dumps(baseline))
+
+    assert (
+        main([*arguments, "--output", str(output), "--baseline", str(slow_baseline)])
+        == 1
+    )
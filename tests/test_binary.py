@@ -0,0 +1,214 @@
+"""Tests for summing binary numeric input."""
+
+import array
+import io
+import math
+import os
+import sys
+import threading
+
+import pytest
+
+from demos.binary import (
+    check_finite,
+    iter_binary_stream,
+    npy_header,
+    read_binary_file,
+    sum_arrow_columns,
+    typed_view,
+)
+from demos.summing_methods import main
+
+
+def _raw(typecode, values):
+    data = array.array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _npy(descr, shape, payload, version=1):
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape}, }}\n"
+    size = len(header).to_bytes(2 if version == 1 else 4, "little")
+    return b"\x93NUMPY" + bytes([version, 0]) + size + header.encode() + payload
+
+
+def test_typed_view_reads_little_endian_values_without_copying():
+    data = bytearray(_raw("d", [1.5, -2.25]))
+
+    values = typed_view(data, "d")
+
+    assert list(values) == [1.5, -2.25]
+    if sys.byteorder == "little":
+        data[:8] = _raw("d", [4.0])
+        assert values[0] == 4.0
+    with pytest.raises(ValueError, match="12 bytes is not a whole number"):
+        typed_view(data[:12], "d")
+
+
+def test_check_finite_uses_the_parse_error_message():
+    check_finite(typed_view(_raw("q", [2**63 - 1]), "q"))
+    with pytest.raises(ValueError, match="'nan' is not a valid finite number."):
+        check_finite(typed_view(_raw("d", [1.0, math.nan]), "d"))
+
+
+def test_npy_header_reads_dtype_shape_and_offset():
+    data = _npy("<i4", (2, 3), _raw("i", range(6)))
+
+    assert npy_header(data) == ("i", 6, len(data) - 24)
+    assert npy_header(_npy("<f8", (), b"", version=2))[:2] == ("d", 1)
+    with pytest.raises(ValueError, match="unsupported .npy dtype '>f8'"):
+        npy_header(_npy(">f8", (1,), b""))
+    with pytest.raises(ValueError, match="not a .npy file"):
+        npy_header(b"1 2 3\n")
+
+
+def test_read_binary_file_maps_raw_and_npy_files(tmp_path):
+    raw = tmp_path / "values.i64"
+    raw.write_bytes(_raw("q", [2**62, 2**62, 5]))
+    npy = tmp_path / "values.npy"
+    npy.write_bytes(_npy("<f8", (3,), _raw("d", [0.1, 0.2, 0.3])))
+    empty = tmp_path / "empty.f64"
+    empty.write_bytes(b"")
+
+    assert sum(read_binary_file(raw, "i64")) == 2**63 + 5
+    assert math.fsum(read_binary_file(npy, "npy")) == 0.6
+    assert read_binary_file(empty, "f64") is None
+
+
+def _write_later(path, data):
+    writer = threading.Thread(target=path.write_bytes, args=(data,))
+    writer.start()
+    return writer
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+@pytest.mark.parametrize("binary_format", ["f64", "npy"])
+def test_read_binary_file_reads_named_pipes(tmp_path, capsys, binary_format):
+    data = _raw("d", [0.5, 1.5, 2.0])
+    if binary_format == "npy":
+        data = _npy("<f8", (3,), data)
+    path = tmp_path / "values"
+    os.mkfifo(path)
+
+    writer = _write_later(path, data)
+    assert sum(read_binary_file(path, binary_format)) == 4.0
+    writer.join()
+    writer = _write_later(path, data)
+    assert main(["--file", str(path), "--format", binary_format]) == 0
+    writer.join()
+
+    assert capsys.readouterr().out == "Sum: 4.0\n"
+
+
+def test_iter_binary_stream_carries_partial_values_across_chunks():
+    stream = io.BytesIO(_raw("d", [0.5] * 10))
+
+    chunks = list(iter_binary_stream(stream, "f64", chunk_size=12))
+
+    assert sum(len(chunk) for chunk in chunks) == 10
+    assert sum(map(sum, chunks)) == 5.0
+    with pytest.raises(ValueError, match="4 trailing bytes"):
+        list(iter_binary_stream(io.BytesIO(b"\0" * 12), "f64"))
+    with pytest.raises(ValueError, match=".npy data is truncated"):
+        list(iter_binary_stream(io.BytesIO(_npy("<f8", (2,), b"\0" * 8)), "npy"))
+
+
+def test_cli_sums_binary_files_and_stdin(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "values.f64"
+    path.write_bytes(_raw("d", [1e100, 1.0, -1e100]))
+
+    assert main(["--file", str(path), "--format", "f64", "--method", "fsum"]) == 0
+    stdin = io.TextIOWrapper(io.BytesIO(_raw("q", [1, 2, 3])))
+    monkeypatch.setattr("sys.stdin", stdin)
+    assert main(["--stdin", "--format", "i64"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 1.0\nSum: 6\n"
+
+
+def test_cli_sum_numpy_reduces_mapped_npy_files_in_place(tmp_path, capsys):
+    numpy = pytest.importorskip("numpy")
+    path = tmp_path / "values.npy"
+    numpy.save(path, numpy.arange(1000, dtype=numpy.int64))
+
+    assert main(["--file", str(path), "--format", "npy", "--method", "numpy"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 499500\n"
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--format", "f64"], "--format requires --stdin or --file."),
+        (["--stdin", "--format", "npy", "--columns", "1"], "--columns cannot"),
+        (["--file", "x", "--format", "f64", "--workers", "2"], "--workers cannot"),
+        (["--stdin", "--format", "f64"], "--stdin requires at least one number."),
+    ],
+)
+def test_cli_binary_option_errors(monkeypatch, capsys, arguments, message):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"")))
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def _write_arrow(path, table, file_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    new_writer = pyarrow.ipc.new_file if file_format else pyarrow.ipc.new_stream
+    with pyarrow.OSFile(str(path), "wb") as sink:
+        with new_writer(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=2)
+
+
+@pytest.mark.parametrize("file_format", [False, True])
+def test_sum_arrow_columns_reads_streams_and_files(tmp_path, file_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    path = tmp_path / "values.arrow"
+    table = pyarrow.table({"cents": [100, 250, -50], "rate": [0.1, 0.2, 0.3]})
+    _write_arrow(path, table, file_format)
+
+    accumulators = sum_arrow_columns(path, method="fsum")
+
+    assert {name: acc.total() for name, acc in accumulators.items()} == {
+        "cents": 300.0,
+        "rate": 0.6,
+    }
+
+
+def test_sum_arrow_columns_keeps_columns_that_share_a_name_apart(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    path = tmp_path / "values.arrow"
+    table = pyarrow.table([[1, 2], [10, 20]], names=["x", "x"])
+    _write_arrow(path, table, False)
+
+    accumulators = sum_arrow_columns(path, ["x", "2"])
+
+    assert {name: acc.total() for name, acc in accumulators.items()} == {
+        "x (column 1)": 3,
+        "x (column 2)": 30,
+    }
+
+
+def test_sum_arrow_columns_rejects_nulls_and_text(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    path = tmp_path / "values.arrow"
+    _write_arrow(path, pyarrow.table({"a": [1.0, None], "s": ["x", "y"]}), False)
+
+    with pytest.raises(ValueError, match="column 'a' has null values"):
+        sum_arrow_columns(path, ["a"])
+    with pytest.raises(ValueError, match="column 's' has non-numeric type string"):
+        sum_arrow_columns(path, ["2"])
+
+
+def test_cli_sums_arrow_stream_from_stdin(tmp_path, monkeypatch, capsys):
+    pyarrow = pytest.importorskip("pyarrow")
+    path = tmp_path / "values.arrows"
+    _write_arrow(path, pyarrow.table({"a": [1, 2, 3], "b": [4, 5, 6]}), False)
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(path.read_bytes())))
+
+    assert main(["--stdin", "--format", "arrow", "--columns", "b"]) == 0
+
+    assert capsys.readouterr().out == "Sum of b: 15\n"
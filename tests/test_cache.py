@@ -0,0 +1,128 @@
+"""Tests for the on-disk result cache."""
+
+import os
+
+import pytest
+
+import demos.summing_methods
+from demos.cache import CACHE_ENV, ResultCache, cache_key, default_cache_path
+from demos.summing_methods import main
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "results.sqlite3"
+    monkeypatch.setenv(CACHE_ENV, str(path))
+    return path
+
+
+def _forbid_parsing(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("a cache hit parsed the input again")
+
+    monkeypatch.setattr(demos.summing_methods, "parse_cli_numbers", fail)
+    monkeypatch.setattr(demos.summing_methods, "iter_buffer_batches", fail)
+
+
+def test_result_cache_round_trips_json_values(cache_path):
+    with ResultCache() as cache:
+        cache.put("a", {"sum": 0.1, "count": 2**70, "values": [1, -2.5]})
+
+        assert cache.get("a") == {"sum": 0.1, "count": 2**70, "values": [1, -2.5]}
+        assert cache.get("b") is None
+    assert cache_path.exists()
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    with ResultCache(str(tmp_path / "cache.sqlite3"), max_bytes=30) as cache:
+        for key in "abc":
+            cache.put(key, key * 8)
+        cache.get("a")
+        cache.put("d", "d" * 8)
+
+        assert [cache.get(key) is not None for key in "abcd"] == [
+            True,
+            False,
+            True,
+            True,
+        ]
+
+
+def test_file_digest_is_reused_while_size_and_mtime_match(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+    with ResultCache(str(tmp_path / "cache.sqlite3")) as cache:
+        digest = cache.file_digest(path)
+        status = os.stat(path)
+        path.write_text("4 5 6\n")
+        os.utime(path, ns=(status.st_atime_ns, status.st_mtime_ns))
+
+        assert cache.file_digest(path) == digest
+        path.write_text("4 5 6 7\n")
+        assert cache.file_digest(path) != digest
+
+
+def test_cache_key_depends_on_every_part():
+    assert cache_key({"method": "fsum"}, "x") == cache_key({"method": "fsum"}, "x")
+    assert cache_key({"method": "fsum"}, "x") != cache_key({"method": "kahan"}, "x")
+
+
+def test_default_cache_path_uses_the_environment(monkeypatch):
+    monkeypatch.setenv(CACHE_ENV, "/tmp/custom.sqlite3")
+    assert default_cache_path() == "/tmp/custom.sqlite3"
+    monkeypatch.delenv(CACHE_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", "/var/cache/me")
+    assert default_cache_path() == "/var/cache/me/demos-summing/results.sqlite3"
+
+
+def test_cli_cache_hits_skip_parsing(tmp_path, monkeypatch, capsys, cache_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("0.1 0.2 0.3\n")
+    arguments = ["--file", str(path), "--float", "--method", "fsum", "--cache"]
+
+    assert main(arguments) == 0
+    assert main(["--cache", "--numbers", "1", "2"]) == 0
+    _forbid_parsing(monkeypatch)
+    assert main(arguments) == 0
+    assert main(["--cache", "--numbers", "1", "2"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 0.6\nSum: 3\n" * 2
+
+
+def test_cli_cache_keys_on_content_and_options(tmp_path, capsys, cache_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+
+    assert main(["--file", str(path), "--cache"]) == 0
+    path.write_text("1 2 3 4\n")
+    assert main(["--file", str(path), "--cache"]) == 0
+    assert main(["--file", str(path), "--cache", "--method", "fsum"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 6\nSum: 10\nSum: 10.0\n"
+
+
+def test_cli_cache_does_not_store_failures(tmp_path, capsys, cache_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 x\n")
+
+    for _ in range(2):
+        with pytest.raises(SystemExit):
+            main(["--file", str(path), "--cache"])
+
+    assert capsys.readouterr().err.count("'x' is not a valid whole number.") == 2
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--cache"], "--cache requires --numbers or --file."),
+        (["--cache", "--file", "x", "--resume"], "--cache cannot be combined"),
+        (["--cache", "--file", "missing.txt"], "cannot read 'missing.txt'"),
+    ],
+)
+def test_cli_cache_option_errors(capsys, cache_path, arguments, message):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
@@ -0,0 +1,172 @@
+"""Tests for checkpointed, resumable file summation."""
+
+import gzip
+import json
+import os
+
+import pytest
+
+import demos.checkpoint
+from demos.accumulate import BatchAccumulator
+from demos.checkpoint import checkpoint_path, read_checkpoint, sum_file_checkpointed
+from demos.summing_methods import SUM_METHODS, main
+
+FLOATS = [value * 0.1 for value in range(-2000, 5000)]
+INTEGERS = [value * 12345 for value in range(-2000, 5000)]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _interrupt_after(monkeypatch, writes):
+    write_checkpoint = demos.checkpoint.write_checkpoint
+    calls = []
+
+    def write_then_stop(path, state):
+        write_checkpoint(path, state)
+        calls.append(state["offset"])
+        if len(calls) == writes:
+            raise Interrupted
+
+    monkeypatch.setattr(demos.checkpoint, "write_checkpoint", write_then_stop)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "method, values",
+    [
+        ("fsum", FLOATS),
+        ("exact", FLOATS),
+        ("builtin", INTEGERS),
+        ("bigint", INTEGERS),
+    ],
+)
+def test_resumed_run_matches_an_uninterrupted_run(
+    tmp_path, monkeypatch, method, values
+):
+    text = " ".join(map(repr, values)) + "\n"
+    path = tmp_path / "numbers.txt"
+    path.write_text(text)
+    allow_float = values is FLOATS
+    options = dict(allow_float=allow_float, analyze=True, interval=4, chunk_size=4096)
+    expected = sum_file_checkpointed(path, method, **options).result()
+    assert expected["sum"] == SUM_METHODS[method](values)
+    calls = _interrupt_after(monkeypatch, 2)
+
+    with pytest.raises(Interrupted):
+        sum_file_checkpointed(path, method, **options)
+    monkeypatch.undo()
+    resumed = sum_file_checkpointed(path, method, resume=True, **options)
+
+    assert 0 < calls[-1] < len(text)
+    assert resumed.result() == expected
+    assert not os.path.exists(checkpoint_path(path))
+
+
+def test_checkpoint_records_offset_and_accumulator(tmp_path, monkeypatch):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3 4 5 6 7 8 9\n")
+    _interrupt_after(monkeypatch, 1)
+
+    with pytest.raises(Interrupted):
+        sum_file_checkpointed(path, interval=2, chunk_size=4)
+
+    state = read_checkpoint(checkpoint_path(path))
+    assert (state["offset"], state["batches"]) == (8, 2)
+    assert BatchAccumulator.from_dict(state["accumulator"]).total() == 10
+
+
+def test_resume_rejects_a_checkpoint_for_changed_input(tmp_path, monkeypatch):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3 4 5 6\n")
+    _interrupt_after(monkeypatch, 1)
+    with pytest.raises(Interrupted):
+        sum_file_checkpointed(path, interval=1, chunk_size=4)
+    monkeypatch.undo()
+    path.write_text("1 2 3 4 5 6 7\n")
+
+    with pytest.raises(ValueError, match="delete it to start over"):
+        sum_file_checkpointed(path, resume=True, interval=1, chunk_size=4)
+    with pytest.raises(ValueError, match="saved for another file or other"):
+        sum_file_checkpointed(path, "fsum", resume=True)
+
+
+@pytest.mark.parametrize(
+    "method, allow_float", [("builtin", True), ("kahan", True), ("kahan", False)]
+)
+def test_checkpoint_rejects_methods_that_depend_on_batching(
+    tmp_path, method, allow_float
+):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+
+    with pytest.raises(ValueError, match=f"checkpointing --method {method}"):
+        sum_file_checkpointed(path, method, allow_float)
+    assert not os.path.exists(checkpoint_path(path))
+
+
+def test_read_checkpoint_handles_missing_and_corrupt_files(tmp_path):
+    path = tmp_path / "numbers.txt.sum-checkpoint"
+
+    assert read_checkpoint(str(path)) is None
+    path.write_text('{"offset": ')
+    with pytest.raises(ValueError, match="is not a valid checkpoint"):
+        read_checkpoint(str(path))
+
+
+def test_checkpointed_summation_rejects_compressed_files(tmp_path):
+    path = tmp_path / "numbers.gz"
+    path.write_bytes(gzip.compress(b"1 2 3\n"))
+
+    with pytest.raises(ValueError, match="needs an uncompressed file"):
+        sum_file_checkpointed(path)
+
+
+def test_cli_resumes_from_a_checkpoint(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3 4 5 6 7 8 9 10\n")
+    status = os.stat(path)
+    state = {
+        "version": 1,
+        "size": status.st_size,
+        "mtime_ns": status.st_mtime_ns,
+        "method": "builtin",
+        "allow_float": False,
+        "analyze": False,
+        "chunk_size": 1 << 16,
+        "offset": 4,
+        "batches": 1,
+        "accumulator": {
+            "method": "builtin",
+            "count": 2,
+            "partials": [100],
+            "summary": None,
+        },
+    }
+    with open(checkpoint_path(path), "w") as file:
+        json.dump(state, file)
+
+    assert main(["--file", str(path), "--resume"]) == 0
+    assert main(["--file", str(path), "--checkpoint"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 152\nSum: 55\n"
+    assert not os.path.exists(checkpoint_path(path))
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--stdin", "--resume"], "--resume requires --file."),
+        (["--file", "x", "--checkpoint", "--pipeline"], "--checkpoint cannot"),
+        (["--file", "x", "--resume", "--columns", "1"], "--resume cannot"),
+        (["--file", "x", "--checkpoint", "--format", "f64"], "--checkpoint cannot"),
+        (["--file", "x", "--checkpoint", "--float"], "use one of fsum, exact."),
+    ],
+)
+def test_cli_checkpoint_option_errors(capsys, arguments, message):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
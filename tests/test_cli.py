@@ -1,8 +1,29 @@
 """Tests for the canonical lesson's one-shot command-line interface."""
 
+import functools
+import gzip
+import io
+import os
+import subprocess
+import sys
+import threading
+import warnings
+from pathlib import Path
+
 import pytest
 
-from demos.summing_methods import main, parse_cli_numbers
+from demos.summing_methods import (
+    iter_buffer_batches,
+    iter_stream_batches,
+    main,
+    parse_cli_numbers,
+)
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _set_stdin(monkeypatch, data: bytes) -> None:
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
 
 
 def test_cli_sums_exact_integers(capsys):
@@ -49,3 +70,163 @@ def test_parse_cli_numbers_returns_typed_values():
     """The parser is directly testable outside the argparse boundary."""
     assert parse_cli_numbers(["1", "2"], allow_float=False) == [1, 2]
     assert parse_cli_numbers(["1.5", "2"], allow_float=True) == [1.5, 2.0]
+
+
+def test_cli_streams_exact_integers_from_stdin(monkeypatch, capsys):
+    """Streaming mode keeps the exact-integer contract of --numbers."""
+    _set_stdin(monkeypatch, b"9007199254740993\n1\n")
+
+    assert main(["--stdin"]) == 0
+    assert capsys.readouterr().out == "Sum: 9007199254740994\n"
+
+
+def test_cli_streams_finite_floats_from_stdin(monkeypatch, capsys):
+    _set_stdin(monkeypatch, b"1.5 2.25\n")
+
+    assert main(["--stdin", "--float"]) == 0
+    assert capsys.readouterr().out == "Sum: 3.75\n"
+
+
+@pytest.mark.parametrize(
+    ("data", "arguments", "message"),
+    [
+        (b"1 2.5", ["--stdin"], "'2.5' is not a valid whole number"),
+        (b"1 inf", ["--stdin", "--float"], "'inf' is not a valid finite number"),
+        (b" \n", ["--stdin"], "--stdin requires at least one number"),
+    ],
+)
+def test_cli_stdin_reports_argparse_errors(monkeypatch, capsys, data, arguments, message):
+    _set_stdin(monkeypatch, data)
+
+    with pytest.raises(SystemExit) as error:
+        main(arguments)
+
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_stdin_cannot_be_combined_with_numbers(capsys):
+    with pytest.raises(SystemExit) as error:
+        main(["--stdin", "--numbers", "1"])
+
+    assert error.value.code == 2
+    assert "--stdin cannot be combined with --numbers" in capsys.readouterr().err
+
+
+def test_stream_batches_rejoin_tokens_split_across_chunks():
+    """Tokens cut by a chunk boundary are carried into the next read."""
+    stream = io.BytesIO(b"12 345\n6789 10")
+
+    batches = list(iter_stream_batches(stream, chunk_size=4))
+
+    assert [number for batch in batches for number in batch] == [12, 345, 6789, 10]
+    assert max(len(batch) for batch in batches) <= 2
+
+
+def test_cli_sums_memory_mapped_file(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(b"9007199254740993\n1\n")
+
+    assert main(["--file", str(path)]) == 0
+    assert capsys.readouterr().out == "Sum: 9007199254740994\n"
+
+
+def test_cli_numpy_float_overflow_keeps_stderr_clean(capsys):
+    pytest.importorskip("numpy")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert main(["--method", "numpy", "--float", "--numbers", "1e308", "1e308"]) == 0
+
+    assert capsys.readouterr() == ("Sum: inf\n", "")
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+@pytest.mark.parametrize("data", [b"1 2\n3\n", gzip.compress(b"1 2\n3\n")])
+def test_cli_sums_a_named_pipe(tmp_path, capsys, data):
+    path = tmp_path / "numbers"
+    os.mkfifo(path)
+    writer = threading.Thread(target=path.write_bytes, args=(data,))
+    writer.start()
+
+    assert main(["--file", str(path)]) == 0
+    writer.join()
+    assert capsys.readouterr().out == "Sum: 6\n"
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b"", "--file requires at least one number"),
+        (b"1 nan\n", "'nan' is not a valid finite number"),
+    ],
+)
+def test_cli_file_reports_argparse_errors(tmp_path, capsys, data, message):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(data)
+
+    with pytest.raises(SystemExit) as error:
+        main(["--float", "--file", str(path)])
+
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_cli_reports_unreadable_file(tmp_path, capsys):
+    with pytest.raises(SystemExit) as error:
+        main(["--file", str(tmp_path / "missing.txt")])
+
+    assert error.value.code == 2
+    assert "cannot read" in capsys.readouterr().err
+
+
+def test_buffer_batches_extend_past_tokens_longer_than_a_chunk():
+    buffer = b"1 " + b"9" * 10 + b" 2"
+
+    batches = list(iter_buffer_batches(buffer, chunk_size=4))
+
+    assert [number for batch in batches for number in batch] == [1, 9_999_999_999, 2]
+
+
+def test_parse_cli_numbers_accepts_byte_tokens():
+    """Byte tokens keep the str contract, including non-ASCII digits."""
+    assert parse_cli_numbers([b"7", "\u0663".encode()]) == [7, 3]
+    with pytest.raises(ValueError, match="'x' is not a valid whole number"):
+        parse_cli_numbers([b"x"])
+
+
+@pytest.mark.parametrize(
+    ("tokens", "allow_float", "message"),
+    [
+        (["1", "2", "x", "y"], False, "'x' is not a valid whole number"),
+        (["1.5", "1e999", "nan"], True, "'1e999' is not a valid finite number"),
+        ([b"1", b"-inf", b"2"], True, "'-inf' is not a valid finite number"),
+    ],
+)
+def test_bulk_parse_reports_first_bad_token(tokens, allow_float, message):
+    with pytest.raises(ValueError, match=message):
+        parse_cli_numbers(tokens, allow_float)
+
+
+def test_parse_cli_numbers_reads_an_iterator_once():
+    """A generator is not truncated by the bulk pass before the token-by-token one."""
+    assert parse_cli_numbers(token for token in ["1", "2", "3"]) == [1, 2, 3]
+    with pytest.raises(ValueError, match="'x' is not a valid whole number"):
+        parse_cli_numbers(token for token in ["1", "x", "3"])
+
+
+@pytest.mark.parametrize(
+    "entry", [["demos/summing_methods.py"], ["-m", "demos.summing_methods"]]
+)
+def test_cli_runs_as_a_script_and_as_a_module(tmp_path, entry):
+    """Options that import other ``demos`` modules work from either entry point."""
+    path = tmp_path / "numbers.txt.gz"
+    path.write_bytes(gzip.compress(b"1 2 3\n"))
+    run = functools.partial(
+        subprocess.run, cwd=REPOSITORY_ROOT, capture_output=True, check=True
+    )
+
+    from_file = run([sys.executable, *entry, "--file", str(path)])
+    from_stdin = run([sys.executable, *entry, "--stdin"], input=b"4 5\n")
+
+    assert (from_file.stdout, from_stdin.stdout) == (b"Sum: 6\n", b"Sum: 9\n")
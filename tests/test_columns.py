@@ -0,0 +1,112 @@
+"""Tests for summing columns of delimited input."""
+
+import io
+
+import pytest
+
+from demos.columns import (
+    column_labels,
+    default_delimiter,
+    resolve_columns,
+    sum_columns,
+)
+from demos.summing_methods import main
+
+LEDGER = "item,cents,adjustment\nrent,120000,0.5\n\nfood,4599,-0.25\nbus,250,0\n"
+
+
+def _totals(accumulators):
+    return {label: accumulator.total() for label, accumulator in accumulators.items()}
+
+
+def test_sum_columns_reads_every_selected_column_in_one_pass():
+    lines = io.StringIO(LEDGER)
+
+    accumulators = sum_columns(lines, ["cents", "3"], allow_float=True)
+
+    assert _totals(accumulators) == {"cents": 124849.0, "adjustment": 0.25}
+    assert lines.read() == ""
+
+
+def test_sum_columns_uses_positions_without_a_header():
+    accumulators = sum_columns(["1\t2\t3", "4\t5\t6"], ["3", "1"], delimiter="\t")
+
+    assert _totals(accumulators) == {"column 3": 9, "column 1": 5}
+
+
+def test_sum_columns_keeps_columns_that_share_a_name_apart():
+    lines = ["x,x,y", "1,10,100", "2,20,200"]
+
+    accumulators = sum_columns(lines, ["x", "2", "1", "y"])
+
+    assert _totals(accumulators) == {"x (column 1)": 3, "x (column 2)": 30, "y": 300}
+    assert column_labels(["a"], [0, 2]) == ["a", "column 3"]
+
+
+def test_sum_columns_batches_rows_and_analyzes_each_column():
+    lines = [f"{value},{-value}" for value in range(1, 11)]
+
+    accumulators = sum_columns(lines, ["1", "2"], analyze=True, batch_rows=3)
+
+    analysis = accumulators["column 2"].summary.result()
+    assert accumulators["column 1"].total() == 55
+    assert (analysis["negative_count"], analysis["minimum"]) == (10, -10)
+
+
+@pytest.mark.parametrize(
+    "selectors, lines, message",
+    [
+        (["price"], ["item,cents", "a,1"], "no column is named 'price'"),
+        (["0"], ["1,2"], "column positions start at 1"),
+        (["2"], ["1,2", "3"], "a row has 1 columns; column 2 was requested"),
+        (["cents"], ["item,cents", "a,x"], "column 'cents': 'x' is not a valid"),
+        (["2"], ["1,1.5"], "column 2: '1.5' is not a valid whole number"),
+    ],
+)
+def test_sum_columns_reports_bad_selections_and_cells(selectors, lines, message):
+    with pytest.raises(ValueError, match=message):
+        sum_columns(lines, selectors)
+
+
+def test_resolve_columns_and_default_delimiter():
+    assert resolve_columns(["2", "b"], ["a", "b"]) == [1, 1]
+    assert default_delimiter("data.TSV") == "\t"
+    assert default_delimiter(None) == default_delimiter("data.csv") == ","
+
+
+def test_cli_sums_file_columns_with_analysis(tmp_path, capsys):
+    path = tmp_path / "ledger.csv"
+    path.write_text(LEDGER)
+
+    assert main(["--file", str(path), "--columns", "cents", "--analyze"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Sum of cents: 124849"
+    assert "  Minimum: 250" in lines
+
+
+def test_cli_sums_stdin_columns_with_tab_delimiter(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("1\t2\n3\t4\n"))
+
+    assert main(["--stdin", "--columns", "2", "1", "--delimiter", "\\t"]) == 0
+
+    assert capsys.readouterr().out == "Sum of column 2: 6\nSum of column 1: 4\n"
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--columns", "1", "--numbers", "1"], "--columns requires --stdin or --file."),
+        (["--stdin", "--analyze"], "--analyze requires --columns."),
+        (["--stdin", "--columns", "1", "--delimiter", ";;"], "single character"),
+        (["--stdin", "--columns", "1"], "--stdin requires at least one number."),
+    ],
+)
+def test_cli_column_option_errors(monkeypatch, capsys, arguments, message):
+    monkeypatch.setattr("sys.stdin", io.StringIO(""))
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
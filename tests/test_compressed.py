@@ -0,0 +1,100 @@
+"""Tests for reading gzip, bz2, xz and zstd compressed input."""
+
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from demos.compressed import detect_compression, is_compressed, open_decompressed
+from demos.summing_methods import main
+
+NUMBERS = b"".join(b"%d\n" % value for value in range(1, 1001))
+
+
+def _zstd(data):
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSORS = {
+    "gzip": gzip.compress,
+    "bz2": bz2.compress,
+    "xz": lzma.compress,
+    "zstd": _zstd,
+}
+
+
+@pytest.mark.parametrize("name", COMPRESSORS)
+def test_open_decompressed_detects_each_format(name):
+    data = COMPRESSORS[name](NUMBERS)
+
+    assert detect_compression(data[:8]) == name
+    assert open_decompressed(io.BytesIO(data)).read() == NUMBERS
+
+
+def test_open_decompressed_returns_plain_streams_unread():
+    stream = io.BufferedReader(io.BytesIO(NUMBERS))
+
+    assert open_decompressed(stream) is stream
+    assert stream.read() == NUMBERS
+    assert detect_compression(b"") is None
+
+
+def test_open_decompressed_reads_every_gzip_member():
+    data = gzip.compress(b"1 2 ") + gzip.compress(b"3\n")
+
+    assert open_decompressed(io.BytesIO(data)).read() == b"1 2 3\n"
+
+
+def test_open_decompressed_reports_truncated_data():
+    stream = open_decompressed(io.BytesIO(gzip.compress(NUMBERS)[:-20]))
+
+    with pytest.raises(ValueError, match="cannot decompress gzip input"):
+        stream.read()
+
+
+@pytest.mark.parametrize("name", COMPRESSORS)
+def test_cli_sums_compressed_files(tmp_path, capsys, name):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(COMPRESSORS[name](NUMBERS))
+
+    assert is_compressed(path)
+    assert main(["--file", str(path)]) == 0
+
+    assert capsys.readouterr().out == "Sum: 500500\n"
+
+
+def test_cli_sums_compressed_stdin(monkeypatch, capsys):
+    stdin = io.TextIOWrapper(io.BytesIO(bz2.compress(NUMBERS)))
+    monkeypatch.setattr("sys.stdin", stdin)
+
+    assert main(["--stdin", "--method", "fsum"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 500500.0\n"
+
+
+def test_cli_sums_compressed_columns_and_binary_input(tmp_path, capsys):
+    csv_path = tmp_path / "ledger.csv.gz"
+    csv_path.write_bytes(gzip.compress(b"item,cents\nrent,1200\nbus,250\n"))
+    raw_path = tmp_path / "values.i64.xz"
+    raw_path.write_bytes(lzma.compress((7).to_bytes(8, "little") * 3))
+
+    assert main(["--file", str(csv_path), "--columns", "cents"]) == 0
+    assert main(["--file", str(raw_path), "--format", "i64"]) == 0
+
+    assert capsys.readouterr().out == "Sum of cents: 1450\nSum: 21\n"
+
+
+def test_cli_rejects_workers_for_compressed_files(tmp_path, capsys):
+    path = tmp_path / "numbers.gz"
+    path.write_bytes(gzip.compress(NUMBERS))
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", str(path), "--workers", "2"])
+
+    assert exc_info.value.code == 2
+    assert "compressed files cannot be split across workers." in (
+        capsys.readouterr().err
+    )
@@ -0,0 +1,167 @@
+"""Tests for the persistent daemon and its thin forwarding client."""
+
+import io
+import json
+import socket
+import threading
+
+import pytest
+
+import demos.client
+from demos.client import _reads_stdin_file, forward
+from demos.daemon import make_server
+from demos.summing_methods import main
+
+
+@pytest.fixture
+def daemon_path(tmp_path):
+    path = str(tmp_path / "sum.sock")
+    server = make_server(path)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def _forward(argv, path, stdin_bytes=b""):
+    stdin = io.TextIOWrapper(io.BytesIO(stdin_bytes))
+    stdout, stderr = io.StringIO(), io.StringIO()
+    code = forward(argv, path, stdin, stdout, stderr)
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--numbers", "9007199254740993", "1"],
+        ["--float", "--method", "fsum", "--numbers", "0.1", "0.2"],
+        ["--numbers", "1.5"],
+        ["--float", "--numbers", "nan"],
+        ["--float"],
+    ],
+)
+def test_daemon_matches_in_process_stdout_and_exit_status(daemon_path, capsys, argv):
+    try:
+        expected_code = main(argv)
+    except SystemExit as error:
+        expected_code = error.code
+    expected = capsys.readouterr()
+
+    code, out, err = _forward(argv, daemon_path)
+
+    assert (code, out, err) == (expected_code, expected.out, expected.err)
+
+
+def test_daemon_streams_forwarded_stdin(daemon_path):
+    code, out, _ = _forward(["--stdin"], daemon_path, b"1 2\n3\n")
+
+    assert (code, out) == (0, "Sum: 6\n")
+
+
+def test_daemon_resolves_files_from_the_client_directory(
+    daemon_path, tmp_path, monkeypatch
+):
+    (tmp_path / "numbers.txt").write_text("4 5 6\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert _forward(["--file", "numbers.txt"], daemon_path)[:2] == (0, "Sum: 15\n")
+
+
+def _raw_request(path, data):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(data)
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile("rb") as replies:
+            return replies.readline()
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (b"not json\n", "invalid request header"),
+        (b'["--numbers", "1"]\n', "JSON object with an argv list"),
+        (b'{"argv": ["--numbers", "1"], "cwd": "/no/such/dir"}\n', "cannot change"),
+    ],
+)
+def test_daemon_answers_malformed_requests(daemon_path, data, message):
+    reply = json.loads(_raw_request(daemon_path, data))
+
+    assert reply["code"] == 1
+    assert message in reply["stderr"]
+    assert _forward(["--numbers", "1", "2"], daemon_path)[:2] == (0, "Sum: 3\n")
+
+
+def test_daemon_ignores_connections_without_a_request(daemon_path, capsys):
+    assert _raw_request(daemon_path, b"") == b""
+    assert _forward(["--numbers", "4"], daemon_path)[:2] == (0, "Sum: 4\n")
+    assert "Traceback" not in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["--numbers", "1"], (None, "")),
+        (["--stdin"], (1, "the summing daemon did not send a valid reply.\n")),
+    ],
+)
+def test_forward_handles_a_daemon_that_closes_without_replying(
+    tmp_path, argv, expected
+):
+    path = str(tmp_path / "mute.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()
+
+    def accept_and_close():
+        connection, _ = listener.accept()
+        connection.close()
+
+    thread = threading.Thread(target=accept_and_close)
+    thread.start()
+    with listener:
+        code, _, err = _forward(argv, path, b"1 2\n")
+        thread.join()
+
+    assert (code, err) == expected
+
+
+def test_forward_refuses_a_socket_served_by_another_user(daemon_path, monkeypatch):
+    uid = demos.client.os.getuid()
+    monkeypatch.setattr(demos.client.os, "getuid", lambda: uid + 1)
+
+    code, out, err = _forward(["--numbers", "1"], daemon_path)
+
+    assert (code, out) == (None, "")
+    assert err == f"ignoring {daemon_path}: it is served by another user.\n"
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["--file", "/dev/stdin"], True),
+        (["--float", "--file=/dev/fd/0"], True),
+        (["--file", "numbers.txt"], False),
+        (["--numbers", "--file", "/dev/stdin"], False),
+    ],
+)
+def test_client_runs_stdin_file_paths_in_process(argv, expected):
+    assert _reads_stdin_file(argv) is expected
+
+
+def test_cli_rejects_abbreviated_options(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--stdi"])
+
+    assert exc_info.value.code == 2
+    assert "unrecognized arguments: --stdi" in capsys.readouterr().err
+
+
+def test_forward_reports_missing_daemon(tmp_path):
+    assert forward(["--numbers", "1"], str(tmp_path / "absent.sock")) is None
+
+
+def test_make_server_refuses_a_live_socket(daemon_path):
+    with pytest.raises(OSError, match="already listening"):
+        make_server(daemon_path)
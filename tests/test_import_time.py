@@ -0,0 +1,58 @@
+"""Startup-cost budget for importing the canonical lesson as a library."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative microseconds reported by ``-X importtime`` for the lesson module.
+# Deferring the CLI imports brought this to a few milliseconds; the budget
+# leaves headroom for slow or loaded machines while still catching a return
+# to importing argparse and typing eagerly.
+IMPORT_BUDGET_US = 25_000
+DEFERRED_MODULES = {"argparse", "typing", "functools", "mmap", "re"}
+
+
+def _import_times(module: str) -> dict:
+    """Return ``{module: cumulative microseconds}`` for a fresh import."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPOSITORY_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_library_import_skips_cli_dependencies():
+    """Importing the lesson leaves argparse, typing and mmap unloaded."""
+    times = _import_times("demos.summing_methods")
+    assert "demos.summing_methods" in times
+    assert DEFERRED_MODULES.isdisjoint(times)
+
+
+def test_library_import_stays_within_budget():
+    """The best of three fresh imports fits the startup budget."""
+    best = min(
+        _import_times("demos.summing_methods")["demos.summing_methods"]
+        for _ in range(3)
+    )
+    assert best < IMPORT_BUDGET_US
+
+
+def test_cli_still_works_after_deferred_imports(capsys):
+    """The deferred argparse import is loaded on demand by ``main``."""
+    from demos.summing_methods import main, sum_reduce
+
+    assert sum_reduce([1, 2, 3]) == 6
+    assert main(["--numbers", "1", "2"]) == 0
+    assert capsys.readouterr().out == "Sum: 3\n"
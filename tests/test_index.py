@@ -0,0 +1,174 @@
+"""Tests for the prefix-sum range index."""
+
+import math
+import os
+import random
+
+import pytest
+
+from demos.index import RangeIndex, build_index, index_path
+from demos.summing_methods import main
+
+
+def _write(path, values):
+    path.write_text("\n".join(map(repr, values)) + "\n")
+
+
+def _summary(values, math_sum):
+    return {
+        "total": math_sum(values),
+        "positive_sum": math_sum(value for value in values if value > 0),
+        "negative_sum": math_sum(value for value in values if value < 0),
+        "positive_count": sum(1 for value in values if value > 0),
+        "negative_count": sum(1 for value in values if value < 0),
+        "zero_count": sum(1 for value in values if value == 0),
+        "mean": math_sum(values) / len(values) if values else None,
+        "minimum": min(values, default=None),
+        "maximum": max(values, default=None),
+    }
+
+
+def test_integer_range_sums_and_summaries_are_exact(tmp_path):
+    rng = random.Random(3)
+    values = [rng.randint(-(2**62), 2**62) for _ in range(700)] + [0, 0, 2**63 - 1]
+    path = tmp_path / "numbers.txt"
+    _write(path, values)
+
+    assert build_index(path, block_size=16) == (703, 44)
+    with RangeIndex(path) as index:
+        for _ in range(300):
+            start = rng.randint(0, len(values))
+            stop = rng.randint(start, len(values))
+            assert index.sum(start, stop) == sum(values[start:stop])
+            assert index.summary(start, stop) == _summary(values[start:stop], sum)
+        assert index.sum() == sum(values)
+
+
+def test_float_range_sums_are_correctly_rounded(tmp_path):
+    rng = random.Random(8)
+    values = [rng.uniform(-1, 1) * 10.0 ** rng.randint(-12, 12) for _ in range(900)]
+    path = tmp_path / "numbers.txt"
+    _write(path, values)
+
+    build_index(path, allow_float=True, block_size=32)
+    with RangeIndex(path) as index:
+        for _ in range(300):
+            start = rng.randint(0, len(values))
+            stop = rng.randint(start, len(values))
+            assert index.sum(start, stop) == math.fsum(values[start:stop])
+        assert index.summary(5, 600) == _summary(values[5:600], math.fsum)
+
+
+def test_float_range_sums_stay_correct_after_a_dominant_value(tmp_path):
+    values = [1e30, 1.2345678e13] + [0.1] * 5000 + [-1e30, 2.5]
+    path = tmp_path / "numbers.txt"
+    _write(path, values)
+
+    build_index(path, allow_float=True)
+    with RangeIndex(path) as index:
+        for start, stop in [(1024, 4096), (2, 5000), (0, 5003), (3000, 5004)]:
+            assert index.sum(start, stop) == math.fsum(values[start:stop])
+        assert index.summary(1024, 5004) == _summary(values[1024:], math.fsum)
+
+
+def test_block_offsets_follow_tokens_across_read_chunks(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("  1\t2\n\n3   4 5\n" * 20_000)
+
+    count, blocks = build_index(path, block_size=1000)
+
+    assert (count, blocks) == (100_000, 100)
+    with RangeIndex(path) as index:
+        assert index.sum(1, 99_999) == 300_000 - 1 - 5
+        assert index.summary(2, 4)["minimum"] == 3
+
+
+def test_range_index_rejects_missing_stale_and_bad_input(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+
+    with pytest.raises(ValueError, match="has no index; build one first"):
+        RangeIndex(path)
+    build_index(path)
+    with RangeIndex(path) as index:
+        with pytest.raises(ValueError, match="outside the 3 indexed values"):
+            index.sum(2, 4)
+    path.write_text("1 2 3 4\n")
+    with pytest.raises(ValueError, match="is out of date; rebuild it"):
+        RangeIndex(path)
+    build_index(path)
+    with open(index_path(path), "r+b") as file:
+        file.write(b"SUMIDX1\0")
+    with pytest.raises(ValueError, match="not a current range index; rebuild it"):
+        RangeIndex(path)
+    path.write_text(f"{2**64}\n")
+    with pytest.raises(ValueError, match="does not fit in a 64-bit index"):
+        build_index(path)
+
+
+def test_empty_file_index_answers_empty_ranges(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+
+    assert build_index(path) == (0, 0)
+    with RangeIndex(path) as index:
+        assert index.sum() == 0
+        assert index.summary()["minimum"] is None
+
+
+def test_cli_builds_an_index_and_answers_ranges(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_text(" ".join(str(value) for value in range(-5, 2000)) + "\n")
+
+    assert main(["--file", str(path), "--build-index"]) == 0
+    assert main(["--file", str(path), "--range", "1", "10"]) == 0
+    assert main(["--file", str(path), "--range", "3", "7", "--analyze"]) == 0
+
+    assert capsys.readouterr().out == (
+        f"Indexed 2005 numbers in 2 blocks: {index_path(path)}\n"
+        "Sum: -5\n"
+        "Sum: -5\n"
+        "  Positive: 1 (sum: 1)\n"
+        "  Negative: 3 (sum: -6)\n"
+        "  Zeros: 1\n"
+        "  Mean: -1.0\n"
+        "  Minimum: -3\n"
+        "  Maximum: 1\n"
+    )
+    assert os.path.exists(index_path(path))
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--stdin", "--build-index"], "--build-index requires --file."),
+        (["--file", "x", "--range", "1", "2", "--workers", "2"], "--range cannot"),
+        (["--file", "x", "--build-index", "--range", "1", "2"], "--build-index cannot"),
+        (
+            ["--file", "x", "--range", "1", "2", "--method", "fsum"],
+            "--range cannot be combined with --method.",
+        ),
+        (
+            ["--file", "x", "--build-index", "--delimiter", ","],
+            "--build-index cannot be combined with --delimiter.",
+        ),
+        (["--file", "x", "--range", "1", "2"], "'x' has no index; build one first."),
+    ],
+)
+def test_cli_index_option_errors(capsys, arguments, message):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_cli_rejects_ranges_outside_the_index(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+    build_index(path)
+
+    with pytest.raises(SystemExit):
+        main(["--file", str(path), "--range", "2", "4"])
+
+    assert "--range must lie within the 3 indexed numbers." in capsys.readouterr().err
@@ -0,0 +1,114 @@
+"""Tests for process-parallel summation over sequences and file ranges."""
+
+import math
+import mmap
+import os
+
+import pytest
+
+from demos.parallel import (
+    _next_token_boundary,
+    file_shards,
+    sum_file_parallel,
+    sum_parallel,
+)
+from demos.summing_methods import main, sum_exact
+
+
+def test_sum_parallel_keeps_big_integers_exact():
+    values = [2**80 + index for index in range(40)]
+
+    assert sum_parallel(values, workers=2, min_shard_size=10) == sum(values)
+
+
+def test_sum_parallel_fsum_matches_math_fsum():
+    values = [1e16, 1.0, -1e16, 0.1] * 25
+
+    result = sum_parallel(values, workers=3, method="fsum", min_shard_size=10)
+
+    assert result == math.fsum(values)
+
+
+def test_sum_parallel_exact_matches_sum_exact_for_mixed_values():
+    values = [10**30, 0.1, -(10**30), 3] * 25
+
+    result = sum_parallel(values, workers=3, method="exact", min_shard_size=10)
+
+    assert result == sum_exact(values)
+    big = [2**80, 1] * 20
+    assert sum_parallel(big, workers=2, method="exact", min_shard_size=10) == sum(big)
+
+
+def test_sum_parallel_runs_small_inputs_in_process():
+    assert sum_parallel([1, 2, 3], workers=4) == 6
+
+
+def test_sum_parallel_rejects_unknown_methods():
+    with pytest.raises(ValueError, match="not a summation method"):
+        sum_parallel([1], method="median")
+
+
+def test_file_shards_split_on_token_boundaries(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(b"111 222 333 444 555")
+
+    shards = file_shards(path, 3)
+    data = path.read_bytes()
+
+    assert [data[start:stop].split() for start, stop in shards] == [
+        [b"111", b"222"],
+        [b"333"],
+        [b"444", b"555"],
+    ]
+
+
+def test_token_boundary_search_crosses_windows(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(b"1" * 50 + b"\t2\x0c3 4" + b"5" * 30)
+
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            boundaries = [
+                _next_token_boundary(mapped, position, window=8)
+                for position in (10, 50, 53, 56)
+            ]
+
+    assert boundaries == [51, 51, 55, 86]
+
+
+def test_sum_file_parallel_matches_sequential_sum(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text(" ".join(str(10**30 + index) for index in range(500)))
+
+    assert sum_file_parallel(path, workers=3) == sum(10**30 + i for i in range(500))
+
+
+def test_cli_file_workers(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_text("0.5 0.25 0.125\n1e16 -1e16\n")
+
+    assert main(["--float", "--file", str(path), "--workers", "2"]) == 0
+    assert capsys.readouterr().out == "Sum: 0.875\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_cli_workers_reject_a_named_pipe(tmp_path, capsys):
+    """A pipe has no size to split, so it is not mistaken for an empty file."""
+    path = tmp_path / "numbers"
+    os.mkfifo(path)
+
+    with pytest.raises(SystemExit) as error:
+        main(["--file", str(path), "--workers", "2"])
+
+    assert error.value.code == 2
+    assert "only regular files can be split across workers." in (
+        capsys.readouterr().err
+    )
+
+
+def test_cli_workers_require_file(capsys):
+    with pytest.raises(SystemExit) as error:
+        main(["--workers", "2", "--numbers", "1"])
+
+    assert error.value.code == 2
+    assert "--workers requires --file" in capsys.readouterr().err
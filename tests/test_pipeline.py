@@ -0,0 +1,121 @@
+"""Tests for the threaded reader, parser and summing pipeline."""
+
+import gzip
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from demos.pipeline import iter_pipelined_batches, sum_pipelined
+from demos.summing_methods import (
+    get_sum_method,
+    iter_stream_batches,
+    main,
+    sum_stream,
+)
+
+DATA = b" ".join(b"%d.25" % value for value in range(-500, 2000)) + b"\n"
+
+
+def _pipeline_threads():
+    return [
+        thread
+        for thread in threading.enumerate()
+        if thread.name in ("sum-reader", "sum-parser")
+    ]
+
+
+@pytest.mark.parametrize("method", ["builtin", "fsum", "kahan", "exact"])
+def test_sum_pipelined_matches_the_serial_stream(method):
+    pipelined = sum_pipelined(io.BytesIO(DATA), method, True, chunk_size=7, depth=2)
+
+    serial = iter_stream_batches(io.BytesIO(DATA), True, chunk_size=7)
+    assert pipelined == sum_stream(serial, get_sum_method(method))
+
+
+def test_iter_pipelined_batches_yields_the_serial_batches():
+    pipelined = iter_pipelined_batches(io.BytesIO(DATA), True, chunk_size=7)
+
+    assert list(pipelined) == list(iter_stream_batches(io.BytesIO(DATA), True, 7))
+
+
+def test_sum_pipelined_returns_none_for_empty_input():
+    assert sum_pipelined(io.BytesIO(b" \n")) is None
+
+
+def test_sum_pipelined_raises_parse_errors_and_stops_its_threads():
+    data = b"1 2 " * 10_000 + b"x " + b"3 " * 10_000
+
+    with pytest.raises(ValueError, match="'x' is not a valid whole number."):
+        sum_pipelined(io.BytesIO(data), chunk_size=16, depth=1)
+
+    assert _pipeline_threads() == []
+
+
+def test_parse_errors_on_a_live_pipe_do_not_wait_for_the_writer():
+    read_end, write_end = os.pipe()
+    os.write(write_end, b"1 2 x ")
+    try:
+        with open(read_end, "rb", buffering=0) as stream:
+            started = time.monotonic()
+            with pytest.raises(ValueError, match="'x' is not a valid whole"):
+                sum_pipelined(stream, chunk_size=16)
+            assert time.monotonic() - started < 5
+    finally:
+        # The abandoned reader finishes once the writer closes the pipe.
+        os.close(write_end)
+        for thread in _pipeline_threads():
+            thread.join(5)
+
+    assert _pipeline_threads() == []
+
+
+def test_closing_pipelined_batches_early_stops_its_threads():
+    batches = iter_pipelined_batches(io.BytesIO(b"1 " * 100_000), chunk_size=8)
+
+    assert next(batches) == [1, 1, 1, 1]
+    batches.close()
+
+    assert _pipeline_threads() == []
+
+
+def test_sum_pipelined_reraises_read_errors():
+    class BrokenStream(io.RawIOBase):
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            raise OSError(5, "Input/output error")
+
+    with pytest.raises(OSError, match="Input/output error"):
+        sum_pipelined(BrokenStream())
+
+
+def test_cli_pipeline_sums_compressed_files_and_stdin(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "numbers.gz"
+    path.write_bytes(gzip.compress(b"1 2 3\n" * 1000))
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"4 5\n6\n")))
+
+    assert main(["--file", str(path), "--pipeline"]) == 0
+    assert main(["--stdin", "--pipeline", "--method", "fsum"]) == 0
+
+    assert capsys.readouterr().out == "Sum: 6000\nSum: 15.0\n"
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--pipeline"], "--pipeline requires --stdin or --file."),
+        (["--file", "x", "--pipeline", "--workers", "2"], "--pipeline cannot"),
+        (["--stdin", "--pipeline", "--columns", "1"], "--pipeline cannot"),
+        (["--stdin", "--pipeline", "--format", "f64"], "--pipeline cannot"),
+    ],
+)
+def test_cli_pipeline_option_errors(capsys, arguments, message):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
@@ -0,0 +1,78 @@
+"""Tests for the cProfile and tracemalloc summation profiler."""
+
+import tracemalloc
+
+import pytest
+
+from demos.profiling import profile_summation
+from demos.summing_methods import main, sum_reduce
+
+
+def _retain_numbers(count):
+    return [float(number) for number in range(count)]
+
+
+def test_profile_records_calls_peak_and_held_allocations():
+    with profile_summation() as profile:
+        held = _retain_numbers(50_000)
+        assert sum_reduce(held) == sum(range(50_000))
+
+    functions = {name for _, _, name in profile.stats.stats}
+    lines = [allocation.traceback[0].lineno for allocation in profile.allocations]
+    assert {"sum_reduce", "_retain_numbers"} <= functions
+    assert profile.peak_bytes >= 50_000 * 24
+    assert _retain_numbers.__code__.co_firstlineno + 1 in lines[:3]
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_leaves_existing_tracing_running():
+    tracemalloc.start()
+    try:
+        with profile_summation() as profile:
+            _retain_numbers(1000)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    assert profile.peak_bytes > 0
+
+
+def test_profile_report_lists_peak_allocations_and_calls():
+    with profile_summation() as profile:
+        sum_reduce(_retain_numbers(1000))
+
+    report = profile.format(limit=3, input_size=1000)
+
+    assert report.startswith("Peak traced memory: ")
+    assert "x the 1,000-byte input)\nTop allocations still held:\n" in report
+    assert "Ordered by: cumulative time" in report
+    assert "(sum_reduce)" in report
+
+
+def test_cli_writes_the_profile_to_stderr(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_text("0.5 1.5 2\n")
+
+    assert main(["--file", str(path), "--float", "--method", "kahan", "--profile"]) == 0
+
+    captured = capsys.readouterr()
+    assert captured.out == "Sum: 4.0\n"
+    assert "x the 10-byte input)" in captured.err
+    assert "(_summing_main)" in captured.err
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--profile"], "--profile requires --numbers, --stdin or --file."),
+        (["--profile", "--file", "x", "--workers", "2"], "--profile cannot be"),
+        (["--profile", "--file", "missing.txt"], "cannot read 'missing.txt'"),
+        (["--profile", "--cache", "--file", "x"], "--cache cannot be combined"),
+    ],
+)
+def test_cli_profile_option_errors(capsys, arguments, message):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
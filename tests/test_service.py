@@ -0,0 +1,90 @@
+"""Tests for the asyncio summation service."""
+
+import asyncio
+import json
+import math
+
+import pytest
+
+from demos.accumulate import BatchAccumulator
+from demos.service import start_server
+from demos.summing_methods import sum_exact
+
+
+async def _exchange(payload: bytes, **defaults) -> dict:
+    server = await start_server(port=0, **defaults)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(payload)
+        await writer.drain()
+        writer.write_eof()
+        reply = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+    return json.loads(reply)
+
+
+def test_service_sums_exact_integers():
+    reply = asyncio.run(_exchange(b"9007199254740993\n1\n"))
+
+    assert reply == {"count": 2, "sum": 9007199254740994}
+
+
+def test_service_options_line_selects_method_and_analysis():
+    payload = b'{"method": "fsum", "float": true, "analyze": true}\n1e16 1\n-1e16\n'
+
+    reply = asyncio.run(_exchange(payload))
+
+    assert reply["sum"] == 1.0
+    assert reply["analysis"]["positive_count"] == 2
+    assert reply["analysis"]["positive"] is None
+
+
+def test_service_streams_large_uploads_across_chunks():
+    payload = b"\n".join(str(index).encode() for index in range(100_000))
+
+    reply = asyncio.run(_exchange(payload, method="reduce"))
+
+    assert reply == {"count": 100_000, "sum": sum(range(100_000))}
+
+
+@pytest.mark.parametrize(
+    ("payload", "message"),
+    [
+        (b"1 2.5\n", "'2.5' is not a valid whole number"),
+        (b"", "at least one number"),
+        (b'{"method": "median"}\n1\n', "not a summation method"),
+        (b'{"method": ["fsum"]}\n1\n', "'method' option must be a str"),
+        (b'{"float": "yes"}\n1\n', "'float' option must be a bool"),
+        (b'{"method": "fsum", "float": true}\n1e308 1e308\n', "out of range"),
+        (b'{"float": true}\n1e308 1e308\n', "out of range (float overflow)"),
+        (b'{"method": "kahan", "float": true}\n-1e308 -1e308\n', "out of range"),
+    ],
+)
+def test_service_reports_errors_as_json(payload, message):
+    reply = asyncio.run(_exchange(payload))
+
+    assert message in reply["error"]
+
+
+def test_batch_accumulator_folds_pending_partials(monkeypatch):
+    monkeypatch.setattr("demos.accumulate.MAX_PENDING_PARTIALS", 3)
+    accumulator = BatchAccumulator("fsum")
+    for _ in range(10):
+        accumulator.add_batch([1e16, 1.0, -1e16, 0.1])
+
+    assert len(accumulator.partials) < 3
+    assert accumulator.total() == math.fsum([1e16, 1.0, -1e16, 0.1] * 10)
+
+
+def test_batch_accumulator_exact_folds_keep_mixed_totals_exact(monkeypatch):
+    monkeypatch.setattr("demos.accumulate.MAX_PENDING_PARTIALS", 3)
+    accumulator = BatchAccumulator("exact")
+    for _ in range(10):
+        accumulator.add_batch([10**20, 0.1, -(10**20), 1])
+    accumulator.add_batch([0.5, -0.5])
+
+    assert len(accumulator.partials) < 4
+    assert accumulator.total() == sum_exact([10**20, 0.1, -(10**20), 1] * 10)
+    assert BatchAccumulator("exact").total() is None
@@ -0,0 +1,152 @@
+"""Tests for the per-stage summation statistics."""
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import demos.summing_methods
+from demos.pipeline import sum_pipelined
+from demos.stats import SummationStats, collect_stats
+from demos.summing_methods import (
+    iter_file_batches,
+    iter_stream_batches,
+    main,
+    parse_cli_numbers,
+    sum_fsum,
+    sum_stream,
+)
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_collect_stats_counts_every_stage_of_a_file(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_bytes(b"1.5 -2\n3e2 4\n" * 1000)
+
+    with collect_stats() as stats:
+        total = sum_stream(iter_file_batches(path, True, chunk_size=512), sum_fsum)
+
+    assert total == 303.5 * 1000
+    assert stats.bytes_read == 13 * 1000
+    assert stats.tokens_parsed == stats.numbers_accumulated == 4000
+    assert min(stats.read_ns, stats.parse_ns, stats.accumulate_ns) > 0
+    assert stats.elapsed_ns >= stats.parse_ns + stats.accumulate_ns
+    assert demos.summing_methods._stats is None
+
+
+def test_stream_and_pipelined_runs_are_counted_alike():
+    data = b"5 6 7 " * 5000
+    counts = []
+
+    for summer in (
+        lambda stream: sum_stream(iter_stream_batches(stream, chunk_size=1000)),
+        lambda stream: sum_pipelined(stream, chunk_size=1000),
+    ):
+        with collect_stats() as stats:
+            assert summer(io.BytesIO(data)) == 90_000
+        counts.append(
+            (stats.bytes_read, stats.tokens_parsed, stats.numbers_accumulated)
+        )
+
+    assert counts == [(len(data), 15_000, 15_000)] * 2
+
+
+def test_nested_collectors_restore_the_outer_one():
+    outer = SummationStats()
+
+    with collect_stats(outer):
+        parse_cli_numbers(["1", "2"])
+        with collect_stats() as inner:
+            parse_cli_numbers(["3"])
+        parse_cli_numbers(["4"])
+
+    assert (outer.tokens_parsed, inner.tokens_parsed) == (3, 1)
+
+
+def test_invalid_tokens_are_still_reported_while_collecting():
+    with collect_stats() as stats:
+        with pytest.raises(ValueError, match="'inf' is not a valid finite number."):
+            parse_cli_numbers(["1", "inf"], allow_float=True)
+
+    assert stats.tokens_parsed == 2
+
+
+def test_generator_tokens_are_counted_while_collecting():
+    with collect_stats() as stats:
+        assert parse_cli_numbers(str(number) for number in range(5)) == [0, 1, 2, 3, 4]
+
+    assert stats.tokens_parsed == 5
+
+
+def test_stats_render_as_json_and_prometheus_text():
+    stats = SummationStats()
+    stats.add_read(4000, 2_000_000)
+    stats.add_parse(1000, 1_000_000, 0)
+    stats.elapsed_ns = 5_000_000
+
+    result = json.loads(stats.format("json"))
+    prometheus = stats.format("prometheus")
+
+    assert result["bytes_read"] == 4000
+    assert result["stages"]["read"] == {"ns": 2_000_000, "bytes_per_second": 2e6}
+    assert result["stages"]["validate"] == {"ns": 0, "tokens_per_second": None}
+    assert "# TYPE demos_summing_bytes_read_total counter\n" in prometheus
+    assert 'demos_summing_stage_seconds_total{stage="read"} 0.002\n' in prometheus
+    assert (
+        'demos_summing_stage_throughput_per_second{stage="parse",unit="tokens"} '
+        "1000000.0\n"
+    ) in prometheus
+    assert 'stage="validate",unit="tokens"} NaN\n' in prometheus
+    with pytest.raises(ValueError, match="'xml' is not a statistics format"):
+        stats.format("xml")
+
+
+def test_cli_writes_stats_to_stderr(tmp_path, capsys):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+
+    assert main(["--file", str(path), "--stats"]) == 0
+    captured = capsys.readouterr()
+    assert main(["--stats", "prometheus", "--numbers", "4", "5"]) == 0
+
+    assert captured.out == "Sum: 6\n"
+    assert json.loads(captured.err)["numbers_accumulated"] == 3
+    assert "demos_summing_tokens_parsed_total 2\n" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--stats"], "--stats requires --numbers, --stdin or --file."),
+        (["--stats", "--file", "x", "--workers", "2"], "--stats cannot be combined"),
+        (["--stats", "--cache", "--file", "x"], "--cache cannot be combined"),
+    ],
+)
+def test_cli_stats_option_errors(capsys, arguments, message):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "entry", [["demos/summing_methods.py"], ["-m", "demos.summing_methods"]]
+)
+def test_cli_counts_when_run_as_a_script_or_module(tmp_path, entry):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2 3\n")
+
+    completed = subprocess.run(
+        [sys.executable, *entry, "--file", str(path), "--stats"],
+        cwd=REPOSITORY_ROOT,
+        capture_output=True,
+        check=True,
+    )
+
+    assert completed.stdout == b"Sum: 6\n"
+    assert json.loads(completed.stderr)["tokens_parsed"] == 3
@@ -1,16 +1,32 @@
 """Core arithmetic tests for the canonical summation lesson."""
 
 import math
+import tracemalloc
+from fractions import Fraction
 
 import pytest
 
 from demos.summing_methods import (
+    SUM_METHODS,
     add_plus,
     add_sum,
     add_operator,
+    get_sum_method,
+    main,
+    float_expansion,
+    register_sum_method,
+    split_exact,
+    sum_bigint,
     sum_builtin,
+    sum_exact,
+    sum_exact_fraction,
     sum_reduce,
     sum_fsum,
+    sum_kahan,
+    sum_klein,
+    sum_neumaier,
+    sum_numpy,
+    sum_pairwise,
 )
 
 # ---------- Two-number methods ------------------------------------------------
@@ -87,6 +103,163 @@ def test_float_precision_fsum_better_or_equal():
     fsum_err = abs(precise - 10_000.0)
     assert fsum_err <= builtin_err
 
+# ---------- Compensated summation family --------------------------------------
+
+COMPENSATED = [sum_kahan, sum_neumaier, sum_pairwise, sum_klein]
+
+@pytest.mark.parametrize("method", COMPENSATED)
+@pytest.mark.parametrize("nums", [[], [2.5], [1, 2, 3], [3.5, 4.25, -1.75, 0.0]])
+def test_compensated_methods_match_exact_sums(method, nums):
+    assert method(nums) == float(sum(nums))
+    assert isinstance(method(nums), float)
+
+@pytest.mark.parametrize("method", COMPENSATED)
+def test_compensated_methods_recover_small_addends(method):
+    nums = [1e16] + [1.0] * 10_000 + [-1e16]
+    assert abs(method(nums) - 10_000.0) <= abs(sum_builtin(nums) - 10_000.0)
+    assert method(iter(nums)) == method(nums)
+
+@pytest.mark.parametrize("method", [sum_neumaier, sum_klein])
+def test_neumaier_and_klein_handle_addends_larger_than_total(method):
+    # Plain Kahan returns 0.0 here; the exact answer is 2.0.
+    assert method([1.0, 1e100, 1.0, -1e100]) == 2.0
+
+@pytest.mark.parametrize("method", COMPENSATED)
+@pytest.mark.parametrize("sign", [1, -1])
+def test_compensated_methods_overflow_to_infinity(method, sign):
+    nums = [sign * 1e308, sign * 1e308, 1.0] + [0.5] * 20_000
+    assert method(nums) == sign * math.inf
+
+def test_pairwise_block_size_does_not_change_exact_results():
+    nums = [0.5] * 1000
+    assert sum_pairwise(nums, block_size=1) == sum_pairwise(nums, block_size=7) == 500.0
+
+def test_method_registry_lists_every_lesson_method():
+    assert {"builtin", "reduce", "fsum", "kahan", "neumaier", "pairwise", "klein"} <= set(
+        SUM_METHODS
+    )
+    assert get_sum_method("klein") is sum_klein
+    with pytest.raises(ValueError, match="not a summation method"):
+        get_sum_method("median")
+
+def test_register_sum_method_refuses_silent_replacement(monkeypatch):
+    monkeypatch.setitem(SUM_METHODS, "double", lambda nums: 2 * sum(nums))
+    with pytest.raises(ValueError, match="already a registered"):
+        register_sum_method("double", sum_builtin)
+    register_sum_method("double", sum_builtin, replace=True)
+    assert get_sum_method("double") is sum_builtin
+
+def test_cli_method_selects_registered_method(capsys):
+    assert main(["--float", "--method", "neumaier", "--numbers", "1", "1e100", "1", "-1e100"]) == 0
+    assert capsys.readouterr().out == "Sum: 2.0\n"
+
+@pytest.mark.parametrize("block_size", [1, 3, 64])
+def test_sum_bigint_matches_exact_integer_sum(block_size):
+    nums = [7**5000] + list(range(-500, 1000)) + [-(3**7000), 2**9000] * 3
+    assert sum_bigint(nums, block_size) == sum(nums)
+    assert sum_bigint(iter(nums), block_size) == sum(nums)
+    assert isinstance(sum_bigint(nums, block_size), int)
+    assert sum_bigint([]) == 0
+
+def test_sum_bigint_is_registered_for_the_cli(capsys):
+    assert get_sum_method("bigint") is sum_bigint
+    assert main(["--method", "bigint", "--numbers", str(10**40), "1", "-2"]) == 0
+    assert capsys.readouterr().out == f"Sum: {10**40 - 1}\n"
+
+# ---------- Optional NumPy backend -------------------------------------------
+
+@pytest.mark.parametrize("nums", [[], [1, 2, 3], [2**62, 2**62], [2**80, -1], [0.5, 2, 1e-3]])
+def test_sum_numpy_falls_back_to_exact_python_without_numpy(monkeypatch, nums):
+    monkeypatch.setattr("demos.summing_methods._import_numpy", lambda: None)
+    assert sum_numpy(nums) == sum(nums)
+    assert type(sum_numpy(nums)) is type(sum(nums))
+
+def test_sum_numpy_keeps_int64_overflow_exact():
+    numpy = pytest.importorskip("numpy")
+    assert sum_numpy([2**62, 2**62, 2**62]) == 3 * 2**62
+    assert sum_numpy(numpy.array([2**62, 2**62, 2**62])) == 3 * 2**62
+    assert sum_numpy(numpy.arange(10, dtype=numpy.uint8)) == 45
+    assert isinstance(sum_numpy(numpy.arange(10)), int)
+
+def test_sum_numpy_reduces_float_arrays_pairwise():
+    numpy = pytest.importorskip("numpy")
+    nums = [0.1] * 100_000
+    assert sum_numpy(numpy.array(nums)) == pytest.approx(10_000.0, rel=1e-15)
+    assert sum_numpy(iter(nums)) == pytest.approx(10_000.0, rel=1e-15)
+    assert isinstance(sum_numpy(numpy.array(nums, dtype=numpy.float32)), float)
+
+# ---------- Exact mixed int/float accumulation --------------------------------
+
+MIXED_LEDGERS = [
+    [10**30, 0.1, -(10**30)],
+    [2**53, 1, 0.5],
+    [1999, 0.01, -0.005, 10**20, 250],
+    [10**400, 1.5, -(10**400)],
+    [-(2**1000), 1e300, 3],
+    [0.5, -0.5],
+]
+
+@pytest.mark.parametrize("nums", MIXED_LEDGERS)
+def test_sum_exact_rounds_the_exact_mixed_total_once(nums):
+    exact = sum(map(Fraction, nums), Fraction(0))
+    assert sum_exact(nums) == float(exact)
+    assert isinstance(sum_exact(nums), float)
+    assert sum_exact(iter(nums)) == sum_exact(nums)
+    assert sum_exact_fraction(nums) == exact
+
+def test_sum_exact_keeps_integer_input_exact():
+    nums = [9007199254740993, 1, 10**40]
+    assert sum_exact(nums) == sum(nums)
+    assert isinstance(sum_exact(nums), int)
+    assert sum_exact_fraction(nums) == sum(nums)
+    assert sum_exact([]) == 0
+
+def test_sum_exact_matches_fsum_for_floats():
+    nums = [0.1] * 10 + [1e100, 1.0, -1e100]
+    assert sum_exact(nums) == math.fsum(nums) == 2.0
+    assert math.isinf(sum_exact([math.inf, 1]))
+    with pytest.raises(ValueError, match="non-finite"):
+        sum_exact_fraction([math.inf, 1])
+
+def test_split_exact_streams_in_bounded_memory():
+    nums = (index if index % 3 else index + 0.25 for index in range(300_000))
+    tracemalloc.start()
+    try:
+        integer, floats = split_exact(nums)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    expected = sum(range(300_000)) + Fraction(100_000, 4)
+    assert integer + sum(map(Fraction, floats), Fraction(0)) == expected
+    assert len(floats) < 4
+    assert peak < 1 << 20
+
+def test_split_exact_remembers_floats_that_cancel():
+    assert split_exact([3] + [0.5, -0.5] * 5000) == (3, [0.0])
+    assert isinstance(sum_exact([3, 0.5, -0.5]), float)
+
+def test_float_expansion_is_error_free():
+    nums = [0.1, 0.2, 1e-30, 1e30, -1e30]
+    expansion = float_expansion(nums)
+    assert sum(map(Fraction, expansion)) == sum(map(Fraction, nums))
+    assert float_expansion([0.5, -0.5]) == []
+
+@pytest.mark.parametrize("arguments", [
+    ["--float", "--method", "fsum", "--numbers", "1e308", "1e308"],
+    ["--float", "--method", "exact", "--numbers", "1e308", "1e308"],
+    ["--method", "kahan", "--numbers", "1" + "0" * 400],
+])
+def test_cli_reports_sums_out_of_float_range(capsys, arguments):
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+    assert exc_info.value.code == 2
+    assert "the sum is out of range for --method" in capsys.readouterr().err
+
+def test_cli_exact_method_is_registered(capsys):
+    assert get_sum_method("exact") is sum_exact
+    assert main(["--float", "--method", "exact", "--numbers", "1", "1e100", "1", "-1e100"]) == 0
+    assert capsys.readouterr().out == "Sum: 2.0\n"
+
 # ---------- Type/robustness checks --------------------------------------------
 
 def test_two_number_accepts_int_and_float():
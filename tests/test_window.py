@@ -0,0 +1,152 @@
+"""Tests for sliding, hopping and tumbling window sums."""
+
+import io
+import math
+import random
+
+import pytest
+
+from demos.summing_methods import main
+from demos.window import SlidingWindow, iter_windows, parse_window
+
+
+def test_sliding_window_tracks_the_last_values():
+    window = SlidingWindow(3)
+
+    for number in [5, -2, 0, 7, -9, 4]:
+        window.add(number)
+
+    assert window.result() == {
+        "count": 3,
+        "sum": 2,
+        "mean": 2 / 3,
+        "positive_count": 2,
+        "negative_count": 1,
+        "zero_count": 0,
+        "minimum": -9,
+        "maximum": 7,
+    }
+
+
+def test_sliding_window_min_and_max_match_a_rescan():
+    rng = random.Random(5)
+    values = [rng.randint(-50, 50) for _ in range(2000)]
+    window = SlidingWindow(17)
+
+    for index, number in enumerate(values):
+        window.add(number)
+        recent = values[max(0, index - 16) : index + 1]
+        result = window.result()
+        assert (result["minimum"], result["maximum"]) == (min(recent), max(recent))
+        assert result["sum"] == sum(recent)
+
+
+def test_sliding_window_float_sum_does_not_drift():
+    rng = random.Random(11)
+    values = [rng.uniform(-1, 1) * 10.0 ** rng.randint(-8, 8) for _ in range(20_000)]
+    window = SlidingWindow(100)
+
+    for number in values:
+        window.add(number)
+
+    assert window.total() == math.fsum(values[-100:])
+
+
+def test_sliding_window_evicts_by_age():
+    window = SlidingWindow(seconds=10)
+
+    for timestamp, number in [(0, 1.5), (4, 2), (9, 3), (12, 4)]:
+        window.add(number, timestamp)
+
+    assert (len(window), window.total()) == (3, 9)
+    window.expire(30)
+    assert window.result()["count"] == 0
+    assert window.total() == 0
+
+
+def test_iter_windows_emits_tumbling_and_hopping_windows():
+    tumbling = [result["sum"] for result in iter_windows(range(10), size=4)]
+    hopping = [result["sum"] for result in iter_windows(range(10), size=4, every=2)]
+
+    assert tumbling == [6, 22, 17]
+    assert hopping == [1, 6, 14, 22, 30]
+
+
+def test_iter_windows_times_duration_windows_with_the_clock():
+    times = iter([0, 0.5, 1.0, 1.2, 2.5, 2.6, 5])
+
+    windows = iter_windows(range(1, 8), seconds=1, clock=lambda: next(times))
+
+    assert [(w["count"], w["sum"]) for w in windows] == [
+        (2, 3),
+        (2, 7),
+        (2, 11),
+        (1, 7),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("100", (100, None)), ("30s", (None, 30.0)), ("0.5s", (None, 0.5))],
+)
+def test_parse_window_reads_counts_and_durations(text, expected):
+    assert parse_window(text) == expected
+
+
+@pytest.mark.parametrize("text", ["0", "-3", "s", "1.5", "nans", "10m"])
+def test_parse_window_rejects_other_text(text):
+    with pytest.raises(ValueError, match="is not a valid window"):
+        parse_window(text)
+
+
+def test_window_arguments_are_validated():
+    with pytest.raises(ValueError, match="needs a size or a duration"):
+        SlidingWindow()
+    with pytest.raises(ValueError, match="step cannot exceed the window"):
+        list(iter_windows([1], size=2, every=3))
+    with pytest.raises(ValueError, match="'inf' is not a valid finite number."):
+        SlidingWindow(2).add(math.inf)
+
+
+def test_cli_prints_one_line_per_window(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"1 -2\n3 0\n5\n")))
+
+    assert main(["--stdin", "--window", "2"]) == 0
+
+    assert capsys.readouterr().out == (
+        "Window 1: sum=-1 mean=-0.5 count=2 positive=1 negative=1 zeros=0 "
+        "min=-2 max=1\n"
+        "Window 2: sum=3 mean=1.5 count=2 positive=1 negative=0 zeros=1 "
+        "min=0 max=3\n"
+        "Window 3: sum=5 mean=5.0 count=1 positive=1 negative=0 zeros=0 "
+        "min=5 max=5\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        (["--stdin", "--every", "2"], "--every requires --window."),
+        (["--window", "5"], "--window requires --stdin or --file."),
+        (["--stdin", "--window", "5", "--pipeline"], "--window cannot be combined"),
+        (
+            ["--stdin", "--window", "5", "--analyze"],
+            "--window cannot be combined with --analyze.",
+        ),
+        (
+            ["--stdin", "--window", "5", "--delimiter", ","],
+            "--window cannot be combined with --delimiter.",
+        ),
+        (["--stdin", "--window", "5", "--every", "2s"], "--every must use the same"),
+        (["--stdin", "--window", "5x"], "'5x' is not a valid window"),
+        (["--stdin", "--window", "5"], "--stdin requires at least one number."),
+    ],
+)
+def test_cli_window_option_errors(monkeypatch, capsys, arguments, message):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"")))
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(arguments)
+
+    assert exc_info.value.code == 2
+    assert message in capsys.readouterr().err